@@ -15,6 +15,7 @@
 # Author: Sabbir Hossain
 
 import heapq
+import itertools
 import time
 import random
 from typing import Any, List, Tuple, TypeVar, Generic
@@ -250,6 +251,165 @@ def demonstrate_dijkstra():
     print(f"Distance: {distance}")
     print(f"Path: {' -> '.join(path)}")
 
+# Streaming operators over sorted iterators
+# -----------------------------------------
+# Log shards, sorted database exports and sorted run files are often too large to load
+# at once, but they are already sorted. A heap holding one "head" entry per input is all
+# that's needed to merge, join, deduplicate, group or intersect them lazily. Memory stays
+# O(k) for k inputs, plus whatever a run of equal keys requires to be buffered.
+# Every operator raises ValueError as soon as an input turns out not to be sorted,
+# instead of silently producing wrong output.
+
+_MISSING = object()
+
+def merge(*iterables, key=None):
+    """
+    Lazily merge already-sorted iterables into one sorted stream.
+    
+    Args:
+    *iterables: Iterables sorted in ascending order (by key, if given)
+    key: Optional function computing the sort key of each item
+    
+    Returns:
+    A generator of items in ascending order; equal keys come out in input order.
+    Time: O(n log k), Memory: O(k)
+    """
+    heap = []
+    for index, iterable in enumerate(iterables):
+        iterator = iter(iterable)
+        for item in iterator:
+            # The unique input index breaks ties, so items and iterators are never compared.
+            heap.append((key(item) if key else item, index, item, iterator))
+            break
+    heapq.heapify(heap)
+    
+    while heap:
+        item_key, index, item, iterator = heap[0]
+        yield item
+        for following in iterator:
+            following_key = key(following) if key else following
+            if following_key < item_key:
+                raise ValueError(f"input {index} is not sorted: {following!r} follows {item!r}")
+            heapq.heapreplace(heap, (following_key, index, following, iterator))
+            break
+        else:
+            heapq.heappop(heap)
+
+def dedupe_sorted(iterable, key=None):
+    """
+    Yield the first item of every run of equal keys in a sorted iterable.
+    
+    Unlike set(), this keeps the order, never holds more than one key and works on
+    unbounded streams.
+    """
+    previous = _MISSING
+    for item in iterable:
+        item_key = key(item) if key else item
+        if previous is not _MISSING:
+            if item_key < previous:
+                raise ValueError(f"input is not sorted: {item!r} follows a larger key")
+            if item_key == previous:
+                continue
+        previous = item_key
+        yield item
+
+def group_sorted(iterable, key=None):
+    """
+    Yield (key, items) pairs for every run of equal keys in a sorted iterable.
+    
+    Only the current group is held in memory.
+    """
+    previous = _MISSING
+    for group_key, group in itertools.groupby(iterable, key):
+        if previous is not _MISSING and group_key < previous:
+            raise ValueError(f"input is not sorted: key {group_key!r} follows a larger key")
+        previous = group_key
+        yield group_key, list(group)
+
+def merge_join(left, right, key=None, right_key=None, how: str = "inner"):
+    """
+    Sort-merge join of two iterables sorted by their join keys, in a single pass.
+    
+    Args:
+    left, right: Iterables sorted by their join keys
+    key: Function computing the join key (identity if None)
+    right_key: Join key function for the right side, if it differs from key
+    how (str): "inner", "left", "right" or "outer"; missing sides are None
+    
+    Returns:
+    A generator of (left_item, right_item) pairs in key order. Equal keys on both
+    sides produce their cross product, as in SQL.
+    """
+    if how not in ("inner", "left", "right", "outer"):
+        raise ValueError(f"unknown join type: {how!r}")
+    keep_left = how in ("left", "outer")
+    keep_right = how in ("right", "outer")
+    left_groups = group_sorted(left, key)
+    right_groups = group_sorted(right, right_key or key)
+    left_group = next(left_groups, None)
+    right_group = next(right_groups, None)
+    
+    while left_group is not None or right_group is not None:
+        if how == "inner" and (left_group is None or right_group is None):
+            return
+        if right_group is None or (left_group is not None and left_group[0] < right_group[0]):
+            if keep_left:
+                for item in left_group[1]:
+                    yield item, None
+            left_group = next(left_groups, None)
+        elif left_group is None or right_group[0] < left_group[0]:
+            if keep_right:
+                for item in right_group[1]:
+                    yield None, item
+            right_group = next(right_groups, None)
+        else:
+            for left_item in left_group[1]:
+                for right_item in right_group[1]:
+                    yield left_item, right_item
+            left_group = next(left_groups, None)
+            right_group = next(right_groups, None)
+
+def intersect_sorted(*iterables, key=None):
+    """
+    Yield, once per key, the first item of the first iterable whose key occurs in
+    every one of the sorted iterables.
+    """
+    if not iterables:
+        return
+    tagged = [zip(itertools.repeat(index), iterable) for index, iterable in enumerate(iterables)]
+    item_key = (lambda pair: key(pair[1])) if key else (lambda pair: pair[1])
+    for _, group in group_sorted(merge(*tagged, key=item_key), item_key):
+        # merge breaks ties by input index, so a group starts with the first input's items.
+        if group[0][0] == 0 and len({index for index, _ in group}) == len(iterables):
+            yield group[0][1]
+
+def demonstrate_streaming_merge():
+    """Join sorted log shards with a sorted user export in one pass."""
+    def log_shard(host, count):
+        timestamp = 0
+        for _ in range(count):
+            timestamp += random.randint(1, 30)
+            yield (timestamp, host, random.choice(["alice", "bob", "carol", "dave"]))
+    
+    shards = [log_shard(host, 5) for host in ("web-1", "web-2", "web-3")]
+    merged = list(merge(*shards, key=lambda event: event[0]))
+    print("Merged log events:")
+    for event in merged:
+        print(f"  {event}")
+    
+    by_user = sorted(merged, key=lambda event: event[2])
+    users = [("alice", "admin"), ("bob", "editor"), ("erin", "viewer")]
+    print("\nEvents per user, outer-joined with the user export:")
+    for user, events in group_sorted(by_user, key=lambda event: event[2]):
+        print(f"  {user}: {len(events)} events")
+    for event, user in merge_join(dedupe_sorted(by_user, key=lambda event: event[2]), users,
+                                  key=lambda event: event[2], right_key=lambda user: user[0],
+                                  how="outer"):
+        print(f"  first event: {event}, user record: {user}")
+    
+    print("\nIDs present in all three sorted exports:",
+          list(intersect_sorted(range(0, 60, 2), range(0, 60, 3), [0, 5, 6, 12, 30, 31, 42])))
+
 # 5. Advanced Concepts and Emerging Trends
 # ----------------------------------------
 
@@ -528,6 +688,26 @@ def optimize_heap_operations():
     print(f"  Time to merge using sort: {sort_time:.4f} seconds")
     print(f"  Time to merge using heapq.merge: {merge_time:.4f} seconds")
 
+def streaming_merge_memory():
+    """Compare the peak memory of a lazy merge with merging everything in memory."""
+    import tracemalloc
+    
+    def shards():
+        return [range(start, 1_000_000, 100) for start in range(100)]
+    
+    for name, run in [
+        ("sorted(chain(...)) in memory", lambda: sum(sorted(itertools.chain(*shards())))),
+        ("streaming merge()", lambda: sum(merge(*shards()))),
+        ("streaming dedupe_sorted(merge())", lambda: sum(dedupe_sorted(merge(*shards())))),
+    ]:
+        tracemalloc.start()
+        start_time = time.time()
+        total = run()
+        elapsed = time.time() - start_time
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {name:<34} total={total} time={elapsed:.3f}s peak memory={peak / 1024:.0f} KiB")
+
 # 9. How to Contribute
 # --------------------
 
@@ -545,6 +725,53 @@ def how_to_contribute():
     print("- Include performance considerations for new functions.")
     print("- Add relevant references or citations for advanced topics.")
 
+# Unit Tests
+class TestStreamingOperators(unittest.TestCase):
+    def setUp(self):
+        self.left = sorted((random.randint(0, 20), "L", i) for i in range(60))
+        self.right = sorted((random.randint(5, 25), "R", i) for i in range(40))
+    
+    def reference_join(self, how):
+        left_keys = {item[0] for item in self.left}
+        right_keys = {item[0] for item in self.right}
+        pairs = [(l, r) for l in self.left for r in self.right if l[0] == r[0]]
+        if how in ("left", "outer"):
+            pairs += [(l, None) for l in self.left if l[0] not in right_keys]
+        if how in ("right", "outer"):
+            pairs += [(None, r) for r in self.right if r[0] not in left_keys]
+        return sorted(pairs, key=lambda pair: (pair[0] or pair[1])[0])
+    
+    def test_merge_and_dedupe(self):
+        runs = [sorted(random.sample(range(100), 30)) for _ in range(5)]
+        self.assertEqual(list(merge(*runs)), sorted(itertools.chain(*runs)))
+        self.assertEqual(list(dedupe_sorted(merge(*runs))), sorted(set(itertools.chain(*runs))))
+        with self.assertRaises(ValueError):
+            list(merge([1, 3], [2, 1]))
+    
+    def test_merge_join(self):
+        key = lambda item: item[0]
+        for how in ("inner", "left", "right", "outer"):
+            with self.subTest(how=how):
+                joined = list(merge_join(self.left, self.right, key=key, how=how))
+                self.assertEqual(sorted(joined, key=lambda pair: (pair[0] or pair[1])[0]), joined)
+                self.assertEqual(sorted(joined, key=repr), sorted(self.reference_join(how), key=repr))
+        self.assertEqual(list(merge_join([], [1, 2], how="inner")), [])
+        self.assertEqual(list(merge_join([], [1, 2], how="right")), [(None, 1), (None, 2)])
+        with self.assertRaises(ValueError):
+            list(merge_join(self.left, self.right, key=key, how="cross"))
+        with self.assertRaises(ValueError):
+            list(merge_join([2, 1], [1, 2]))
+    
+    def test_intersect_sorted(self):
+        runs = [sorted(random.sample(range(50), 30)) for _ in range(3)]
+        self.assertEqual(list(intersect_sorted(*runs)), sorted(set(runs[0]) & set(runs[1]) & set(runs[2])))
+        self.assertEqual(list(intersect_sorted([1, 1, 2, 3], [1, 3, 3], [0, 1, 3])), [1, 3])
+        records = [(1, "a"), (1, "b"), (4, "c")]
+        self.assertEqual(list(intersect_sorted(records, [(1, "x"), (4, "y")], key=lambda r: r[0])),
+                         [(1, "a"), (4, "c")])
+        self.assertEqual(list(intersect_sorted([1, 2], [])), [])
+        self.assertEqual(list(intersect_sorted()), [])
+
 # Main function to demonstrate all concepts
 def main():
     print("Demonstrating Heapq module for priority queues in Python")
@@ -554,13 +781,18 @@ def main():
     advanced_heap_usage()
     demonstrate_optimized_priority_queue()
     demonstrate_dijkstra()
+    demonstrate_streaming_merge()
     demonstrate_array_heap()
     demonstrate_async_priority_queue()
     faqs_and_troubleshooting()
     recommended_resources()
     performance_analysis()
     optimize_heap_operations()
+    streaming_merge_memory()
     how_to_contribute()
+    
+    # Run unit tests
+    unittest.main(argv=[''], exit=False)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -16,7 +16,7 @@
 
 import time
 import random
-from typing import List, Callable, Any
+from typing import List, Callable, Any, Optional, Tuple, Dict
 import unittest
 import asyncio
 
@@ -418,6 +418,8 @@ def recommended_resources():
 # ----------------------------------------
 
 import timeit
+import heapq
+import numpy as np
 
 def performance_analysis():
     """Analyze and compare the performance of different sorting algorithms."""
@@ -495,6 +497,607 @@ def optimize_quicksort():
     print(f"Optimized Quicksort: {optimized_time:.6f} seconds")
     print(f"Speedup: {original_time / optimized_time:.2f}x")
 
+# Adaptive merge sort with run detection and galloping
+# ----------------------------------------------------
+# merge_sort above slices the input and builds new lists at every level, and it
+# compares raw elements, so sorting records by an expensive key would call that key
+# O(n log n) times. The version below follows the ideas behind Timsort:
+# 1. Decorate-sort-undecorate: compute every key exactly once, then sort a list of
+#    indices by those precomputed keys and rebuild the records at the end.
+# 2. Natural runs: already ascending stretches are kept as they are, and strictly
+#    descending stretches are reversed in place (strictly, so stability is kept).
+#    Short runs are extended to min_run elements with binary insertion sort.
+# 3. One preallocated merge buffer: only the smaller of the two runs being merged is
+#    copied out, into a buffer of n // 2 + 1 slots allocated once per sort.
+# 4. Galloping: when one run keeps winning, switch from one-by-one comparisons to an
+#    exponential search and move the whole winning block with one slice assignment.
+# The number of key comparisons is counted so the effect of runs and galloping is visible.
+
+MIN_GALLOP = 7
+
+def compute_min_run(n: int) -> int:
+    """Pick a run length in [32, 64] so that n / min_run is close to a power of two."""
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+class _AdaptiveMergeState:
+    """Working state for adaptive_merge_sort: the index permutation, run stack and buffer."""
+    
+    def __init__(self, keys: List[Any]):
+        n = len(keys)
+        self.keys = keys
+        self.order = list(range(n))
+        self.buffer = [0] * (n // 2 + 1)
+        self.runs: List[Tuple[int, int]] = []
+        self.min_gallop = MIN_GALLOP
+        self.comparisons = 0
+    
+    def count_run(self, lo: int, hi: int) -> int:
+        """Length of the natural run starting at lo; descending runs are reversed in place."""
+        keys, order = self.keys, self.order
+        run_hi = lo + 1
+        if run_hi == hi:
+            return 1
+        comparisons = 1
+        if keys[order[run_hi]] < keys[order[lo]]:
+            while run_hi + 1 < hi:
+                comparisons += 1
+                if not keys[order[run_hi + 1]] < keys[order[run_hi]]:
+                    break
+                run_hi += 1
+            order[lo:run_hi + 1] = order[lo:run_hi + 1][::-1]
+        else:
+            while run_hi + 1 < hi:
+                comparisons += 1
+                if keys[order[run_hi + 1]] < keys[order[run_hi]]:
+                    break
+                run_hi += 1
+        self.comparisons += comparisons
+        return run_hi + 1 - lo
+    
+    def binary_insertion_sort(self, lo: int, hi: int, start: int):
+        """Sort order[lo:hi], knowing that order[lo:start] is already sorted."""
+        keys, order = self.keys, self.order
+        comparisons = 0
+        for i in range(start, hi):
+            pivot = order[i]
+            pivot_key = keys[pivot]
+            left, right = lo, i
+            while left < right:
+                mid = (left + right) // 2
+                comparisons += 1
+                if pivot_key < keys[order[mid]]:
+                    right = mid
+                else:
+                    left = mid + 1
+            order[left + 1:i + 1] = order[left:i]
+            order[left] = pivot
+        self.comparisons += comparisons
+    
+    def gallop(self, key: Any, arr: List[int], lo: int, hi: int, strict: bool, from_end: bool) -> int:
+        """
+        Find the first position p in arr[lo:hi] whose key is >= key (or > key when
+        strict is True), probing 1, 3, 7, 15, ... slots from one end before finishing
+        with a binary search.
+        """
+        keys = self.keys
+        comparisons = 0
+        if not from_end:
+            left, offset = lo, 0
+            while lo + offset < hi:
+                comparisons += 1
+                probe_key = keys[arr[lo + offset]]
+                if not (probe_key <= key if strict else probe_key < key):
+                    break
+                left = lo + offset + 1
+                offset = 2 * offset + 1
+            right = min(lo + offset, hi)
+        else:
+            right, offset = hi, 0
+            while hi - 1 - offset >= lo:
+                comparisons += 1
+                probe_key = keys[arr[hi - 1 - offset]]
+                if probe_key <= key if strict else probe_key < key:
+                    break
+                right = hi - 1 - offset
+                offset = 2 * offset + 1
+            left = max(hi - offset, lo)
+        while left < right:
+            mid = (left + right) // 2
+            comparisons += 1
+            probe_key = keys[arr[mid]]
+            if probe_key <= key if strict else probe_key < key:
+                left = mid + 1
+            else:
+                right = mid
+        self.comparisons += comparisons
+        return left
+    
+    def merge_lo(self, base_a: int, len_a: int, base_b: int, len_b: int):
+        """Merge two adjacent runs front to back, with the (smaller) left run buffered."""
+        keys, order, buf = self.keys, self.order, self.buffer
+        buf[:len_a] = order[base_a:base_a + len_a]
+        i, end_a = 0, len_a
+        j, end_b = base_b, base_b + len_b
+        dest = base_a
+        min_gallop = self.min_gallop
+        comparisons = 0
+        while i < end_a and j < end_b:
+            count_a = count_b = 0
+            while i < end_a and j < end_b:
+                comparisons += 1
+                if keys[order[j]] < keys[buf[i]]:
+                    order[dest] = order[j]
+                    j += 1
+                    count_b += 1
+                    count_a = 0
+                else:
+                    order[dest] = buf[i]
+                    i += 1
+                    count_a += 1
+                    count_b = 0
+                dest += 1
+                if count_a >= min_gallop or count_b >= min_gallop:
+                    break
+            while i < end_a and j < end_b:
+                # Left-run elements <= the next right-run element keep going first (stability).
+                k = self.gallop(keys[order[j]], buf, i, end_a, strict=True, from_end=False)
+                count_a = k - i
+                order[dest:dest + count_a] = buf[i:k]
+                dest, i = dest + count_a, k
+                if i == end_a:
+                    break
+                k = self.gallop(keys[buf[i]], order, j, end_b, strict=False, from_end=False)
+                count_b = k - j
+                order[dest:dest + count_b] = order[j:k]
+                dest, j = dest + count_b, k
+                if j == end_b:
+                    break
+                if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                    min_gallop += 1
+                    break
+                min_gallop = max(1, min_gallop - 1)
+        # Whatever is left of the right run is already in place.
+        order[dest:dest + end_a - i] = buf[i:end_a]
+        self.min_gallop = min_gallop
+        self.comparisons += comparisons
+    
+    def merge_hi(self, base_a: int, len_a: int, base_b: int, len_b: int):
+        """Merge two adjacent runs back to front, with the (smaller) right run buffered."""
+        keys, order, buf = self.keys, self.order, self.buffer
+        buf[:len_b] = order[base_b:base_b + len_b]
+        i = base_a + len_a - 1
+        j = len_b - 1
+        dest = base_b + len_b - 1
+        min_gallop = self.min_gallop
+        comparisons = 0
+        while i >= base_a and j >= 0:
+            count_a = count_b = 0
+            while i >= base_a and j >= 0:
+                comparisons += 1
+                if keys[buf[j]] < keys[order[i]]:
+                    order[dest] = order[i]
+                    i -= 1
+                    count_a += 1
+                    count_b = 0
+                else:
+                    order[dest] = buf[j]
+                    j -= 1
+                    count_b += 1
+                    count_a = 0
+                dest -= 1
+                if count_a >= min_gallop or count_b >= min_gallop:
+                    break
+            while i >= base_a and j >= 0:
+                # Left-run elements strictly greater than the last buffered element go last.
+                k = self.gallop(keys[buf[j]], order, base_a, i + 1, strict=True, from_end=True)
+                count_a = i + 1 - k
+                order[dest - count_a + 1:dest + 1] = order[k:i + 1]
+                dest, i = dest - count_a, k - 1
+                if i < base_a:
+                    break
+                k = self.gallop(keys[order[i]], buf, 0, j + 1, strict=False, from_end=True)
+                count_b = j + 1 - k
+                order[dest - count_b + 1:dest + 1] = buf[k:j + 1]
+                dest, j = dest - count_b, k - 1
+                if j < 0:
+                    break
+                if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                    min_gallop += 1
+                    break
+                min_gallop = max(1, min_gallop - 1)
+        # Whatever is left of the left run is already in place.
+        order[base_a:base_a + j + 1] = buf[:j + 1]
+        self.min_gallop = min_gallop
+        self.comparisons += comparisons
+    
+    def merge_at(self, i: int):
+        base_a, len_a = self.runs[i]
+        base_b, len_b = self.runs[i + 1]
+        self.runs[i] = (base_a, len_a + len_b)
+        del self.runs[i + 1]
+        keys, order = self.keys, self.order
+        # Elements of the left run that are <= the right run's first element are in place...
+        k = self.gallop(keys[order[base_b]], order, base_a, base_a + len_a, strict=True, from_end=False)
+        len_a -= k - base_a
+        base_a = k
+        if len_a == 0:
+            return
+        # ...and so are elements of the right run that are >= the left run's last element.
+        len_b = self.gallop(keys[order[base_a + len_a - 1]], order, base_b, base_b + len_b,
+                            strict=False, from_end=True) - base_b
+        if len_b == 0:
+            return
+        if len_a <= len_b:
+            self.merge_lo(base_a, len_a, base_b, len_b)
+        else:
+            self.merge_hi(base_a, len_a, base_b, len_b)
+    
+    def merge_collapse(self):
+        """Merge runs until the stack lengths shrink at least as fast as the Fibonacci numbers."""
+        runs = self.runs
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if (n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1]) or \
+                    (n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1]):
+                if runs[n - 1][1] < runs[n + 1][1]:
+                    n -= 1
+                self.merge_at(n)
+            elif runs[n][1] <= runs[n + 1][1]:
+                self.merge_at(n)
+            else:
+                break
+    
+    def merge_force_collapse(self):
+        runs = self.runs
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if n > 0 and runs[n - 1][1] < runs[n + 1][1]:
+                n -= 1
+            self.merge_at(n)
+
+def adaptive_merge_sort(arr: List[Any], key: Optional[Callable[[Any], Any]] = None,
+                        reverse: bool = False) -> Tuple[List[Any], int]:
+    """
+    Stable, adaptive merge sort with natural runs, galloping and one merge buffer.
+    
+    Time complexity: O(n log n) worst case, O(n) on input made of a few runs
+    Space complexity: O(n) for the keys, the index permutation and the merge buffer
+    
+    Args:
+    arr (List[Any]): The input list; it is not modified
+    key (Callable): Optional key function, called exactly once per element
+    reverse (bool): Sort in descending order (equal elements keep their input order)
+    
+    Returns:
+    Tuple[List[Any], int]: The sorted list and the number of key comparisons made
+    """
+    items = list(arr)
+    if reverse:
+        items.reverse()
+    keys = [key(item) for item in items] if key is not None else items
+    n = len(items)
+    state = _AdaptiveMergeState(keys)
+    min_run = compute_min_run(n)
+    lo = 0
+    while lo < n:
+        run_len = state.count_run(lo, n)
+        if run_len < min_run:
+            forced = min(min_run, n - lo)
+            state.binary_insertion_sort(lo, lo + forced, lo + run_len)
+            run_len = forced
+        state.runs.append((lo, run_len))
+        state.merge_collapse()
+        lo += run_len
+    state.merge_force_collapse()
+    result = [items[i] for i in state.order]
+    if reverse:
+        result.reverse()
+    return result, state.comparisons
+
+def demonstrate_adaptive_merge_sort():
+    """Show stability, key-call savings and comparison counts of adaptive_merge_sort."""
+    records = [{"name": name, "score": score} for name, score in
+               [("Alice", 90), ("Bob", 85), ("Charlie", 90), ("David", 70), ("Eve", 85)]]
+    key_calls = 0
+    
+    def score(record):
+        nonlocal key_calls
+        key_calls += 1
+        return record["score"]
+    
+    ranked, comparisons = adaptive_merge_sort(records, key=score, reverse=True)
+    print("\nAdaptive merge sort of records by score (descending, stable):")
+    print([f"{r['name']}:{r['score']}" for r in ranked])
+    print(f"Key calls: {key_calls}, comparisons: {comparisons}")
+    
+    n = 100_000
+    inputs = {
+        "random": [random.random() for _ in range(n)],
+        "sorted": list(range(n)),
+        "reversed": list(range(n, 0, -1)),
+        "rotated": list(range(n // 2, n)) + list(range(n // 2)),
+        "interleaved halves": list(range(0, n, 2)) + list(range(1, n, 2)),
+    }
+    for name, data in inputs.items():
+        _, comparisons = adaptive_merge_sort(data)
+        print(f"{name:>18}: {comparisons:,} comparisons ({comparisons / n:.2f} per element)")
+
+def benchmark_adaptive_merge_sort(n: int = 200_000):
+    """Compare adaptive_merge_sort with merge_sort and sorted() on records with a costly key."""
+    def costly_key(record):
+        # Stand-in for parsing a timestamp or normalizing a string
+        return sum(ord(c) for c in record["id"]) * 1_000_003 % 1_000_000_007
+    
+    records = [{"id": f"user-{random.randint(0, 10**9)}"} for _ in range(n)]
+    
+    def merge_sort_by_key(data):
+        # merge_sort compares elements directly, so every comparison recomputes the keys
+        class Keyed:
+            __slots__ = ("record",)
+            def __init__(self, record):
+                self.record = record
+            def __le__(self, other):
+                return costly_key(self.record) <= costly_key(other.record)
+        return [k.record for k in merge_sort([Keyed(r) for r in data])]
+    
+    print(f"\nSorting {n:,} records by a costly key:")
+    for name, func in [
+        ("merge_sort (key per comparison)", merge_sort_by_key),
+        ("adaptive_merge_sort", lambda data: adaptive_merge_sort(data, key=costly_key)[0]),
+        ("sorted(key=...)", lambda data: sorted(data, key=costly_key)),
+    ]:
+        start = time.perf_counter()
+        result = func(records)
+        elapsed = time.perf_counter() - start
+        assert [costly_key(r) for r in result] == sorted(costly_key(r) for r in records)
+        print(f"{name:<34} {elapsed:.3f} seconds")
+
+# Selection, top-k and partial sorting
+# ------------------------------------
+# Dashboards rarely need a fully sorted list: the top 100 scores, a median or a handful
+# of percentiles only depend on a few ranks. Selection algorithms find the element of
+# a given rank in O(n) average time instead of the O(n log n) of a full sort:
+# - select_kth: introselect, i.e. quickselect with a random median-of-three pivot that
+#   falls back to median-of-medians pivots when the recursion gets too deep, which
+#   caps the worst case at O(n).
+# - partial_sort: select the k-th element, keep what is below it, sort only those k.
+# - top_k: a size-k min-heap over a stream, so memory stays O(k) however long the
+#   stream is, plus a cheap "not better than the current k-th" check per element.
+# - percentiles: multi-select, descending only into the partitions that still contain
+#   a requested rank, so several percentiles cost barely more than one.
+# NumPy arrays are handed to np.partition, which runs introselect in C.
+
+def _median_of_three(values: List[Any]) -> Any:
+    a, b, c = random.choice(values), random.choice(values), random.choice(values)
+    if a > b:
+        a, b = b, a
+    if b > c:
+        b = c
+    return a if a > b else b
+
+def _median_of_medians(values: List[Any]) -> Any:
+    """A pivot guaranteed to have at least ~30% of the values on each side."""
+    medians = [sorted(values[i:i + 5])[(min(5, len(values) - i) - 1) // 2]
+               for i in range(0, len(values), 5)]
+    return _introselect(medians, (len(medians) - 1) // 2)
+
+def _introselect(values: List[Any], k: int) -> Any:
+    """Return the element of rank k (0-based) in values."""
+    depth_limit = 2 * len(values).bit_length()
+    while True:
+        if len(values) <= 16:
+            return sorted(values)[k]
+        if depth_limit > 0:
+            pivot = _median_of_three(values)
+            depth_limit -= 1
+        else:
+            pivot = _median_of_medians(values)
+        lows = [x for x in values if x < pivot]
+        if k < len(lows):
+            values = lows
+            continue
+        highs = [x for x in values if pivot < x]
+        num_pivots = len(values) - len(lows) - len(highs)
+        if k < len(lows) + num_pivots:
+            return pivot
+        k -= len(lows) + num_pivots
+        values = highs
+
+def _multiselect_array(array: np.ndarray, ranks: List[int]) -> Dict[int, Any]:
+    """
+    Multi-select for NumPy arrays: partition in place at the middle requested rank,
+    then recurse into the two halves with the ranks that fall into each. Passing all
+    ranks to np.partition at once is several times slower than this for large arrays.
+    """
+    result = {}
+    pending = [(0, len(array), sorted(set(ranks)))]
+    while pending:
+        start, stop, wanted = pending.pop()
+        middle = wanted[len(wanted) // 2]
+        view = array[start:stop]
+        view.partition(middle - start)
+        result[middle] = view[middle - start]
+        lower = wanted[:len(wanted) // 2]
+        upper = wanted[len(wanted) // 2 + 1:]
+        if lower:
+            pending.append((start, middle, lower))
+        if upper:
+            pending.append((middle + 1, stop, upper))
+    return result
+
+def select_kth(data, k: int, key: Optional[Callable[[Any], Any]] = None) -> Any:
+    """
+    Return the element that would be at index k if data were sorted.
+    
+    Time complexity: O(n) average and worst case (introselect)
+    Space complexity: O(n)
+    
+    Args:
+    data: A sequence or NumPy array; it is not modified
+    k (int): 0-based rank, 0 <= k < len(data)
+    key (Callable): Optional key function for Python sequences
+    
+    Returns:
+    Any: The k-th smallest element (ties resolved as in a stable sort)
+    """
+    n = len(data)
+    if not 0 <= k < n:
+        raise IndexError(f"rank {k} out of range for {n} elements")
+    if isinstance(data, np.ndarray) and key is None:
+        return np.partition(data, k)[k]
+    if key is None:
+        return _introselect(list(data), k)
+    items = list(data)
+    # Decorating with the position makes every entry unique and keeps ties stable.
+    _, index = _introselect([(key(item), i) for i, item in enumerate(items)], k)
+    return items[index]
+
+def partial_sort(data, k: int, key: Optional[Callable[[Any], Any]] = None, reverse: bool = False):
+    """
+    Return the k smallest elements (k largest if reverse) in sorted order, i.e. the
+    same as sorted(data, key=key, reverse=reverse)[:k], in O(n + k log k) time.
+    
+    NumPy arrays without a key return a NumPy array.
+    """
+    n = len(data)
+    k = max(0, min(k, n))
+    if isinstance(data, np.ndarray) and key is None:
+        if k == 0:
+            return data[:0].copy()
+        if reverse:
+            largest = np.partition(data, n - k)[n - k:]
+            return np.sort(largest)[::-1]
+        return np.sort(np.partition(data, k - 1)[:k])
+    items = list(data)
+    if k == 0:
+        return []
+    if key is None and not reverse:
+        threshold = _introselect(list(items), k - 1)
+        smaller = [x for x in items if x < threshold]
+        ties = [x for x in items if x == threshold][:k - len(smaller)]
+        return sorted(smaller) + ties
+    keys = [key(item) for item in items] if key is not None else items
+    if reverse:
+        # (key, -position): larger keys first, earlier positions first among ties
+        decorated = [(keys[i], -i) for i in range(n)]
+        threshold = _introselect(list(decorated), n - k)
+        chosen = sorted((d for d in decorated if d >= threshold), reverse=True)
+        return [items[-i] for _, i in chosen]
+    decorated = [(keys[i], i) for i in range(n)]
+    threshold = _introselect(list(decorated), k - 1)
+    chosen = sorted(d for d in decorated if d <= threshold)
+    return [items[i] for _, i in chosen]
+
+def top_k(iterable, k: int, key: Optional[Callable[[Any], Any]] = None):
+    """
+    Return the k largest elements of an iterable, largest first, using O(k) memory.
+    
+    The iterable is consumed once, so it can be a generator over a file or a socket.
+    Among equal keys, elements seen earlier win (like heapq.nlargest). A NumPy array
+    without a key is handled with np.partition and returns a NumPy array.
+    """
+    if k <= 0:
+        return []
+    if isinstance(iterable, np.ndarray) and key is None:
+        return partial_sort(iterable, k, reverse=True)
+    iterator = iter(iterable)
+    heap: List[Tuple[Any, int, Any]] = []
+    for index, item in zip(range(k), iterator):
+        heap.append((key(item) if key is not None else item, -index, item))
+    heapq.heapify(heap)
+    if len(heap) < k:
+        iterator = iter(())
+    # Once the heap is full, most elements lose against its root without building a tuple.
+    threshold = heap[0][0] if heap else None
+    for index, item in enumerate(iterator, k):
+        item_key = key(item) if key is not None else item
+        if threshold < item_key:
+            heapq.heapreplace(heap, (item_key, -index, item))
+            threshold = heap[0][0]
+    heap.sort(reverse=True)
+    return [item for _, _, item in heap]
+
+def percentiles(data, qs: List[float]) -> List[float]:
+    """
+    Compute several percentiles with one multi-select instead of a full sort.
+    
+    Values are linearly interpolated between the two closest ranks, matching
+    numpy.percentile's default ("linear") method.
+    
+    Args:
+    data: A non-empty sequence or NumPy array of numbers
+    qs (List[float]): Percentiles between 0 and 100
+    
+    Returns:
+    List[float]: One value per requested percentile, in the order of qs
+    """
+    n = len(data)
+    if n == 0:
+        raise ValueError("percentiles of an empty sequence are undefined")
+    if any(not 0 <= q <= 100 for q in qs):
+        raise ValueError("percentiles must be between 0 and 100")
+    positions = [q / 100 * (n - 1) for q in qs]
+    ranks = sorted({int(p) for p in positions} | {min(int(p) + 1, n - 1) for p in positions})
+    # Percentiles are numeric, so Python sequences are copied into a float array and
+    # selected in C; the copy is cheap next to the partitioning it speeds up.
+    array = data.copy() if isinstance(data, np.ndarray) else np.array(data, dtype=float)
+    values = _multiselect_array(array, ranks)
+    result = []
+    for position in positions:
+        lo = int(position)
+        hi = min(lo + 1, n - 1)
+        low, high = float(values[lo]), float(values[hi])
+        result.append(low + (high - low) * (position - lo))
+    return result
+
+def demonstrate_selection():
+    """Demonstrate selection, partial sorting, top-k and percentiles."""
+    scores = [random.randint(0, 1000) for _ in range(20)]
+    print("\nScores:", scores)
+    print("Median (select_kth):", select_kth(scores, len(scores) // 2))
+    print("Three lowest (partial_sort):", partial_sort(scores, 3))
+    print("Three highest (top_k):", top_k(scores, 3))
+    print("p50, p90, p99:", percentiles(scores, [50, 90, 99]))
+    
+    # top_k consumes a generator without ever materializing it
+    stream = (random.gauss(0, 1) for _ in range(1_000_000))
+    print("Top 3 of a 1M-element stream:", [round(x, 3) for x in top_k(stream, 3)])
+
+def benchmark_selection(n: int = 5_000_000, k: int = 100):
+    """Compare the selection APIs with full sorting on NumPy arrays and Python lists."""
+    def timed(func):
+        start = time.perf_counter()
+        result = func()
+        return result, time.perf_counter() - start
+    
+    scores = np.random.default_rng(0).random(n)
+    print(f"\nSelection vs. full sort on a NumPy array of {n:,} floats:")
+    _, sort_time = timed(lambda: np.sort(scores))
+    for name, func in [
+        (f"top_k(k={k})", lambda: top_k(scores, k)),
+        ("select_kth(median)", lambda: select_kth(scores, n // 2)),
+        ("percentiles([50, 90, 99])", lambda: percentiles(scores, [50, 90, 99])),
+    ]:
+        _, elapsed = timed(func)
+        print(f"{name:<28} {elapsed:.4f}s vs np.sort {sort_time:.4f}s ({sort_time / elapsed:.1f}x faster)")
+    
+    values = scores[: n // 5].tolist()
+    print(f"\nSelection vs. full sort on a Python list of {len(values):,} floats:")
+    _, sort_time = timed(lambda: sorted(values))
+    for name, func in [
+        (f"top_k(k={k})", lambda: top_k(values, k)),
+        (f"top_k(k={k}) on a generator", lambda: top_k(iter(values), k)),
+        ("select_kth(median)", lambda: select_kth(values, len(values) // 2)),
+        ("percentiles([50, 90, 99])", lambda: percentiles(values, [50, 90, 99])),
+        (f"partial_sort(k={k})", lambda: partial_sort(values, k)),
+    ]:
+        _, elapsed = timed(func)
+        print(f"{name:<28} {elapsed:.4f}s vs sorted() {sort_time:.4f}s ({sort_time / elapsed:.1f}x faster)")
+
 # 9. How to Contribute
 # --------------------
 
@@ -542,6 +1145,91 @@ class TestSortingAlgorithms(unittest.TestCase):
         for arr in self.test_arrays:
             with self.subTest(arr=arr):
                 self.assertEqual(hybrid_quicksort(arr.copy()), sorted(arr))
+    
+    def test_adaptive_merge_sort(self):
+        for arr in self.test_arrays:
+            with self.subTest(arr=arr):
+                self.assertEqual(adaptive_merge_sort(arr)[0], sorted(arr))
+                self.assertEqual(adaptive_merge_sort(arr, reverse=True)[0], sorted(arr, reverse=True))
+    
+    def test_adaptive_merge_sort_is_stable_and_calls_key_once(self):
+        records = [(random.randint(1, 20), i) for i in range(5000)]
+        calls = []
+        def key(record):
+            calls.append(record)
+            return record[0]
+        for reverse in (False, True):
+            with self.subTest(reverse=reverse):
+                calls.clear()
+                result, _ = adaptive_merge_sort(records, key=key, reverse=reverse)
+                self.assertEqual(result, sorted(records, key=lambda r: r[0], reverse=reverse))
+                self.assertEqual(len(calls), len(records))
+    
+    def test_adaptive_merge_sort_exploits_runs(self):
+        n = 10000
+        _, comparisons = adaptive_merge_sort(list(range(n)))
+        self.assertEqual(comparisons, n - 1)
+        _, comparisons = adaptive_merge_sort(list(range(n, 0, -1)))
+        self.assertEqual(comparisons, n - 1)
+        # A rotated list is two runs; galloping merges them in O(log n) comparisons.
+        rotated = list(range(n // 2, n)) + list(range(n // 2))
+        result, comparisons = adaptive_merge_sort(rotated)
+        self.assertEqual(result, list(range(n)))
+        self.assertLess(comparisons, n + 100)
+
+class TestSelection(unittest.TestCase):
+    def setUp(self):
+        self.data = [random.randint(0, 50) for _ in range(2000)]
+    
+    def test_select_kth(self):
+        ordered = sorted(self.data)
+        for k in [0, 1, 999, 1000, 1998, 1999]:
+            with self.subTest(k=k):
+                self.assertEqual(select_kth(self.data, k), ordered[k])
+                self.assertEqual(select_kth(np.array(self.data), k), ordered[k])
+        records = [(x, i) for i, x in enumerate(self.data)]
+        self.assertEqual(select_kth(records, 700, key=lambda r: r[0]),
+                         sorted(records, key=lambda r: r[0])[700])
+        with self.assertRaises(IndexError):
+            select_kth([], 0)
+    
+    def test_partial_sort(self):
+        records = [(x, i) for i, x in enumerate(self.data)]
+        for k in [0, 1, 10, 2000, 3000]:
+            for reverse in (False, True):
+                with self.subTest(k=k, reverse=reverse):
+                    expected = sorted(self.data, reverse=reverse)[:k]
+                    self.assertEqual(partial_sort(self.data, k, reverse=reverse), expected)
+                    self.assertEqual(partial_sort(np.array(self.data), k, reverse=reverse).tolist(), expected)
+                    self.assertEqual(partial_sort(records, k, key=lambda r: r[0], reverse=reverse),
+                                     sorted(records, key=lambda r: r[0], reverse=reverse)[:k])
+    
+    def test_top_k(self):
+        records = [(x, i) for i, x in enumerate(self.data)]
+        for k in [1, 5, 100, 5000]:
+            with self.subTest(k=k):
+                self.assertEqual(top_k(iter(records), k, key=lambda r: r[0]),
+                                 heapq.nlargest(k, records, key=lambda r: r[0]))
+                self.assertEqual(top_k(np.array(self.data), k).tolist(), heapq.nlargest(k, self.data))
+        self.assertEqual(top_k(self.data, 0), [])
+    
+    def test_percentiles(self):
+        floats = [random.random() for _ in range(1001)]
+        qs = [0, 1, 25, 50, 90, 99.9, 100]
+        for data in (floats, np.array(floats), self.data):
+            with self.subTest(kind=type(data).__name__):
+                reference = np.percentile(data, qs).tolist()
+                for got, want in zip(percentiles(data, qs), reference):
+                    self.assertAlmostEqual(got, want)
+        for small in (np.array([-120, 110, 100], dtype=np.int8),
+                      np.array([250, 3, 120, 7, 50], dtype=np.uint8),
+                      np.array([2**63, 3, 2**64 - 1], dtype=np.uint64)):
+            with self.subTest(dtype=small.dtype.name):
+                for got, want in zip(percentiles(small, qs), np.percentile(small.astype(float), qs).tolist()):
+                    self.assertAlmostEqual(got, want)
+        self.assertAlmostEqual(percentiles([5], [50])[0], 5)
+        with self.assertRaises(ValueError):
+            percentiles([], [50])
 
 # Main function to demonstrate all concepts
 def main():
@@ -554,6 +1242,10 @@ def main():
     recommended_resources()
     performance_analysis()
     optimize_quicksort()
+    demonstrate_adaptive_merge_sort()
+    benchmark_adaptive_merge_sort()
+    demonstrate_selection()
+    benchmark_selection()
     how_to_contribute()
     
     # Run unit tests
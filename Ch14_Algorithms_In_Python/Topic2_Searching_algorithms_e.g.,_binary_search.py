@@ -16,7 +16,7 @@
 
 import time
 import random
-from typing import List, Any, Callable, Optional
+from typing import List, Any, Callable, Optional, Tuple, Dict, Sequence
 import bisect
 import unittest
 import asyncio
@@ -78,20 +78,22 @@ def binary_search(arr: List[Any], target: Any) -> int:
     target (Any): The item to search for
     
     Returns:
-    int: The index of the target if found, -1 otherwise
+    int: The index of the first occurrence of the target if found, -1 otherwise
     """
     left, right = 0, len(arr) - 1
+    result = -1
     
     while left <= right:
         mid = (left + right) // 2
         if arr[mid] == target:
-            return mid
+            result = mid
+            right = mid - 1  # keep looking for an earlier duplicate
         elif arr[mid] < target:
             left = mid + 1
         else:
             right = mid - 1
     
-    return -1
+    return result
 
 def jump_search(arr: List[Any], target: Any) -> int:
     """
@@ -105,9 +107,11 @@ def jump_search(arr: List[Any], target: Any) -> int:
     target (Any): The item to search for
     
     Returns:
-    int: The index of the target if found, -1 otherwise
+    int: The index of the first occurrence of the target if found, -1 otherwise
     """
     n = len(arr)
+    if n == 0:
+        return -1
     step = int(n ** 0.5)
     prev = 0
     
@@ -139,26 +143,26 @@ def interpolation_search(arr: List[int], target: int) -> int:
     target (int): The item to search for
     
     Returns:
-    int: The index of the target if found, -1 otherwise
+    int: The index of the first occurrence of the target if found, -1 otherwise
     """
     low, high = 0, len(arr) - 1
+    result = -1
     
     while low <= high and arr[low] <= target <= arr[high]:
-        if low == high:
-            if arr[low] == target:
-                return low
-            return -1
+        if arr[low] == target:
+            return low  # everything before low is smaller
         
+        # arr[low] < target <= arr[high], so the denominator is positive
         pos = low + ((target - arr[low]) * (high - low)) // (arr[high] - arr[low])
         
-        if arr[pos] == target:
-            return pos
-        elif arr[pos] < target:
+        if arr[pos] < target:
             low = pos + 1
         else:
-            high = pos - 1
+            if arr[pos] == target:
+                result = pos
+            high = pos - 1  # an earlier duplicate can only be to the left
     
-    return -1
+    return result
 
 def demonstrate_searching_algorithms():
     """Demonstrate the usage of various searching algorithms."""
@@ -421,6 +425,9 @@ def recommended_resources():
 # ----------------------------------------
 
 import timeit
+import ast
+import os
+import numpy as np
 
 def performance_analysis():
     """Analyze and compare the performance of different searching algorithms."""
@@ -477,6 +484,237 @@ def optimize_binary_search():
     print(f"Optimized Binary Search: {optimized_time:.6f} seconds")
     print(f"Speedup: {original_time / optimized_time:.2f}x")
 
+# Batched searching with a SortedIndex
+# ------------------------------------
+# Every function above answers a single query per call, so a million lookups cost a
+# million trips through the interpreter. When queries arrive in bulk (joins, histogram
+# bucketing, range filters), it is much cheaper to hand the whole batch to NumPy and
+# let the loops run in C, like numpy.searchsorted does.
+#
+# The Eytzinger layout stores the sorted values in breadth-first (heap) order: the root
+# at index 1, the children of node k at 2k and 2k + 1. The first few levels of the
+# implicit tree sit next to each other in memory, so every query walks through hot
+# cache lines, and the descent k = 2k + (b[k] < x) needs no branches. Here the descent
+# is done for all queries at once, one tree level per NumPy operation.
+
+def eytzinger_layout(sorted_values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Re-lay a sorted array out in Eytzinger (BFS) order.
+    
+    Time complexity: O(n)
+    Space complexity: O(n)
+    
+    Args:
+    sorted_values (np.ndarray): Values in ascending order
+    
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: The 1-indexed Eytzinger array (slot 0 unused) and,
+                                   for every Eytzinger slot, the rank of its value in
+                                   the sorted array (slot 0 maps to n, "past the end")
+    """
+    n = len(sorted_values)
+    ranks = np.empty(n + 1, dtype=np.int64)
+    ranks[0] = n
+    # An in-order walk of the implicit tree visits slots in ascending value order.
+    # Walk it iteratively to stay clear of the recursion limit for large n.
+    stack = []
+    k, rank = 1, 0
+    while stack or k <= n:
+        while k <= n:
+            stack.append(k)
+            k = 2 * k
+        k = stack.pop()
+        ranks[k] = rank
+        rank += 1
+        k = 2 * k + 1
+    layout = np.empty(n + 1, dtype=sorted_values.dtype)
+    layout[1:] = sorted_values[ranks[1:]]
+    if n:
+        layout[0] = sorted_values[0]
+    return layout, ranks
+
+class SortedIndex:
+    """
+    A read-only index over a sorted array that answers whole batches of queries.
+    
+    All query methods accept a scalar or an array-like of queries and return NumPy
+    arrays of the same shape, so millions of lookups are a single call.
+    
+    Args:
+    values (Sequence): The values to index; they are sorted unless assume_sorted is True
+    layout (str): "sorted" to search the plain sorted array with numpy.searchsorted,
+                  or "eytzinger" to search a cache-friendly BFS re-layout
+    assume_sorted (bool): Skip the initial sort when the input is already ascending
+    """
+    
+    LAYOUTS = ("sorted", "eytzinger")
+    
+    def __init__(self, values: Sequence, layout: str = "sorted", assume_sorted: bool = False):
+        if layout not in self.LAYOUTS:
+            raise ValueError(f"Unknown layout {layout!r}; expected one of {self.LAYOUTS}")
+        values = np.asarray(values)
+        if values.ndim != 1:
+            raise ValueError("SortedIndex expects a one-dimensional array of values")
+        self.values = values if assume_sorted else np.sort(values, kind="stable")
+        self.layout = layout
+        if layout == "eytzinger":
+            self._tree, self._ranks = eytzinger_layout(self.values)
+            # Pad so that the masked descent below can read one level past the leaves.
+            self._tree = np.concatenate([self._tree, np.repeat(self._tree[-1:], len(self.values) + 1)])
+            self._depth = len(self.values).bit_length()
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    def __repr__(self):
+        return f"SortedIndex(n={len(self)}, layout='{self.layout}')"
+    
+    def _eytzinger_search(self, queries: np.ndarray, strict: bool) -> np.ndarray:
+        n = len(self.values)
+        k = np.ones(queries.shape, dtype=np.int64)
+        for _ in range(self._depth):
+            node = self._tree[k]
+            step = (node <= queries) if strict else (node < queries)
+            # Walkers that already fell off the tree stay where they are.
+            k = np.where(k <= n, 2 * k + step, k)
+        # Undo the trailing "went right" moves plus the final "went left" move to land on
+        # the last node where the walk turned left, i.e. the answer (0 if none).
+        lowest_zero_bit = (k + 1) & ~k
+        k = k // (2 * lowest_zero_bit)
+        return self._ranks[k]
+    
+    def _search(self, queries, side: str) -> np.ndarray:
+        queries = np.asarray(queries)
+        if len(self.values) == 0:
+            return np.zeros(queries.shape, dtype=np.int64)
+        if self.layout == "sorted":
+            return np.searchsorted(self.values, queries, side=side).astype(np.int64, copy=False)
+        return self._eytzinger_search(queries, strict=(side == "right"))
+    
+    def lower_bound(self, queries) -> np.ndarray:
+        """Index of the first value >= each query (len(self) if there is none)."""
+        return self._search(queries, "left")
+    
+    def upper_bound(self, queries) -> np.ndarray:
+        """Index of the first value > each query (len(self) if there is none)."""
+        return self._search(queries, "right")
+    
+    def contains(self, queries) -> np.ndarray:
+        """Boolean mask telling which queries are present in the index."""
+        scalar = np.ndim(queries) == 0
+        queries = np.atleast_1d(queries)
+        positions = self.lower_bound(queries)
+        found = positions < len(self.values)
+        found[found] = self.values[positions[found]] == queries[found]
+        return found[0] if scalar else found
+    
+    def find(self, queries) -> np.ndarray:
+        """Index of the leftmost occurrence of each query in self.values, -1 if absent."""
+        scalar = np.ndim(queries) == 0
+        queries = np.atleast_1d(queries)
+        found = np.where(self.contains(queries), self.lower_bound(queries), -1)
+        return found[0] if scalar else found
+    
+    def count_range(self, low, high) -> np.ndarray:
+        """Number of values v with low <= v <= high, for each (low, high) pair."""
+        counts = self.upper_bound(high) - self.lower_bound(low)
+        return np.maximum(counts, 0)
+
+def demonstrate_sorted_index():
+    """Demonstrate batched lookups with SortedIndex."""
+    data = [19, 3, 7, 7, 11, 1, 15, 7, 13]
+    queries = [0, 7, 8, 19, 20]
+    for layout in SortedIndex.LAYOUTS:
+        index = SortedIndex(data, layout=layout)
+        print(f"\n{index} over {index.values.tolist()}")
+        print("Queries:", queries)
+        print("Lower bounds:", index.lower_bound(queries).tolist())
+        print("Upper bounds:", index.upper_bound(queries).tolist())
+        print("Find:", index.find(queries).tolist())
+        print("Values in [5, 14]:", int(index.count_range(5, 14)))
+
+def load_script_functions(path: str, names: List[str]) -> Dict[str, Callable]:
+    """
+    Load selected top-level functions from a script without running the script itself.
+    
+    Note sheets like QuickStart/_algorithms.py interleave their definitions with demo
+    code that prints (and sometimes fails) at import time, so only the requested
+    'def' statements are compiled and executed.
+    
+    Args:
+    path (str): Path to the Python source file
+    names (List[str]): Names of the functions to load; the first definition wins
+    
+    Returns:
+    Dict[str, Callable]: The loaded functions, keyed by name
+    """
+    with open(path, encoding="utf-8") as source_file:
+        tree = ast.parse(source_file.read(), filename=path)
+    selected = {}
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name in names and node.name not in selected:
+            selected[node.name] = node
+    missing = set(names) - set(selected)
+    if missing:
+        raise LookupError(f"{path} does not define: {', '.join(sorted(missing))}")
+    module = ast.Module(body=list(selected.values()), type_ignores=[])
+    namespace: Dict[str, Any] = {}
+    exec(compile(module, path, "exec"), namespace)
+    return {name: namespace[name] for name in names}
+
+QUICKSTART_ALGORITHMS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "QuickStart", "_algorithms.py")
+
+def benchmark_search_functions(size: int = 1_000_000, num_queries: int = 1_000_000, sample: int = 2_000):
+    """
+    Compare every single-query search function with the batched SortedIndex layouts.
+    
+    The single-query functions are timed on a random sample of the queries and the
+    per-query cost is reported as queries per second, so that the numbers are directly
+    comparable with one SortedIndex call over all num_queries queries.
+    """
+    rng = np.random.default_rng(42)
+    values = np.sort(rng.integers(0, 10 * size, size=size))
+    queries = rng.integers(0, 10 * size, size=num_queries)
+    arr = values.tolist()
+    sample_queries = queries[:sample].tolist()
+    last = len(arr) - 1
+    
+    algorithms = [
+        ("Binary Search", binary_search),
+        ("Jump Search", jump_search),
+        ("Interpolation Search", interpolation_search),
+        ("Exponential Search", exponential_search),
+        ("Binary Search (bisect)", binary_search_bisect),
+    ]
+    try:
+        quickstart = load_script_functions(
+            QUICKSTART_ALGORITHMS,
+            ["recursive_binary_search", "ternary_search", "interpolation_search"],
+        )
+        algorithms += [
+            ("QuickStart recursive_binary_search", lambda a, t: quickstart["recursive_binary_search"](a, t, 0, last)),
+            ("QuickStart ternary_search", lambda a, t: quickstart["ternary_search"](a, 0, last, t)),
+            ("QuickStart interpolation_search", quickstart["interpolation_search"]),
+        ]
+    except (OSError, LookupError) as e:
+        print(f"Skipping QuickStart search functions: {e}")
+    
+    print(f"\nSearch benchmark: {size:,} sorted values, {num_queries:,} queries")
+    print("----------------------------------------------------------------")
+    # Linear search is O(n) per query; a handful of queries is enough to price it.
+    linear_sample = sample_queries[:20]
+    elapsed = timeit.timeit(lambda: [linear_search(arr, q) for q in linear_sample], number=1)
+    print(f"{'Linear Search':<36} {len(linear_sample) / elapsed:>14,.0f} queries/s")
+    for name, func in algorithms:
+        elapsed = timeit.timeit(lambda: [func(arr, q) for q in sample_queries], number=1)
+        print(f"{name:<36} {len(sample_queries) / elapsed:>14,.0f} queries/s")
+    
+    for layout in SortedIndex.LAYOUTS:
+        index = SortedIndex(values, layout=layout, assume_sorted=True)
+        index.find(queries[:1000])  # Warm up
+        elapsed = timeit.timeit(lambda: index.find(queries), number=3) / 3
+        print(f"{'SortedIndex.find (' + layout + ')':<36} {num_queries / elapsed:>14,.0f} queries/s")
+
 # 9. How to Contribute
 # --------------------
 
@@ -495,6 +733,11 @@ def how_to_contribute():
     print("- Add relevant references or citations for advanced topics.")
 
 # Unit Tests
+def binary_search_leftmost_index(arr: List[Any], target: Any) -> int:
+    """Reference implementation used by the SortedIndex tests."""
+    index = bisect.bisect_left(arr, target)
+    return index if index < len(arr) and arr[index] == target else -1
+
 class TestSearchingAlgorithms(unittest.TestCase):
     def setUp(self):
         self.test_arrays = [
@@ -538,6 +781,61 @@ class TestSearchingAlgorithms(unittest.TestCase):
                     target = random.choice(arr)
                     self.assertEqual(interpolation_search(arr, target), arr.index(target))
                 self.assertEqual(interpolation_search(arr, -1), -1)
+    
+    def test_duplicates_return_first_index(self):
+        arrays = [[5, 5], [2, 2, 2, 5, 5, 9], [1] * 10 + [2] * 10, sorted(random.choices(range(20), k=200))]
+        for arr in arrays:
+            for target in range(-1, 22):
+                expected = arr.index(target) if target in arr else -1
+                for search in (binary_search, jump_search, interpolation_search):
+                    with self.subTest(search=search.__name__, arr=arr, target=target):
+                        self.assertEqual(search(arr, target), expected)
+
+class TestSortedIndex(unittest.TestCase):
+    def setUp(self):
+        self.values = [random.randint(-50, 50) for _ in range(500)]
+        self.queries = list(range(-60, 61))
+    
+    def test_bounds_match_bisect(self):
+        ordered = sorted(self.values)
+        for layout in SortedIndex.LAYOUTS:
+            with self.subTest(layout=layout):
+                index = SortedIndex(self.values, layout=layout)
+                self.assertEqual(index.lower_bound(self.queries).tolist(),
+                                 [bisect.bisect_left(ordered, q) for q in self.queries])
+                self.assertEqual(index.upper_bound(self.queries).tolist(),
+                                 [bisect.bisect_right(ordered, q) for q in self.queries])
+    
+    def test_find_and_count_range(self):
+        ordered = sorted(self.values)
+        for layout in SortedIndex.LAYOUTS:
+            with self.subTest(layout=layout):
+                index = SortedIndex(self.values, layout=layout)
+                self.assertEqual(index.find(self.queries).tolist(),
+                                 [binary_search_leftmost_index(ordered, q) for q in self.queries])
+                self.assertEqual(int(index.count_range(-10, 10)),
+                                 sum(1 for v in self.values if -10 <= v <= 10))
+                self.assertEqual(int(index.count_range(10, -10)), 0)
+    
+    def test_scalar_queries(self):
+        ordered = sorted(self.values)
+        for layout in SortedIndex.LAYOUTS:
+            index = SortedIndex(self.values, layout=layout)
+            for q in (-60, ordered[0], ordered[250], 7, 60):
+                with self.subTest(layout=layout, query=q):
+                    self.assertEqual(bool(index.contains(q)), q in ordered)
+                    self.assertEqual(int(index.find(q)), binary_search_leftmost_index(ordered, q))
+                    self.assertEqual(np.ndim(index.find(q)), 0)
+    
+    def test_small_and_empty_indexes(self):
+        for size in range(0, 17):
+            values = list(range(0, 2 * size, 2))
+            for layout in SortedIndex.LAYOUTS:
+                with self.subTest(size=size, layout=layout):
+                    index = SortedIndex(values, layout=layout, assume_sorted=True)
+                    queries = list(range(-1, 2 * size + 1))
+                    self.assertEqual(index.lower_bound(queries).tolist(),
+                                     [bisect.bisect_left(values, q) for q in queries])
 
 # Main function to demonstrate all concepts
 def main():
@@ -550,6 +848,8 @@ def main():
     recommended_resources()
     performance_analysis()
     optimize_binary_search()
+    demonstrate_sorted_index()
+    benchmark_search_functions()
     how_to_contribute()
     
     # Run unit tests
@@ -15,10 +15,14 @@
 # Author: Sabbir Hossain
 
 import heapq
-from typing import Dict, List, Tuple, Set, Optional
-from collections import deque, defaultdict
+import itertools
+import os
+from typing import Dict, List, Tuple, Set, Optional, Union
+from collections import Counter, deque, defaultdict
 import time
 import random
+import unittest
+import numpy as np
 
 # 1. Overview and Historical Context
 # ----------------------------------
@@ -71,6 +75,238 @@ class Graph:
                     edges.append((u, v, weight))
         return edges
 
+# Compressed sparse row (CSR) graphs
+# ----------------------------------
+# The dict-of-lists Graph above stores every edge as a Python tuple inside a list,
+# about 100+ bytes per edge, and every traversal chases pointers between objects.
+# CSRGraph packs the same adjacency into three flat NumPy arrays:
+# - indptr[u]:indptr[u + 1] is the range of u's edges
+# - indices holds the target vertex of every edge
+# - weights holds the matching edge weights
+# so a 10M-edge graph needs ~160 MB instead of gigabytes, neighbor lists are contiguous
+# slices, and the arrays can be saved as .npy files and memory-mapped back in.
+# Vertices are the integers 0..num_vertices - 1. The graph is immutable: build a new one
+# to change it.
+
+class CSRGraph:
+    """An immutable graph stored as compressed sparse row arrays."""
+    
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray, directed: bool = True):
+        if indptr.ndim != 1 or len(indptr) == 0 or indptr[0] != 0:
+            raise ValueError("indptr must be a 1-D array starting at 0")
+        if len(indices) != indptr[-1] or len(weights) != len(indices):
+            raise ValueError("indices and weights must both have indptr[-1] entries")
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.directed = directed
+        self._transposed = None
+        for array in (indptr, indices, weights):
+            if isinstance(array, np.ndarray) and array.flags.owndata:
+                array.flags.writeable = False
+    
+    @classmethod
+    def from_edges(cls, sources, targets, weights=None, num_vertices: Optional[int] = None,
+                   directed: bool = True) -> "CSRGraph":
+        """
+        Build a CSRGraph from parallel edge arrays.
+        
+        Args:
+        sources, targets: Array-likes of non-negative vertex ids
+        weights: Array-like of edge weights (all 1 if None)
+        num_vertices (int): Number of vertices (max id + 1 if None)
+        directed (bool): If False, every edge is also added in the reverse direction
+        
+        Returns:
+        CSRGraph with each vertex's edges in input order. Time: O(V + E log E)
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.ones(len(sources)) if weights is None else np.asarray(weights)
+        if not len(sources) == len(targets) == len(weights):
+            raise ValueError("sources, targets and weights must have the same length")
+        if len(sources) and min(sources.min(), targets.min()) < 0:
+            raise ValueError("vertex ids must be non-negative")
+        if num_vertices is None:
+            num_vertices = int(max(sources.max(), targets.max())) + 1 if len(sources) else 0
+        elif len(sources) and max(sources.max(), targets.max()) >= num_vertices:
+            raise ValueError("vertex id out of range for num_vertices")
+        
+        if not directed:
+            # Interleave (u, v) and (v, u) so neighbor order matches Graph.add_edge.
+            sources, targets = (np.column_stack((sources, targets)).ravel(),
+                                np.column_stack((targets, sources)).ravel())
+            weights = np.repeat(weights, 2)
+        
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(num_vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_vertices), out=indptr[1:])
+        index_dtype = np.int32 if num_vertices < 2**31 else np.int64
+        return cls(indptr, targets[order].astype(index_dtype), weights[order], directed)
+    
+    @classmethod
+    def from_graph(cls, graph: Graph) -> "CSRGraph":
+        """Convert a dict-based Graph whose vertices are non-negative integers."""
+        sources, targets, weights = [], [], []
+        for u, edges in graph.graph.items():
+            for v, weight in edges:
+                sources.append(u)
+                targets.append(v)
+                weights.append(weight)
+        vertices = set(graph.graph) | set(targets)
+        if any(not isinstance(v, (int, np.integer)) or v < 0 for v in vertices):
+            raise ValueError("CSRGraph requires non-negative integer vertices")
+        num_vertices = max(vertices) + 1 if vertices else 0
+        # The adjacency lists already contain both directions of undirected edges.
+        csr = cls.from_edges(sources, targets, weights, num_vertices, directed=True)
+        csr.directed = graph.directed
+        return csr
+    
+    @property
+    def num_vertices(self) -> int:
+        return len(self.indptr) - 1
+    
+    @property
+    def num_edges(self) -> int:
+        """Number of stored arcs (undirected edges are stored once per direction)."""
+        return len(self.indices)
+    
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.indices.nbytes + self.weights.nbytes
+    
+    def neighbors(self, u: int) -> np.ndarray:
+        return self.indices[self.indptr[u]:self.indptr[u + 1]]
+    
+    def edge_weights(self, u: int) -> np.ndarray:
+        return self.weights[self.indptr[u]:self.indptr[u + 1]]
+    
+    def out_degrees(self) -> np.ndarray:
+        return np.diff(self.indptr)
+    
+    def sources(self) -> np.ndarray:
+        """The source vertex of every stored arc, parallel to indices and weights."""
+        return np.repeat(np.arange(self.num_vertices), self.out_degrees())
+    
+    def get_vertices(self) -> List[int]:
+        return list(range(self.num_vertices))
+    
+    def get_edges(self) -> List[Tuple[int, int, int]]:
+        sources = self.sources()
+        keep = slice(None) if self.directed else sources <= self.indices
+        return list(zip(sources[keep].tolist(), self.indices[keep].tolist(), self.weights[keep].tolist()))
+    
+    def transpose(self) -> "CSRGraph":
+        """The graph with every edge reversed (cached, since the graph is immutable)."""
+        if not self.directed:
+            return self
+        if self._transposed is None:
+            self._transposed = CSRGraph.from_edges(self.indices, self.sources(), self.weights,
+                                                   self.num_vertices, directed=True)
+        return self._transposed
+    
+    def save(self, directory: str):
+        """Write the arrays as .npy files into directory."""
+        os.makedirs(directory, exist_ok=True)
+        for name in ("indptr", "indices", "weights"):
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        np.save(os.path.join(directory, "directed.npy"), np.array(self.directed))
+    
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "CSRGraph":
+        """Load a saved graph; with mmap=True the arrays are paged in from disk on demand."""
+        mode = "r" if mmap else None
+        indptr, indices, weights = (np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode)
+                                    for name in ("indptr", "indices", "weights"))
+        directed = bool(np.load(os.path.join(directory, "directed.npy")))
+        return cls(indptr, indices, weights, directed)
+    
+    def __repr__(self) -> str:
+        kind = "directed" if self.directed else "undirected"
+        return f"CSRGraph({self.num_vertices} vertices, {self.num_edges} arcs, {kind})"
+
+# The functions below are the CSRGraph versions of bfs, dijkstra, topological_sort and
+# strongly_connected_components; those functions dispatch here when given a CSRGraph.
+# They are iterative, so deep graphs don't hit the recursion limit, and keep per-vertex
+# state in arrays instead of dicts.
+
+def _bfs_csr(graph: CSRGraph, start: int) -> List[int]:
+    indptr, indices = graph.indptr, graph.indices
+    visited = bytearray(graph.num_vertices)
+    visited[start] = 1
+    order = [start]
+    for vertex in order:  # order doubles as the queue
+        for neighbor in indices[indptr[vertex]:indptr[vertex + 1]].tolist():
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                order.append(neighbor)
+    return order
+
+def _dijkstra_csr(graph: CSRGraph, start: int) -> np.ndarray:
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    # A list gives much faster scalar reads and writes than an array in this loop.
+    distances = [float('infinity')] * graph.num_vertices
+    distances[start] = 0
+    pq = [(0, start)]
+    while pq:
+        current_distance, current_vertex = heapq.heappop(pq)
+        if current_distance > distances[current_vertex]:
+            continue
+        begin, end = indptr[current_vertex], indptr[current_vertex + 1]
+        for neighbor, weight in zip(indices[begin:end].tolist(), weights[begin:end].tolist()):
+            distance = current_distance + weight
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                heapq.heappush(pq, (distance, neighbor))
+    return np.array(distances, dtype=np.float64)
+
+def _postorder_csr(graph: CSRGraph, roots) -> List[int]:
+    """Iterative DFS from each unvisited root; returns vertices in post-order."""
+    indptr, indices = graph.indptr, graph.indices
+    visited = bytearray(graph.num_vertices)
+    postorder = []
+    for root in roots:
+        if visited[root]:
+            continue
+        visited[root] = 1
+        stack = [(root, iter(indices[indptr[root]:indptr[root + 1]].tolist()))]
+        while stack:
+            vertex, neighbors = stack[-1]
+            for neighbor in neighbors:
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    stack.append((neighbor, iter(indices[indptr[neighbor]:indptr[neighbor + 1]].tolist())))
+                    break
+            else:
+                stack.pop()
+                postorder.append(vertex)
+    return postorder
+
+def _topological_sort_csr(graph: CSRGraph) -> List[int]:
+    return _postorder_csr(graph, range(graph.num_vertices))[::-1]
+
+def _strongly_connected_components_csr(graph: CSRGraph) -> List[List[int]]:
+    # Kosaraju: components of the transpose, visited in reverse post-order of the graph
+    postorder = _postorder_csr(graph, range(graph.num_vertices))
+    transposed = graph.transpose()
+    indptr, indices = transposed.indptr, transposed.indices
+    visited = bytearray(graph.num_vertices)
+    components = []
+    for root in reversed(postorder):
+        if visited[root]:
+            continue
+        visited[root] = 1
+        component, stack = [], [root]
+        while stack:
+            vertex = stack.pop()
+            component.append(vertex)
+            for neighbor in indices[indptr[vertex]:indptr[vertex + 1]].tolist():
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    stack.append(neighbor)
+        components.append(component)
+    return components
+
 def dfs_recursive(graph: Graph, start: int, visited: Set[int] = None) -> List[int]:
     if visited is None:
         visited = set()
@@ -81,7 +317,9 @@ def dfs_recursive(graph: Graph, start: int, visited: Set[int] = None) -> List[in
             result.extend(dfs_recursive(graph, neighbor, visited))
     return result
 
-def bfs(graph: Graph, start: int) -> List[int]:
+def bfs(graph: Union[Graph, CSRGraph], start: int) -> List[int]:
+    if isinstance(graph, CSRGraph):
+        return _bfs_csr(graph, start)
     visited = set()
     queue = deque([start])
     result = []
@@ -93,7 +331,9 @@ def bfs(graph: Graph, start: int) -> List[int]:
             queue.extend(neighbor for neighbor, _ in graph.graph[vertex] if neighbor not in visited)
     return result
 
-def dijkstra(graph: Graph, start: int) -> Dict[int, int]:
+def dijkstra(graph: Union[Graph, CSRGraph], start: int) -> Union[Dict[int, int], np.ndarray]:
+    if isinstance(graph, CSRGraph):
+        return _dijkstra_csr(graph, start)  # array of distances indexed by vertex
     distances = {vertex: float('infinity') for vertex in graph.get_vertices()}
     distances[start] = 0
     pq = [(0, start)]
@@ -176,7 +416,9 @@ def floyd_warshall(graph: Graph) -> Dict[Tuple[int, int], int]:
     
     return dist
 
-def topological_sort(graph: Graph) -> List[int]:
+def topological_sort(graph: Union[Graph, CSRGraph]) -> List[int]:
+    if isinstance(graph, CSRGraph):
+        return _topological_sort_csr(graph)
     def dfs(v, visited, stack):
         visited[v] = True
         for neighbor, _ in graph.graph[v]:
@@ -191,7 +433,9 @@ def topological_sort(graph: Graph) -> List[int]:
             dfs(v, visited, stack)
     return stack[::-1]
 
-def strongly_connected_components(graph: Graph) -> List[List[int]]:
+def strongly_connected_components(graph: Union[Graph, CSRGraph]) -> List[List[int]]:
+    if isinstance(graph, CSRGraph):
+        return _strongly_connected_components_csr(graph)
     def dfs(v, visited, stack):
         visited[v] = True
         for neighbor, _ in graph.graph[v]:
@@ -305,9 +549,22 @@ def iterative_deepening_dfs(graph: Graph, start: int, goal: int) -> Optional[Lis
 class SocialNetwork:
     def __init__(self):
         self.graph = Graph(directed=False)
+        self.index = None
     
     def add_friendship(self, user1: int, user2: int):
         self.graph.add_edge(user1, user2)
+        if self.index is not None:
+            self.index.add_friendship(user1, user2)
+    
+    def build_recommendation_index(self, k: int = 10, processes: int = 1):
+        """Precompute suggestions by mutual friends (see FriendRecommendationIndex in section 8)."""
+        self.index = FriendRecommendationIndex.build(self.graph, k, processes=processes)
+    
+    def recommend_mutual_friends(self, user: int, max_recommendations: int = 5) -> List[Tuple[int, int]]:
+        """(user, mutual friends) pairs from the index built by build_recommendation_index()."""
+        if self.index is None:
+            raise RuntimeError("call build_recommendation_index() first")
+        return self.index.recommend(user, max_recommendations)
     
     def recommend_friends(self, user: int, max_recommendations: int = 5) -> List[Tuple[int, int]]:
         visited = set([user])
@@ -340,6 +597,13 @@ def demonstrate_social_network():
     print("Friend recommendations for user 1:")
     for user, distance in recommendations:
         print(f"User {user} (distance: {distance})")
+    
+    # Rank by mutual friends instead, from a precomputed index
+    social_network.build_recommendation_index()
+    social_network.add_friendship(3, 5)
+    print("By mutual friends, after 3 and 5 became friends:")
+    for user, mutual in social_network.recommend_mutual_friends(1):
+        print(f"User {user} (mutual friends: {mutual})")
 
 # 5. Advanced Concepts and Emerging Trends
 # ----------------------------------------
@@ -365,26 +629,29 @@ def demonstrate_social_network():
 
 # Example: Simple Graph Embedding using Node2Vec-inspired approach
 
-import numpy as np
-
-def simple_node2vec(graph: Graph, dimensions: int = 64, walk_length: int = 10, num_walks: int = 10) -> Dict[int, np.ndarray]:
-    def random_walk(start_node):
-        walk = [start_node]
-        for _ in range(walk_length - 1):
-            current = walk[-1]
-            neighbors = [v for v, _ in graph.graph[current]]
-            if not neighbors:
-                break
-            walk.append(random.choice(neighbors))
-        return walk
-    
-    walks = []
-    for _ in range(num_walks):
-        for node in graph.get_vertices():
-            walks.append(random_walk(node))
+def simple_node2vec(graph: Union[Graph, CSRGraph], dimensions: int = 64, walk_length: int = 10, num_walks: int = 10,
+                    p: float = 1.0, q: float = 1.0) -> Dict[int, np.ndarray]:
+    # All walks advance together over CSR arrays (see RandomWalker in section 8).
+    vertices = graph.get_vertices()
+    starts, labels = vertices, None
+    if isinstance(graph, Graph):
+        try:
+            graph = CSRGraph.from_graph(graph)
+        except ValueError:
+            # Vertices that aren't non-negative integers are relabeled 0..n-1 for the
+            # walks and mapped back afterwards.
+            labels = list(dict.fromkeys([*vertices, *(v for edges in graph.graph.values() for v, _ in edges)]))
+            ids = {v: i for i, v in enumerate(labels)}
+            arcs = [(ids[u], ids[v], weight) for u, edges in graph.graph.items() for v, weight in edges]
+            sources, targets, weights = zip(*arcs) if arcs else ((), (), ())
+            graph = CSRGraph.from_edges(sources, targets, weights, len(labels))
+            starts = np.arange(len(vertices))
+    walks = RandomWalker(graph, p, q).walk(np.tile(starts, num_walks), walk_length)
+    if labels is not None:
+        walks = np.fromiter([*labels, None], dtype=object, count=len(labels) + 1)[walks]  # -1 maps to None
     
     # Simplified word2vec-style training (this is a placeholder and not a real implementation)
-    node_embeddings = {node: np.random.rand(dimensions) for node in graph.get_vertices()}
+    node_embeddings = {node: np.random.rand(dimensions) for node in vertices}
     
     # In a real implementation, you would train the embeddings using the random walks
     # and techniques similar to word2vec (e.g., skip-gram model)
@@ -402,7 +669,9 @@ def simple_node2vec(graph: Graph, dimensions: int = 64, walk_length: int = 10, n
 # Q: How can I detect cycles in a graph?
 # A: You can use DFS with a recursion stack or color-coding approach:
 
-def has_cycle(graph: Graph) -> bool:
+def has_cycle(graph: Union[Graph, CSRGraph]) -> bool:
+    if isinstance(graph, CSRGraph):
+        return bool(find_cycle(graph))
     def dfs_cycle(v, visited, rec_stack):
         visited[v] = True
         rec_stack[v] = True
@@ -559,6 +828,885 @@ def demonstrate_performance_analysis():
     for name, (result, time) in results.items():
         print(f"{name}: {time:.6f} seconds")
 
+def generate_random_edges(num_vertices: int, num_edges: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Random edge arrays without self-loops, weights 1..100 (like generate_random_graph)."""
+    rng = np.random.default_rng(seed)
+    sources = rng.integers(0, num_vertices, num_edges)
+    targets = (sources + rng.integers(1, num_vertices, num_edges)) % num_vertices
+    return sources, targets, rng.integers(1, 101, num_edges).astype(np.float64)
+
+def compare_graph_backends(num_vertices: int = 200_000, num_edges: int = 1_000_000):
+    """Compare memory use and traversal speed of Graph and CSRGraph on the same edges."""
+    import tempfile
+    import tracemalloc
+    
+    sources, targets, weights = generate_random_edges(num_vertices, num_edges)
+    edge_list = list(zip(sources.tolist(), targets.tolist(), weights.tolist()))
+    
+    def build_graph():
+        graph = Graph()
+        for u, v, w in edge_list:
+            graph.add_edge(u, v, w)
+        return graph
+    
+    tracemalloc.start()
+    build_graph()
+    dict_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    graph, dict_build = benchmark_algorithm(lambda _: build_graph(), None)
+    
+    start_time = timeit.default_timer()
+    csr = CSRGraph.from_edges(sources, targets, weights, num_vertices, directed=False)
+    csr_build = timeit.default_timer() - start_time
+    
+    print(f"Graph with {num_vertices:,} vertices and {num_edges:,} undirected edges:")
+    print(f"{'':<12}{'Graph':>14}{'CSRGraph':>14}")
+    print(f"{'memory':<12}{dict_bytes / 2**20:>11.1f} MB{csr.nbytes / 2**20:>11.1f} MB")
+    print(f"{'build':<12}{dict_build:>12.3f} s{csr_build:>12.3f} s")
+    start = 0
+    for name, algorithm in [("BFS", bfs), ("Dijkstra", dijkstra)]:
+        dict_result, dict_time = benchmark_algorithm(algorithm, graph, start)
+        csr_result, csr_time = benchmark_algorithm(algorithm, csr, start)
+        if name == "BFS":
+            assert dict_result == csr_result
+        else:
+            assert all(csr_result[v] == d for v, d in dict_result.items())
+        print(f"{name:<12}{dict_time:>12.3f} s{csr_time:>12.3f} s")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        csr.save(directory)
+        start_time = timeit.default_timer()
+        mapped = CSRGraph.load(directory, mmap=True)
+        load_time = timeit.default_timer() - start_time
+        print(f"Memory-mapped load: {load_time * 1000:.2f} ms, BFS over the mapped graph "
+              f"visits {len(bfs(mapped, start)):,} vertices")
+        del mapped
+
+# Frontier-based BFS
+# ------------------
+# bfs() above dequeues one vertex at a time, so every edge costs a trip through the
+# interpreter. A level-synchronous BFS expands the whole frontier with a few array
+# operations per level instead:
+# - top-down: gather all edges leaving the frontier and keep the unvisited targets.
+# - bottom-up: gather all edges entering the unvisited vertices and keep those that
+#   come from the frontier. On the middle levels of a small-world graph the frontier
+#   touches most edges anyway, while the unvisited set is shrinking fast, so this is
+#   cheaper (Beamer, Asanovic and Patterson, "Direction-Optimizing BFS", 2012).
+# With direction="auto" the search switches to bottom-up when the frontier's edges
+# outnumber the unvisited vertices' edges / alpha, and back to top-down when the
+# frontier shrinks below num_vertices / beta.
+
+def _edge_positions(indptr: np.ndarray, vertices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions in indices of all edges of the given vertices, and each vertex's degree."""
+    starts = indptr[vertices]
+    counts = indptr[vertices + 1] - starts
+    offsets = np.cumsum(counts) - counts
+    positions = np.arange(offsets[-1] + counts[-1] if len(counts) else 0, dtype=np.int64)
+    positions += np.repeat(starts - offsets, counts)
+    return positions, counts
+
+def bfs_frontier(graph: CSRGraph, sources, direction: str = "auto", alpha: float = 14.0,
+                 beta: float = 24.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Level-synchronous, direction-optimizing BFS from one or many sources.
+    
+    Args:
+    graph (CSRGraph): The graph to search
+    sources: A vertex or a sequence of vertices that all start at distance 0
+    direction (str): "auto", "top-down" or "bottom-up"
+    alpha, beta (float): Switching thresholds for direction="auto"
+    
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: hop distances (-1 if unreachable) and BFS-tree parents
+    (-1 if unreachable, the vertex itself for sources). Time: O(V + E) per search,
+    O(V) array work per level
+    """
+    if direction not in ("auto", "top-down", "bottom-up"):
+        raise ValueError(f"unknown direction: {direction!r}")
+    n = graph.num_vertices
+    incoming = graph.transpose()
+    out_degrees = graph.out_degrees()
+    in_degrees = incoming.out_degrees()
+    
+    distances = np.full(n, -1, dtype=np.int32)
+    parents = np.full(n, -1, dtype=np.int64)
+    frontier = np.unique(np.atleast_1d(np.asarray(sources, dtype=np.int64)))
+    distances[frontier] = 0
+    parents[frontier] = frontier
+    unvisited = None
+    unvisited_edges = int(in_degrees.sum()) - int(in_degrees[frontier].sum())
+    bottom_up = direction == "bottom-up"
+    level = 0
+    
+    while len(frontier):
+        level += 1
+        if direction == "auto":
+            frontier_edges = int(out_degrees[frontier].sum())
+            if not bottom_up and frontier_edges > unvisited_edges / alpha:
+                bottom_up = True
+            elif bottom_up and len(frontier) < n / beta:
+                bottom_up = False
+        
+        if bottom_up:
+            if unvisited is None:
+                unvisited = np.flatnonzero(distances < 0)
+            positions, counts = _edge_positions(incoming.indptr, unvisited)
+            candidates = incoming.indices[positions]
+            hits = np.flatnonzero(distances[candidates] == level - 1)
+            owners = np.repeat(np.arange(len(unvisited)), counts)[hits]
+            first = np.ones(len(owners), dtype=bool)
+            first[1:] = owners[1:] != owners[:-1]
+            frontier = unvisited[owners[first]]
+            parents[frontier] = candidates[hits[first]]
+            distances[frontier] = level
+        else:
+            positions, counts = _edge_positions(graph.indptr, frontier)
+            targets = graph.indices[positions]
+            new = distances[targets] < 0
+            targets = targets[new]
+            # Any frontier vertex is a valid parent, so duplicates can simply overwrite.
+            parents[targets] = np.repeat(frontier, counts)[new]
+            distances[targets] = level
+            # Deduplicate by sorting small frontiers, by scanning the distances for large ones.
+            frontier = np.unique(targets) if len(targets) < n // 64 else np.flatnonzero(distances == level)
+        
+        unvisited_edges -= int(in_degrees[frontier].sum())
+        if unvisited is not None:
+            unvisited = unvisited[distances[unvisited] < 0]
+    return distances, parents
+
+def path_from_parents(parents: np.ndarray, target: int) -> List[int]:
+    """Walk BFS-tree parents back from target to its source."""
+    if parents[target] < 0:
+        return []
+    path = [target]
+    while parents[path[-1]] != path[-1]:
+        path.append(int(parents[path[-1]]))
+    return path[::-1]
+
+def benchmark_frontier_bfs(num_vertices: int = 5_000_000, num_edges: int = 10_000_000):
+    """Hop distances on a large random social graph: per-vertex BFS vs. frontier BFS."""
+    sources, targets, _ = generate_random_edges(num_vertices, num_edges)
+    graph = CSRGraph.from_edges(sources, targets, np.ones(num_edges, dtype=np.float32),
+                                num_vertices, directed=False)
+    del sources, targets
+    print(f"Random social graph: {num_vertices:,} vertices, {num_edges:,} friendships")
+    
+    for direction in ("top-down", "bottom-up", "auto"):
+        (distances, _), elapsed = benchmark_algorithm(bfs_frontier, graph, 0, direction=direction)
+        print(f"bfs_frontier({direction}): {elapsed:.2f} s, "
+              f"{np.count_nonzero(distances >= 0):,} reached, max distance {distances.max()}")
+    (distances, _), elapsed = benchmark_algorithm(bfs_frontier, graph, [0, 1, 2, 3])
+    print(f"bfs_frontier from 4 sources: {elapsed:.2f} s, max distance {distances.max()}")
+    order, elapsed = benchmark_algorithm(bfs, graph, 0)
+    print(f"bfs (one vertex at a time): {elapsed:.2f} s, {len(order):,} reached")
+
+# Point-to-point shortest paths
+# -----------------------------
+# dijkstra() answers "distances from start to everything" and begins every call by
+# building a dict over all vertices. A route planner asks "from s to t" thousands of
+# times, so PointToPointSearch instead:
+# 1. Stops as soon as the target is settled (or, bidirectionally, as soon as the two
+#    searches provably cannot improve on the best meeting point).
+# 2. Keeps its distance and parent arrays between queries. Each entry carries the
+#    number of the query that wrote it, so entries from older queries count as
+#    "infinity" and no O(V) reset is needed.
+# 3. Supports A* with a pluggable heuristic h(vertex, target): any lower bound on the
+#    remaining distance keeps the result exact while steering the search toward t.
+
+class PointToPointSearch:
+    """Reusable point-to-point shortest-path queries over a CSRGraph."""
+    
+    def __init__(self, graph: CSRGraph):
+        self.graph = graph
+        self.reverse = graph.transpose()
+        n = graph.num_vertices
+        # Index 0 is the forward search, index 1 the backward search.
+        self._distances = ([0.0] * n, [0.0] * n)
+        self._parents = ([-1] * n, [-1] * n)
+        self._versions = ([0] * n, [0] * n)
+        self._version = 0
+        self.settled = 0  # vertices settled by the last query
+    
+    def _path(self, meeting: int) -> List[int]:
+        path = [meeting]
+        while self._parents[0][path[-1]] != path[-1]:
+            path.append(self._parents[0][path[-1]])
+        path.reverse()
+        while self._parents[1][path[-1]] != path[-1]:
+            path.append(self._parents[1][path[-1]])
+        return path
+    
+    def dijkstra(self, source: int, target: int) -> Tuple[float, List[int]]:
+        """Dijkstra's algorithm that stops once target is settled."""
+        return self.astar(source, target, heuristic=None)
+    
+    def astar(self, source: int, target: int, heuristic=None) -> Tuple[float, List[int]]:
+        """
+        A* search from source to target.
+        
+        Args:
+        source, target (int): Endpoints of the route
+        heuristic: Callable h(vertex, target) returning a lower bound on the distance
+                   from vertex to target (None means plain Dijkstra)
+        
+        Returns:
+        Tuple[float, List[int]]: The distance and the path, or (inf, []) if unreachable
+        """
+        self._version += 1
+        version = self._version
+        distances, parents, versions = self._distances[0], self._parents[0], self._versions[0]
+        indptr, indices, weights = self.graph.indptr, self.graph.indices, self.graph.weights
+        # The backward parent of target marks the end of the path for _path().
+        self._parents[1][target] = target
+        distances[source], parents[source], versions[source] = 0.0, source, version
+        pq = [(heuristic(source, target) if heuristic else 0.0, 0.0, source)]
+        settled = 0
+        while pq:
+            _, current_distance, current_vertex = heapq.heappop(pq)
+            if current_distance > distances[current_vertex]:
+                continue
+            settled += 1
+            if current_vertex == target:
+                self.settled = settled
+                return current_distance, self._path(target)
+            begin, end = indptr[current_vertex], indptr[current_vertex + 1]
+            for neighbor, weight in zip(indices[begin:end].tolist(), weights[begin:end].tolist()):
+                distance = current_distance + weight
+                if versions[neighbor] != version or distance < distances[neighbor]:
+                    distances[neighbor], parents[neighbor], versions[neighbor] = distance, current_vertex, version
+                    estimate = distance + heuristic(neighbor, target) if heuristic else distance
+                    heapq.heappush(pq, (estimate, distance, neighbor))
+        self.settled = settled
+        return float('infinity'), []
+    
+    def bidirectional_dijkstra(self, source: int, target: int) -> Tuple[float, List[int]]:
+        """
+        Run Dijkstra forward from source and backward from target, always advancing the
+        side whose queue has the smaller minimum, until top_forward + top_backward can
+        no longer beat the best path through a vertex reached by both searches.
+        """
+        self._version += 1
+        version = self._version
+        graphs = (self.graph, self.reverse)
+        queues = ([(0.0, source)], [(0.0, target)])
+        for side, vertex in ((0, source), (1, target)):
+            self._distances[side][vertex] = 0.0
+            self._parents[side][vertex] = vertex
+            self._versions[side][vertex] = version
+        best, meeting = (0.0, source) if source == target else (float('infinity'), -1)
+        settled = 0
+        
+        while queues[0] and queues[1] and queues[0][0][0] + queues[1][0][0] < best:
+            side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+            current_distance, current_vertex = heapq.heappop(queues[side])
+            distances, parents, versions = self._distances[side], self._parents[side], self._versions[side]
+            if current_distance > distances[current_vertex]:
+                continue
+            settled += 1
+            other_distances, other_versions = self._distances[1 - side], self._versions[1 - side]
+            graph = graphs[side]
+            begin, end = graph.indptr[current_vertex], graph.indptr[current_vertex + 1]
+            for neighbor, weight in zip(graph.indices[begin:end].tolist(), graph.weights[begin:end].tolist()):
+                distance = current_distance + weight
+                if versions[neighbor] != version or distance < distances[neighbor]:
+                    distances[neighbor], parents[neighbor], versions[neighbor] = distance, current_vertex, version
+                    heapq.heappush(queues[side], (distance, neighbor))
+                if other_versions[neighbor] == version and distances[neighbor] + other_distances[neighbor] < best:
+                    best = distances[neighbor] + other_distances[neighbor]
+                    meeting = neighbor
+        self.settled = settled
+        return (best, self._path(meeting)) if meeting >= 0 else (float('infinity'), [])
+
+def euclidean_heuristic(coordinates: np.ndarray, scale: float = 1.0):
+    """
+    A* heuristic for graphs embedded in the plane: straight-line distance times scale.
+    Admissible as long as no edge is shorter than scale times its straight-line length.
+    """
+    xs, ys = coordinates[:, 0].tolist(), coordinates[:, 1].tolist()
+    def heuristic(vertex: int, target: int) -> float:
+        return scale * ((xs[vertex] - xs[target]) ** 2 + (ys[vertex] - ys[target]) ** 2) ** 0.5
+    return heuristic
+
+def landmark_heuristic(graph: CSRGraph, num_landmarks: int = 8, seed: int = 0):
+    """
+    ALT heuristic (A*, landmarks, triangle inequality) that needs no coordinates.
+    
+    Distances to and from a few far-apart landmarks L are precomputed; then
+    d(v, t) >= d(L, t) - d(L, v) and d(v, t) >= d(v, L) - d(t, L) for every L.
+    """
+    reverse = graph.transpose()
+    rng = random.Random(seed)
+    landmarks = [rng.randrange(graph.num_vertices)]
+    from_landmarks, to_landmarks = [], []
+    closest = np.full(graph.num_vertices, np.inf)
+    while True:
+        forward = dijkstra(graph, landmarks[-1])
+        backward = dijkstra(reverse, landmarks[-1])
+        # Unreachable pairs get a common huge value, so their differences stay valid bounds.
+        huge = 2 * max(forward[np.isfinite(forward)].max(), backward[np.isfinite(backward)].max()) + 1
+        from_landmarks.append(np.where(np.isfinite(forward), forward, huge).tolist())
+        to_landmarks.append(np.where(np.isfinite(backward), backward, huge).tolist())
+        if len(landmarks) == num_landmarks:
+            break
+        # Farthest-point selection: the next landmark is the vertex farthest from all chosen ones.
+        closest = np.minimum(closest, np.where(np.isfinite(forward), forward, -1))
+        landmarks.append(int(np.argmax(closest)))
+    tables = list(zip(from_landmarks, to_landmarks))
+    
+    def heuristic(vertex: int, target: int) -> float:
+        bound = 0.0
+        for from_landmark, to_landmark in tables:
+            bound = max(bound, from_landmark[target] - from_landmark[vertex],
+                        to_landmark[vertex] - to_landmark[target])
+        return bound
+    heuristic.landmarks = landmarks
+    return heuristic
+
+def generate_road_network(width: int, height: int, seed: int = 0) -> Tuple[CSRGraph, np.ndarray]:
+    """
+    A grid-shaped road network: two-way streets between neighboring intersections, each
+    1-1.5x longer than the straight line (so the Euclidean heuristic is admissible).
+    """
+    rng = np.random.default_rng(seed)
+    ids = np.arange(width * height).reshape(height, width)
+    sources = np.concatenate((ids[:, :-1].ravel(), ids[:-1, :].ravel()))
+    targets = np.concatenate((ids[:, 1:].ravel(), ids[1:, :].ravel()))
+    weights = rng.uniform(1.0, 1.5, len(sources))
+    coordinates = np.column_stack((np.tile(np.arange(width), height), np.repeat(np.arange(height), width)))
+    return CSRGraph.from_edges(sources, targets, weights, width * height, directed=False), coordinates.astype(float)
+
+def benchmark_route_queries(width: int = 300, height: int = 300, num_queries: int = 200):
+    """Queries per second for full Dijkstra, early-exit Dijkstra, bidirectional Dijkstra and A*."""
+    graph, coordinates = generate_road_network(width, height)
+    rng = random.Random(1)
+    pairs = [(rng.randrange(graph.num_vertices), rng.randrange(graph.num_vertices)) for _ in range(num_queries)]
+    search = PointToPointSearch(graph)
+    euclidean = euclidean_heuristic(coordinates)
+    landmarks = landmark_heuristic(graph)
+    print(f"Road network: {graph.num_vertices:,} intersections, {graph.num_edges // 2:,} streets, "
+          f"{num_queries} random queries")
+    
+    reference = [dijkstra(graph, s)[t] for s, t in pairs[:5]]
+    methods = [
+        ("full dijkstra()", lambda s, t: (dijkstra(graph, s)[t], None), 5),
+        ("Dijkstra, early exit", search.dijkstra, num_queries),
+        ("bidirectional Dijkstra", search.bidirectional_dijkstra, num_queries),
+        ("A*, Euclidean", lambda s, t: search.astar(s, t, euclidean), num_queries),
+        ("A*, 8 landmarks (ALT)", lambda s, t: search.astar(s, t, landmarks), num_queries),
+    ]
+    for name, query, count in methods:
+        settled = 0
+        start_time = timeit.default_timer()
+        for i, (s, t) in enumerate(pairs[:count]):
+            distance, _ = query(s, t)
+            settled += search.settled
+            if i < len(reference):
+                assert abs(distance - reference[i]) < 1e-9
+        elapsed = timeit.default_timer() - start_time
+        detail = f", {settled / count:,.0f} vertices settled per query" if "full" not in name else ""
+        print(f"{name:<24} {count / elapsed:>8,.1f} queries/s{detail}")
+
+# Contraction hierarchies
+# -----------------------
+# When the graph is static and the queries never stop, it pays to preprocess once.
+# A contraction hierarchy (Geisberger et al., 2008) removes ("contracts") vertices one
+# at a time, least important first. Whenever removing v would lengthen a shortest path
+# u -> v -> w, a shortcut edge u -> w is added (unless a local "witness" search finds
+# an equally short path around v). A vertex's importance is its edge difference: the
+# shortcuts its removal would add minus the edges it removes, plus how many of its
+# neighbors were already contracted (which spreads contraction evenly over the graph).
+# Every shortest path then has the form "up the hierarchy, then down", so a query
+# runs a bidirectional Dijkstra that only follows edges to higher-ranked vertices and
+# settles a few hundred vertices instead of a large part of the graph.
+
+class ContractionHierarchy:
+    """A contraction hierarchy over a CSRGraph, for repeated point-to-point queries."""
+    
+    def __init__(self, rank: np.ndarray, forward: CSRGraph, forward_middle: np.ndarray,
+                 backward: CSRGraph, backward_middle: np.ndarray):
+        # forward holds edges u -> w with rank[u] < rank[w]; backward holds edges u -> w
+        # with rank[u] > rank[w], stored reversed as w -> u. A *_middle entry is the
+        # contracted vertex a shortcut bypasses, or -1 for an original edge.
+        self.rank = rank
+        self.forward, self.forward_middle = forward, forward_middle
+        self.backward, self.backward_middle = backward, backward_middle
+        n = len(rank)
+        self._distances = ([0.0] * n, [0.0] * n)
+        self._parents = ([-1] * n, [-1] * n)
+        self._versions = ([0] * n, [0] * n)
+        self._version = 0
+        self.settled = 0  # vertices settled by the last query
+    
+    @classmethod
+    def build(cls, graph: CSRGraph, witness_limit: int = 100) -> "ContractionHierarchy":
+        """
+        Contract every vertex of graph in edge-difference order.
+        
+        Args:
+        graph (CSRGraph): Graph with non-negative edge weights
+        witness_limit (int): Vertices a witness search may settle before giving up (a
+                             lower limit preprocesses faster but adds more shortcuts)
+        
+        Returns:
+        ContractionHierarchy
+        """
+        n = graph.num_vertices
+        outgoing = [dict() for _ in range(n)]
+        incoming = [dict() for _ in range(n)]
+        sources = graph.sources().tolist()
+        for u, w, weight in zip(sources, graph.indices.tolist(), graph.weights.tolist()):
+            if u != w and weight < outgoing[u].get(w, float('infinity')):
+                outgoing[u][w] = incoming[w][u] = weight
+        middles = {}
+        
+        def witness_distances(source, excluded, targets, limit):
+            distances = {source: 0.0}
+            pq = [(0.0, source)]
+            remaining = set(targets)
+            settled = 0
+            while pq and remaining and settled < witness_limit:
+                distance, vertex = heapq.heappop(pq)
+                if distance > limit:
+                    break
+                if distance > distances[vertex]:
+                    continue
+                settled += 1
+                remaining.discard(vertex)
+                for neighbor, weight in outgoing[vertex].items():
+                    candidate = distance + weight
+                    if neighbor != excluded and candidate < distances.get(neighbor, float('infinity')):
+                        distances[neighbor] = candidate
+                        heapq.heappush(pq, (candidate, neighbor))
+            return distances
+        
+        def shortcuts_for(v):
+            shortcuts = []
+            for u, to_v in incoming[v].items():
+                via_v = {w: to_v + from_v for w, from_v in outgoing[v].items() if w != u}
+                if not via_v:
+                    continue
+                witnesses = witness_distances(u, v, via_v, max(via_v.values()))
+                shortcuts.extend((u, w, length) for w, length in via_v.items()
+                                 if witnesses.get(w, float('infinity')) > length)
+            return shortcuts
+        
+        contracted_neighbors = [0] * n
+        def evaluate(v):
+            shortcuts = shortcuts_for(v)
+            edge_difference = len(shortcuts) - len(incoming[v]) - len(outgoing[v])
+            return edge_difference + contracted_neighbors[v], shortcuts
+        
+        pq = [(evaluate(v)[0], v) for v in range(n)]
+        heapq.heapify(pq)
+        rank = np.empty(n, dtype=np.int64)
+        forward_lists, backward_lists = [None] * n, [None] * n
+        for order in range(n):
+            # Lazy updates: re-evaluate the cheapest vertex and only contract it if it
+            # is still no worse than the next candidate.
+            while True:
+                _, v = heapq.heappop(pq)
+                current, shortcuts = evaluate(v)
+                if not pq or current <= pq[0][0]:
+                    break
+                heapq.heappush(pq, (current, v))
+            
+            rank[v] = order
+            for u, w, length in shortcuts:
+                if length < outgoing[u].get(w, float('infinity')):
+                    outgoing[u][w] = incoming[w][u] = length
+                    middles[(u, w)] = v
+            forward_lists[v] = [(w, weight, middles.get((v, w), -1)) for w, weight in outgoing[v].items()]
+            backward_lists[v] = [(u, weight, middles.get((u, v), -1)) for u, weight in incoming[v].items()]
+            for u in incoming[v]:
+                del outgoing[u][v]
+                contracted_neighbors[u] += 1
+            for w in outgoing[v]:
+                del incoming[w][v]
+                contracted_neighbors[w] += 1
+        
+        forward, forward_middle = cls._csr_from_lists(forward_lists)
+        backward, backward_middle = cls._csr_from_lists(backward_lists)
+        return cls(rank, forward, forward_middle, backward, backward_middle)
+    
+    @staticmethod
+    def _csr_from_lists(lists) -> Tuple[CSRGraph, np.ndarray]:
+        indptr = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum([len(edges) for edges in lists], out=indptr[1:])
+        flat = [edge for edges in lists for edge in edges]
+        indices = np.array([edge[0] for edge in flat], dtype=np.int32)
+        weights = np.array([edge[1] for edge in flat], dtype=np.float64)
+        middle = np.array([edge[2] for edge in flat], dtype=np.int64)
+        return CSRGraph(indptr, indices, weights, directed=True), middle
+    
+    @property
+    def num_shortcuts(self) -> int:
+        return int(np.count_nonzero(self.forward_middle >= 0) + np.count_nonzero(self.backward_middle >= 0))
+    
+    def save(self, directory: str):
+        """Write the hierarchy as .npy files into directory."""
+        for name, graph, middle in (("forward", self.forward, self.forward_middle),
+                                    ("backward", self.backward, self.backward_middle)):
+            graph.save(os.path.join(directory, name))
+            np.save(os.path.join(directory, name, "middle.npy"), middle)
+        np.save(os.path.join(directory, "rank.npy"), self.rank)
+    
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "ContractionHierarchy":
+        mode = "r" if mmap else None
+        parts = []
+        for name in ("forward", "backward"):
+            parts.append(CSRGraph.load(os.path.join(directory, name), mmap))
+            parts.append(np.load(os.path.join(directory, name, "middle.npy"), mmap_mode=mode))
+        return cls(np.load(os.path.join(directory, "rank.npy"), mmap_mode=mode), *parts)
+    
+    def _middle(self, u: int, w: int) -> int:
+        """The vertex bypassed by hierarchy edge u -> w, or -1 if it is an original edge."""
+        if self.rank[u] < self.rank[w]:
+            graph, middle, vertex, other = self.forward, self.forward_middle, u, w
+        else:
+            graph, middle, vertex, other = self.backward, self.backward_middle, w, u
+        begin, end = graph.indptr[vertex], graph.indptr[vertex + 1]
+        return int(middle[begin + np.flatnonzero(graph.indices[begin:end] == other)[0]])
+    
+    def _unpack(self, hierarchy_path: List[int]) -> List[int]:
+        """Replace every shortcut on the path by the original edges it stands for."""
+        path = [hierarchy_path[0]]
+        for u, w in zip(hierarchy_path, hierarchy_path[1:]):
+            stack = [(u, w)]
+            while stack:
+                a, b = stack.pop()
+                middle = self._middle(a, b)
+                if middle < 0:
+                    path.append(b)
+                else:
+                    stack.append((middle, b))
+                    stack.append((a, middle))
+        return path
+    
+    def query(self, source: int, target: int) -> Tuple[float, List[int]]:
+        """
+        Shortest path from source to target by bidirectional upward search.
+        
+        Returns:
+        Tuple[float, List[int]]: The distance and the path in the original graph, or
+        (inf, []) if target is unreachable
+        """
+        self._version += 1
+        version = self._version
+        graphs = (self.forward, self.backward)
+        queues = ([(0.0, source)], [(0.0, target)])
+        for side, vertex in ((0, source), (1, target)):
+            self._distances[side][vertex] = 0.0
+            self._parents[side][vertex] = vertex
+            self._versions[side][vertex] = version
+        best, meeting = float('infinity'), -1
+        settled = 0
+        
+        while True:
+            # A side is finished once its queue is empty or its minimum can't beat best.
+            forward_active = bool(queues[0]) and queues[0][0][0] < best
+            backward_active = bool(queues[1]) and queues[1][0][0] < best
+            if not (forward_active or backward_active):
+                break
+            side = 0 if forward_active and (not backward_active or queues[0][0][0] <= queues[1][0][0]) else 1
+            current_distance, current_vertex = heapq.heappop(queues[side])
+            distances, parents, versions = self._distances[side], self._parents[side], self._versions[side]
+            if current_distance > distances[current_vertex]:
+                continue
+            settled += 1
+            if self._versions[1 - side][current_vertex] == version:
+                candidate = current_distance + self._distances[1 - side][current_vertex]
+                if candidate < best:
+                    best, meeting = candidate, current_vertex
+            
+            # Stall-on-demand: if a higher-ranked vertex already reached by this search
+            # has an edge down to current_vertex that gives a shorter distance, then
+            # current_vertex is not on a shortest up-down path and need not be expanded.
+            graph, other = graphs[side], graphs[1 - side]
+            begin, end = other.indptr[current_vertex], other.indptr[current_vertex + 1]
+            if any(versions[higher] == version and distances[higher] + weight < current_distance
+                   for higher, weight in zip(other.indices[begin:end].tolist(), other.weights[begin:end].tolist())):
+                continue
+            begin, end = graph.indptr[current_vertex], graph.indptr[current_vertex + 1]
+            for neighbor, weight in zip(graph.indices[begin:end].tolist(), graph.weights[begin:end].tolist()):
+                distance = current_distance + weight
+                if versions[neighbor] != version or distance < distances[neighbor]:
+                    distances[neighbor], parents[neighbor], versions[neighbor] = distance, current_vertex, version
+                    heapq.heappush(queues[side], (distance, neighbor))
+        self.settled = settled
+        if meeting < 0:
+            return float('infinity'), []
+        
+        path = [meeting]
+        while self._parents[0][path[-1]] != path[-1]:
+            path.append(self._parents[0][path[-1]])
+        path.reverse()
+        while self._parents[1][path[-1]] != path[-1]:
+            path.append(self._parents[1][path[-1]])
+        return best, self._unpack(path)
+
+def benchmark_contraction_hierarchy(width: int = 80, height: int = 80, num_queries: int = 1000):
+    """Preprocessing cost and query latency of a contraction hierarchy vs. Dijkstra."""
+    import tempfile
+    
+    graph, _ = generate_road_network(width, height)
+    hierarchy, build_time = benchmark_algorithm(ContractionHierarchy.build, graph)
+    print(f"Road network: {graph.num_vertices:,} intersections; contraction took {build_time:.1f} s "
+          f"and added {hierarchy.num_shortcuts:,} shortcuts")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        hierarchy.save(directory)
+        hierarchy = ContractionHierarchy.load(directory, mmap=False)
+    
+    rng = random.Random(2)
+    pairs = [(rng.randrange(graph.num_vertices), rng.randrange(graph.num_vertices)) for _ in range(num_queries)]
+    search = PointToPointSearch(graph)
+    for name, query, count in [
+        ("dijkstra() per query", lambda s, t: dijkstra(graph, s)[t], 20),
+        ("bidirectional Dijkstra", lambda s, t: search.bidirectional_dijkstra(s, t)[0], 200),
+        ("contraction hierarchy", lambda s, t: hierarchy.query(s, t)[0], num_queries),
+    ]:
+        start_time = timeit.default_timer()
+        results = [query(s, t) for s, t in pairs[:count]]
+        latency = (timeit.default_timer() - start_time) / count
+        assert all(abs(d - hierarchy.query(s, t)[0]) < 1e-9 for d, (s, t) in zip(results[:20], pairs))
+        print(f"{name:<24} {latency * 1e6:>10,.0f} us per query")
+
+# Vectorized Floyd-Warshall
+# -------------------------
+# floyd_warshall() above keeps the distances in a dict keyed by (i, j) and runs three
+# nested Python loops, which limits it to a few hundred vertices. On a dense NumPy
+# matrix, step k of the algorithm is a single array expression,
+#     dist = minimum(dist, dist[:, k, None] + dist[None, k, :]),
+# and the blocked variant runs the k steps of one block of b pivots on a band of b rows
+# at a time, so the band being updated stays in the CPU cache instead of streaming the
+# whole n x n matrix through memory for every k. Rows of the pivot block go first, so
+# they are final for that block before the other bands read them.
+# pred[i, j] is the vertex before j on the shortest i -> j path; a negative value on the
+# diagonal of the result means the vertex lies on a negative cycle.
+
+def distance_matrix(graph: Union[Graph, CSRGraph]) -> np.ndarray:
+    """Dense weight matrix: inf where there is no edge, the cheapest of parallel edges, 0 on the diagonal."""
+    if isinstance(graph, Graph):
+        graph = CSRGraph.from_graph(graph)
+    n = graph.num_vertices
+    matrix = np.full((n, n), np.inf)
+    np.minimum.at(matrix, (graph.sources(), graph.indices), graph.weights)
+    diagonal = np.arange(n)
+    matrix[diagonal, diagonal] = np.minimum(matrix[diagonal, diagonal], 0)
+    return matrix
+
+def floyd_warshall_matrix(weights: Union[Graph, CSRGraph, np.ndarray], block_size: Optional[int] = 128,
+                          check_negative_cycles: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    All-pairs shortest paths on a dense matrix.
+    
+    Args:
+    weights: A Graph, a CSRGraph or an n x n matrix (inf = no edge)
+    block_size (int): Rows and pivots per block; None relaxes the whole matrix per k
+    check_negative_cycles (bool): Raise ValueError if the graph has a negative cycle
+    
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: distances and predecessors (-1 = no path).
+    Time: O(n^3), Space: O(n^2)
+    """
+    dist = distance_matrix(weights) if not isinstance(weights, np.ndarray) else weights.astype(np.float64)
+    n = len(dist)
+    rows = np.arange(n)[:, None]
+    pred = np.where(np.isfinite(dist), rows, -1)
+    pred[np.arange(n), np.arange(n)] = np.arange(n)
+    
+    block = min(block_size or n, n) or 1
+    candidate = np.empty((block, n))
+    improved = np.empty((block, n), dtype=bool)
+    for block_start in range(0, n, block):
+        pivots = range(block_start, min(n, block_start + block))
+        bands = [block_start] + [start for start in range(0, n, block) if start != block_start]
+        for band_start in bands:
+            band_rows = slice(band_start, min(n, band_start + block))
+            band, band_pred = dist[band_rows], pred[band_rows]
+            size = len(band)
+            for k in pivots:
+                np.add(band[:, k, None], dist[k], out=candidate[:size])
+                np.less(candidate[:size], band, out=improved[:size])
+                np.copyto(band, candidate[:size], where=improved[:size])
+                np.copyto(band_pred, pred[k], where=improved[:size])
+    
+    if check_negative_cycles and (np.diagonal(dist) < 0).any():
+        raise ValueError("Graph contains a negative-weight cycle")
+    return dist, pred
+
+def negative_cycle_vertices(dist: np.ndarray) -> np.ndarray:
+    """Vertices on (or reachable through) a negative cycle, given unchecked Floyd-Warshall output."""
+    return np.flatnonzero(np.diagonal(dist) < 0)
+
+def reconstruct_path(pred: np.ndarray, source: int, target: int) -> List[int]:
+    """Follow the predecessor matrix back from target to source."""
+    if pred[source, target] < 0:
+        return []
+    path = [target]
+    while path[-1] != source:
+        path.append(int(pred[source, path[-1]]))
+        if len(path) > len(pred):
+            raise ValueError("path runs through a negative-weight cycle")
+    return path[::-1]
+
+def benchmark_floyd_warshall(sizes=(100, 1000, 3000), density: float = 0.05):
+    """floyd_warshall() vs. the row-at-a-time and blocked matrix versions."""
+    rng = np.random.default_rng(0)
+    for n in sizes:
+        matrix = np.where(rng.random((n, n)) < density, rng.integers(1, 100, (n, n)), np.inf)
+        np.fill_diagonal(matrix, 0)
+        timings = []
+        if n <= 200:
+            graph = Graph(directed=True)
+            for i, j in zip(*np.nonzero(np.isfinite(matrix))):
+                graph.add_edge(int(i), int(j), matrix[i, j])
+            for v in range(n):
+                graph.graph[v]  # register vertices without outgoing edges
+            _, elapsed = benchmark_algorithm(floyd_warshall, graph)
+            timings.append(f"floyd_warshall() {elapsed:.2f} s")
+        variants = [("row-at-a-time", None), ("blocked", 128)] if n <= 1000 else [("blocked", 128)]
+        for name, block_size in variants:
+            (dist, pred), elapsed = benchmark_algorithm(floyd_warshall_matrix, matrix, block_size)
+            timings.append(f"{name} {elapsed:.2f} s")
+        print(f"n={n}: " + ", ".join(timings))
+
+# Vectorized Bellman-Ford and SPFA
+# --------------------------------
+# bellman_ford() above always makes V - 1 passes of Python loops over every edge. With
+# the edges as arrays, one pass is a handful of NumPy operations: compute
+# dist[source] + weight for every edge at once and fold the candidates into the targets
+# with np.minimum.at (which handles several edges into the same vertex). The passes stop
+# as soon as nothing changes, which on most inputs happens long before V - 1.
+# SPFA (the "Shortest Path Faster Algorithm") instead keeps a queue of vertices whose
+# distance changed and only relaxes their edges, which wins when few distances move.
+# If a relaxation still happens after V passes (or a vertex is dequeued V times in
+# SPFA), there is a negative cycle, and following predecessors back V steps from the
+# last updated vertex is guaranteed to land on it.
+
+def _extract_negative_cycle(pred: np.ndarray, vertex: int) -> List[int]:
+    """Walk predecessors into the cycle, then collect it in forward edge order."""
+    for _ in range(len(pred)):
+        vertex = int(pred[vertex])
+    cycle = [vertex]
+    current = int(pred[vertex])
+    while current != vertex:
+        cycle.append(current)
+        current = int(pred[current])
+    cycle.append(vertex)
+    return cycle[::-1]
+
+def bellman_ford_vectorized(graph: Union[Graph, CSRGraph], start: Optional[int] = None,
+                            method: str = "vectorized") -> Tuple[np.ndarray, np.ndarray, List[int]]:
+    """
+    Single-source shortest paths with negative weights, and negative-cycle extraction.
+    
+    Args:
+    graph: A Graph or CSRGraph
+    start (int): Source vertex; None starts from every vertex at distance 0, which
+                 finds a negative cycle anywhere in the graph
+    method (str): "vectorized" (array passes with early exit) or "spfa" (queue-based)
+    
+    Returns:
+    Tuple of distances, predecessors (-1 = none) and a negative cycle as a closed
+    vertex list [v0, v1, ..., v0] (empty if there is none). Time: O(V * E) worst case
+    """
+    if isinstance(graph, Graph):
+        graph = CSRGraph.from_graph(graph)
+    if method not in ("vectorized", "spfa"):
+        raise ValueError(f"unknown method: {method!r}")
+    n = graph.num_vertices
+    distances = np.full(n, np.inf)
+    pred = np.full(n, -1, dtype=np.int64)
+    if start is None:
+        distances[:] = 0
+    else:
+        distances[start] = 0
+    
+    if method == "vectorized":
+        sources, targets, weights = graph.sources(), graph.indices, graph.weights
+        for _ in range(n):
+            candidates = distances[sources] + weights
+            better = np.flatnonzero(candidates < distances[targets])
+            if len(better) == 0:
+                return distances, pred, []
+            np.minimum.at(distances, targets[better], candidates[better])
+            # Ties between edges into the same vertex: any edge achieving the minimum will do.
+            winners = better[candidates[better] == distances[targets[better]]]
+            pred[targets[winners]] = sources[winners]
+        return distances, pred, _extract_negative_cycle(pred, int(targets[winners[0]]))
+    
+    indptr, indices, edge_weights = graph.indptr, graph.indices, graph.weights
+    dist = distances.tolist()
+    parent = [-1] * n
+    dequeued = [0] * n
+    queue = deque(range(n) if start is None else [start])
+    in_queue = bytearray(n)
+    for vertex in queue:
+        in_queue[vertex] = 1
+    while queue:
+        vertex = queue.popleft()
+        in_queue[vertex] = 0
+        dequeued[vertex] += 1
+        if dequeued[vertex] > n:
+            return np.array(dist), np.array(parent), _extract_negative_cycle(np.array(parent), vertex)
+        begin, end = indptr[vertex], indptr[vertex + 1]
+        for neighbor, weight in zip(indices[begin:end].tolist(), edge_weights[begin:end].tolist()):
+            if dist[vertex] + weight < dist[neighbor]:
+                dist[neighbor] = dist[vertex] + weight
+                parent[neighbor] = vertex
+                if not in_queue[neighbor]:
+                    in_queue[neighbor] = 1
+                    queue.append(neighbor)
+    return np.array(dist), np.array(parent, dtype=np.int64), []
+
+def find_arbitrage(rates: np.ndarray, currencies: List[str], method: str = "vectorized") -> List[str]:
+    """
+    Find a cycle of currency exchanges that multiplies money, if one exists.
+    
+    Trading along a cycle multiplies by the product of its rates, so with edge weights
+    -log(rate) a profitable cycle (product > 1) is exactly a negative-weight cycle.
+    """
+    sources, targets = np.nonzero((rates > 0) & ~np.eye(len(rates), dtype=bool))
+    graph = CSRGraph.from_edges(sources, targets, -np.log(rates[sources, targets]), len(rates))
+    _, _, cycle = bellman_ford_vectorized(graph, None, method)
+    return [currencies[v] for v in cycle]
+
+def benchmark_bellman_ford(num_currencies: int = 150, refreshes: int = 5):
+    """Arbitrage detection on a dense exchange-rate graph: bellman_ford() vs. arrays vs. SPFA."""
+    rng = np.random.default_rng(0)
+    currencies = [f"C{i:03d}" for i in range(num_currencies)]
+    # Consistent rates (no arbitrage) with small bid/ask spreads, so that the search
+    # cannot stop early, plus one mispriced triangle that creates a profitable cycle.
+    value = rng.uniform(0.5, 2.0, num_currencies)
+    rates = value[:, None] / value[None, :] * rng.uniform(0.995, 1.0, (num_currencies, num_currencies))
+    a, b, c = 3, 17, 42
+    rates[a, b] *= 1.004
+    rates[b, c] *= 1.004
+    rates[c, a] *= 1.004
+    
+    print(f"Exchange graph: {num_currencies} currencies, {num_currencies * (num_currencies - 1):,} rates")
+    for method in ("vectorized", "spfa"):
+        start_time = timeit.default_timer()
+        for _ in range(refreshes):
+            cycle = find_arbitrage(rates, currencies, method)
+        elapsed = (timeit.default_timer() - start_time) / refreshes
+        indices = [currencies.index(name) for name in cycle]
+        profit = np.prod(rates[indices[:-1], indices[1:]])
+        print(f"{method:<16} {elapsed * 1000:>8.1f} ms per refresh, cycle {' -> '.join(cycle)} (x{profit:.5f})")
+    
+    graph = Graph(directed=True)
+    for i, j in zip(*np.nonzero(~np.eye(num_currencies, dtype=bool))):
+        graph.add_edge(int(i), int(j), -np.log(rates[i, j]))
+    start_time = timeit.default_timer()
+    try:
+        bellman_ford(graph, 0)
+    except ValueError as error:
+        elapsed = timeit.default_timer() - start_time
+        print(f"{'bellman_ford()':<16} {elapsed * 1000:>8.1f} ms to report \"{error}\" without the cycle")
+
 # Optimization Strategies:
 # 1. Use appropriate data structures (e.g., heapq for priority queues)
 # 2. Implement iterative versions of recursive algorithms for large graphs
@@ -594,6 +1742,1823 @@ def prim_mst_optimized(graph: Graph) -> List[Tuple[int, int, int]]:
     
     return mst
 
+# Borůvka's minimum spanning forest
+# ---------------------------------
+# Prim's algorithm grows one tree vertex by vertex and Kruskal's algorithm sorts every
+# edge first; both are inherently sequential. Borůvka's algorithm (1926) works in rounds:
+# every component picks its cheapest outgoing edge, all picked edges join the forest at
+# once, and the components they connect are merged. The number of components at least
+# halves per round, so there are at most log2(V) rounds, and each round is a few array
+# passes over the remaining edges:
+# - np.minimum.at finds every component's cheapest edge (ties broken by edge index, so
+#   the picked edges can never form a cycle),
+# - the merge is an array-based union-find: each component points at the component
+#   across its picked edge, and pointer jumping (label = label[label]) flattens the
+#   pointers to one representative per merged component.
+# Edges that end up inside a component are dropped for good, and a disconnected graph
+# simply yields a spanning forest.
+
+def boruvka_mst_arrays(sources: np.ndarray, targets: np.ndarray, weights: np.ndarray,
+                       num_vertices: int) -> np.ndarray:
+    """
+    Minimum spanning forest of an undirected graph given as edge arrays.
+    
+    Returns:
+    np.ndarray: Indices of the forest edges. Time: O(E log V), Space: O(V + E)
+    """
+    component = np.arange(num_vertices)
+    alive = np.arange(len(sources))
+    chosen = []
+    while len(alive):
+        left, right = component[sources[alive]], component[targets[alive]]
+        crossing = left != right
+        alive, left, right = alive[crossing], left[crossing], right[crossing]
+        if not len(alive):
+            break
+        edge_weights = weights[alive]
+        
+        cheapest = np.full(num_vertices, np.inf)
+        np.minimum.at(cheapest, left, edge_weights)
+        np.minimum.at(cheapest, right, edge_weights)
+        best_edge = np.full(num_vertices, len(sources))
+        for side in (left, right):
+            ties = edge_weights == cheapest[side]
+            np.minimum.at(best_edge, side[ties], alive[ties])
+        
+        roots = np.flatnonzero(best_edge < len(sources))
+        picked = best_edge[roots]
+        chosen.append(np.unique(picked))
+        # Point every component at the one across its cheapest edge. Two components
+        # that picked the same edge point at each other; the smaller one becomes the root.
+        across = component[sources[picked]]
+        across = np.where(across == roots, component[targets[picked]], across)
+        vertices = np.arange(num_vertices)
+        parent = vertices.copy()
+        parent[roots] = across
+        smaller_of_pair = (parent[parent] == vertices) & (vertices < parent)
+        parent[smaller_of_pair] = vertices[smaller_of_pair]
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+        component = parent[component]
+    return np.concatenate(chosen) if chosen else np.empty(0, dtype=np.int64)
+
+def boruvka_mst(graph: Union[Graph, CSRGraph]) -> List[Tuple[int, int, int]]:
+    """Borůvka's minimum spanning forest, with the same output format as kruskal_mst."""
+    if isinstance(graph, Graph):
+        graph = CSRGraph.from_graph(graph)
+    sources, targets, weights = graph.sources(), graph.indices, graph.weights
+    if not graph.directed:
+        # Every undirected edge is stored once per direction; keep one copy.
+        keep = sources <= targets
+        sources, targets, weights = sources[keep], targets[keep], weights[keep]
+    forest = boruvka_mst_arrays(sources, targets, weights, graph.num_vertices)
+    return list(zip(sources[forest].tolist(), targets[forest].tolist(), weights[forest].tolist()))
+
+def benchmark_mst(num_vertices: int = 200_000, num_edges: int = 1_000_000, large_edges: int = 10_000_000):
+    """prim_mst, prim_mst_optimized and kruskal_mst vs. boruvka_mst, then Borůvka alone at scale."""
+    sources, targets, weights = generate_random_edges(num_vertices, num_edges)
+    graph = Graph()
+    for u, v, w in zip(sources.tolist(), targets.tolist(), weights.tolist()):
+        graph.add_edge(u, v, w)
+    print(f"Random graph: {num_vertices:,} vertices, {num_edges:,} edges")
+    for name, algorithm in [("prim_mst", prim_mst), ("prim_mst_optimized", prim_mst_optimized),
+                            ("kruskal_mst", kruskal_mst), ("boruvka_mst", boruvka_mst)]:
+        try:
+            forest, elapsed = benchmark_algorithm(algorithm, graph)
+        except Exception as error:
+            print(f"{name:<20} failed: {type(error).__name__}: {error}")
+            continue
+        print(f"{name:<20} {elapsed:>7.2f} s, {len(forest):,} edges, total weight {sum(w for _, _, w in forest):,.0f}")
+    del graph
+    
+    large_vertices = large_edges * num_vertices // num_edges
+    sources, targets, weights = generate_random_edges(large_vertices, large_edges)
+    forest, elapsed = benchmark_algorithm(lambda _: boruvka_mst_arrays(sources, targets, weights, large_vertices), None)
+    print(f"boruvka_mst_arrays on {large_edges:,} edges: {elapsed:.2f} s, {len(forest):,} forest edges")
+
+# Iterative SCC, cycle detection and condensation
+# -----------------------------------------------
+# strongly_connected_components, topological_sort and has_cycle above recurse once per
+# vertex on the current DFS path, so a dependency chain longer than the recursion limit
+# (about 1000 frames by default) raises RecursionError, and raising the limit just
+# trades that for a crashed interpreter. The CSRGraph versions below keep the DFS path
+# on an explicit list of (vertex, remaining-neighbors iterator) pairs instead.
+# Tarjan's algorithm finds all strongly connected components in one DFS (Kosaraju's,
+# used by strongly_connected_components, needs two and a transposed copy). Collapsing
+# every component into a single vertex gives the condensation, which is always a DAG:
+# the order in which groups of mutually dependent packages can be built.
+
+def tarjan_scc(graph: CSRGraph) -> Tuple[int, np.ndarray]:
+    """
+    Iterative Tarjan's algorithm.
+    
+    Returns:
+    Tuple[int, np.ndarray]: The number of components and each vertex's component id.
+    Ids are in reverse topological order: edges between components go from higher to
+    lower ids. Time: O(V + E), Space: O(V)
+    """
+    indptr, indices = graph.indptr, graph.indices
+    n = graph.num_vertices
+    index = [-1] * n
+    lowlink = [0] * n
+    stack_position = [0] * n
+    on_stack = bytearray(n)
+    labels = [-1] * n
+    stack = []
+    counter = components = 0
+    
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack_position[root] = len(stack)
+        stack.append(root)
+        on_stack[root] = 1
+        path = [(root, iter(indices[indptr[root]:indptr[root + 1]].tolist()))]
+        while path:
+            vertex, neighbors = path[-1]
+            for neighbor in neighbors:
+                if index[neighbor] < 0:
+                    index[neighbor] = lowlink[neighbor] = counter
+                    counter += 1
+                    stack_position[neighbor] = len(stack)
+                    stack.append(neighbor)
+                    on_stack[neighbor] = 1
+                    path.append((neighbor, iter(indices[indptr[neighbor]:indptr[neighbor + 1]].tolist())))
+                    break
+                if on_stack[neighbor] and index[neighbor] < lowlink[vertex]:
+                    lowlink[vertex] = index[neighbor]
+            else:
+                path.pop()
+                if path and lowlink[vertex] < lowlink[path[-1][0]]:
+                    lowlink[path[-1][0]] = lowlink[vertex]
+                if lowlink[vertex] == index[vertex]:
+                    # vertex is the root of a component: everything above it on the stack
+                    start = stack_position[vertex]
+                    for member in stack[start:]:
+                        on_stack[member] = 0
+                        labels[member] = components
+                    del stack[start:]
+                    components += 1
+    return components, np.array(labels, dtype=np.int64)
+
+def condensation(graph: CSRGraph) -> Tuple[CSRGraph, np.ndarray]:
+    """
+    Collapse every strongly connected component into one vertex.
+    
+    Returns:
+    Tuple[CSRGraph, np.ndarray]: The condensation DAG, whose vertex ids are already in
+    topological order (every edge goes from a lower to a higher id) and whose edge
+    weights are the cheapest of the edges they replace, and each vertex's component id.
+    """
+    count, labels = tarjan_scc(graph)
+    labels = count - 1 - labels
+    sources, targets = labels[graph.sources()], labels[graph.indices]
+    between = sources != targets
+    sources, targets, weights = sources[between], targets[between], graph.weights[between]
+    codes = sources * count + targets
+    order = np.lexsort((weights, codes))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = codes[order[1:]] != codes[order[:-1]]
+    keep = order[first]
+    return CSRGraph.from_edges(sources[keep], targets[keep], weights[keep], count), labels
+
+def find_cycle(graph: CSRGraph) -> List[int]:
+    """
+    Return one cycle as a closed vertex list [v0, ..., v0], or [] if the graph is
+    acyclic, using an iterative three-color DFS that stops at the first back edge.
+    In an undirected graph the edge back to the DFS parent is skipped once, so only a
+    real cycle (possibly a parallel edge or a self-loop) counts.
+    """
+    indptr, indices = graph.indptr, graph.indices
+    n = graph.num_vertices
+    # 0 = unvisited, 1 = on the current DFS path, 2 = finished
+    color = bytearray(n)
+    for root in range(n):
+        if color[root]:
+            continue
+        color[root] = 1
+        path = [(root, iter(indices[indptr[root]:indptr[root + 1]].tolist()))]
+        parents = [-1]  # per path entry: the parent whose reverse arc is still to be skipped
+        while path:
+            vertex, neighbors = path[-1]
+            for neighbor in neighbors:
+                if not graph.directed and neighbor == parents[-1]:
+                    parents[-1] = -1
+                    continue
+                if color[neighbor] == 1:
+                    cycle = [neighbor]
+                    for entry, _ in reversed(path):
+                        cycle.append(entry)
+                        if entry == neighbor:
+                            break
+                    return cycle[::-1]
+                if not color[neighbor]:
+                    color[neighbor] = 1
+                    path.append((neighbor, iter(indices[indptr[neighbor]:indptr[neighbor + 1]].tolist())))
+                    parents.append(vertex)
+                    break
+            else:
+                color[vertex] = 2
+                path.pop()
+                parents.pop()
+    return []
+
+def generate_dependency_graph(num_packages: int, dependencies_per_package: int = 4,
+                              num_cycles: int = 100, seed: int = 0) -> CSRGraph:
+    """
+    A random dependency DAG (edges point from a package to the packages that need it),
+    plus a few back edges that create dependency cycles.
+    """
+    rng = np.random.default_rng(seed)
+    num_edges = num_packages * dependencies_per_package
+    sources = rng.integers(0, num_packages - 1, num_edges)
+    targets = sources + 1 + (rng.random(num_edges) ** 4 * (num_packages - 1 - sources)).astype(np.int64)
+    back = rng.integers(1, num_packages, num_cycles)
+    sources = np.concatenate((sources, back))
+    targets = np.concatenate((targets, back - 1 - rng.integers(0, np.minimum(back, 50))))
+    relabel = rng.permutation(num_packages)
+    return CSRGraph.from_edges(relabel[sources], relabel[targets], num_vertices=num_packages)
+
+def benchmark_scc(num_packages: int = 2_000_000, chain_length: int = 100_000):
+    """Recursive vs. iterative traversals on a deep chain, then SCCs of a large dependency graph."""
+    chain = Graph(directed=True)
+    for v in range(chain_length - 1):
+        chain.add_edge(v, v + 1)
+    for name, algorithm in [("strongly_connected_components(Graph)", strongly_connected_components),
+                            ("has_cycle(Graph)", has_cycle)]:
+        try:
+            algorithm(chain)
+            print(f"{name}: ok")
+        except RecursionError:
+            print(f"{name}: RecursionError on a {chain_length:,}-vertex chain")
+    csr_chain = CSRGraph.from_graph(chain)
+    (count, _), elapsed = benchmark_algorithm(tarjan_scc, csr_chain)
+    print(f"tarjan_scc(CSRGraph) on the same chain: {count:,} components in {elapsed:.2f} s")
+    
+    graph, elapsed = benchmark_algorithm(generate_dependency_graph, num_packages)
+    print(f"\nDependency graph: {graph.num_vertices:,} packages, {graph.num_edges:,} dependencies "
+          f"(generated in {elapsed:.1f} s)")
+    (count, labels), elapsed = benchmark_algorithm(tarjan_scc, graph)
+    sizes = np.bincount(labels)
+    print(f"tarjan_scc:                    {elapsed:6.2f} s, {count:,} components, largest has {sizes.max():,} packages")
+    components, elapsed = benchmark_algorithm(strongly_connected_components, graph)
+    print(f"strongly_connected_components: {elapsed:6.2f} s (Kosaraju), {len(components):,} components")
+    cycle, elapsed = benchmark_algorithm(find_cycle, graph)
+    print(f"find_cycle:                    {elapsed:6.2f} s, found {' -> '.join(map(str, cycle))}")
+    (dag, _), elapsed = benchmark_algorithm(condensation, graph)
+    print(f"condensation:                  {elapsed:6.2f} s, DAG with {dag.num_vertices:,} vertices, "
+          f"acyclic: {not find_cycle(dag)}")
+    order, elapsed = benchmark_algorithm(topological_sort, dag)
+    print(f"topological_sort(DAG):         {elapsed:6.2f} s")
+
+# Dynamic topological order (Pearce-Kelly)
+# ----------------------------------------
+# A build system that adds dependencies one at a time should not recompute
+# topological_sort() from scratch after every change. DynamicDAG keeps a position for
+# every node such that every edge goes from a lower to a higher position. Inserting an
+# edge u -> v that already agrees with the order costs O(1). Otherwise only the
+# "affected region" between position[v] and position[u] can be out of order
+# (Pearce and Kelly, 2006):
+# 1. search forward from v, visiting only nodes positioned before u; reaching u
+#    means the edge would close a cycle, so it is rejected before anything changes;
+# 2. search backward from u, visiting only nodes positioned after v;
+# 3. give the positions of all nodes found to the backward set first and the forward
+#    set second, keeping each set's relative order.
+# Both searches stay inside the region, which is usually tiny compared with the graph.
+
+class DynamicDAG:
+    """A directed acyclic graph that maintains a topological order under edge insertions."""
+    
+    def __init__(self):
+        self.successors = defaultdict(set)
+        self.predecessors = defaultdict(set)
+        self._position = {}
+        self._nodes = []  # node at each position
+    
+    def add_node(self, node):
+        if node not in self._position:
+            self._position[node] = len(self._nodes)
+            self._nodes.append(node)
+    
+    def add_edge(self, u, v):
+        """Add u -> v, reordering the affected region; raise ValueError if it would create a cycle."""
+        self.add_node(u)
+        self.add_node(v)
+        if v in self.successors[u]:
+            return
+        if u == v:
+            raise ValueError(f"edge {u!r} -> {v!r} would create a cycle")
+        lower, upper = self._position[v], self._position[u]
+        if lower < upper:
+            forward = self._search(v, self.successors, lambda p: p < upper, stop=u)
+            if forward is None:
+                raise ValueError(f"edge {u!r} -> {v!r} would create a cycle")
+            backward = self._search(u, self.predecessors, lambda p: p > lower)
+            self._reorder(backward, forward)
+        self.successors[u].add(v)
+        self.predecessors[v].add(u)
+    
+    def remove_edge(self, u, v):
+        """Remove u -> v; the current order stays valid, so nothing is reordered."""
+        self.successors[u].discard(v)
+        self.predecessors[v].discard(u)
+    
+    def _search(self, start, adjacency, in_region, stop=None) -> Optional[List]:
+        """Nodes reachable from start through nodes whose position satisfies in_region,
+        or None if stop is reachable."""
+        found = [start]
+        seen = {start}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for neighbor in adjacency[node]:
+                if neighbor == stop:
+                    return None
+                if neighbor not in seen and in_region(self._position[neighbor]):
+                    seen.add(neighbor)
+                    found.append(neighbor)
+                    stack.append(neighbor)
+        return found
+    
+    def _reorder(self, backward: List, forward: List):
+        position = self._position
+        backward.sort(key=position.__getitem__)
+        forward.sort(key=position.__getitem__)
+        slots = sorted(position[node] for node in backward + forward)
+        for slot, node in zip(slots, backward + forward):
+            position[node] = slot
+            self._nodes[slot] = node
+    
+    def order(self) -> List:
+        """All nodes in a valid topological order."""
+        return list(self._nodes)
+    
+    def affected_by(self, node) -> List:
+        """Every node that depends on node, directly or transitively, in build order."""
+        if node not in self._position:
+            raise KeyError(node)
+        reachable = self._search(node, self.successors, lambda p: True)[1:]
+        return sorted(reachable, key=self._position.__getitem__)
+    
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+def benchmark_dynamic_dag(num_nodes: int = 20_000, num_inserts: int = 100_000, recompute_every: int = 1_000):
+    """Edge insertions into a DynamicDAG vs. re-running topological_sort after every change."""
+    rng = random.Random(0)
+    # Nodes get a hidden rank and edges go from lower to higher rank, so the final graph
+    # is acyclic, but they are inserted in random order and force reordering.
+    rank = list(range(num_nodes))
+    rng.shuffle(rank)
+    edges = []
+    for _ in range(num_inserts):
+        a, b = rng.sample(range(num_nodes), 2)
+        edges.append((a, b) if rank[a] < rank[b] else (b, a))
+    
+    dag = DynamicDAG()
+    for node in range(num_nodes):
+        dag.add_node(node)
+    start_time = timeit.default_timer()
+    for u, v in edges:
+        dag.add_edge(u, v)
+    dag_time = timeit.default_timer() - start_time
+    position = {node: i for i, node in enumerate(dag.order())}
+    assert all(position[u] < position[v] for u, v in edges)
+    
+    rejected = 0
+    start_time = timeit.default_timer()
+    for _ in range(1_000):
+        u, v = rng.sample(range(num_nodes), 2)
+        try:
+            dag.add_edge(*((v, u) if rank[u] < rank[v] else (u, v)))
+        except ValueError:
+            rejected += 1
+    reject_time = (timeit.default_timer() - start_time) / 1_000
+    
+    graph = Graph(directed=True)
+    for node in range(num_nodes):
+        graph.graph[node]  # register every node; Graph only creates keys for edge tails
+    start_time = timeit.default_timer()
+    for u, v in edges[:recompute_every]:
+        graph.add_edge(u, v)
+        topological_sort(graph)
+    recompute_time = (timeit.default_timer() - start_time) / recompute_every
+    
+    print(f"DynamicDAG: {num_inserts:,} inserts over {num_nodes:,} nodes in {dag_time:.2f} s "
+          f"({dag_time / num_inserts * 1e6:.1f} us per insert)")
+    print(f"Reverse-rank inserts: {rejected}/1000 rejected as cycles, {reject_time * 1e6:.1f} us per attempt")
+    print(f"topological_sort() after each insert: {recompute_time * 1e6:.1f} us per insert "
+          f"(first {recompute_every:,} inserts only, and growing with the graph)")
+    print(f"affected_by({edges[0][0]}): {len(dag.affected_by(edges[0][0])):,} dependent nodes")
+
+# Batched random walks (node2vec)
+# -------------------------------
+# Building walks one random.choice() per step in Python makes walk generation slower
+# than the embedding training it feeds. RandomWalker (used by simple_node2vec) advances
+# all walkers together: each step is a handful of array operations over the CSR arrays,
+# whatever the number of walkers. The next edge is drawn from a Walker/Vose alias table
+# in O(1): pick a slot of the current segment uniformly, keep it with probability
+# prob[slot], otherwise jump to alias[slot].
+# node2vec (Grover and Leskovec, 2016) biases the step from v by the previous vertex t:
+# weights to x are scaled by 1/p if x == t, by 1 if x is also a neighbor of t, and by
+# 1/q otherwise. The bias depends on the arc (t, v) just taken, so there is one table
+# per arc over v's neighbors: sum(degree**2) entries in total, built once.
+# write_walks() stores walks as one (num_walks * num_vertices, walk_length) .npy array
+# of the smallest signed integer type that fits, padded with -1 after dead ends. The
+# work is split into fixed shards with seeds spawned from one SeedSequence, so the file
+# is the same for any number of processes.
+
+def build_alias_tables(indptr: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Alias tables for every segment weights[indptr[i]:indptr[i + 1]], all built at once.
+    
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: acceptance probabilities and alias positions (indices
+    into weights). Time: O(E log E)
+    """
+    num_segments = len(indptr) - 1
+    segment = np.repeat(np.arange(num_segments), np.diff(indptr))
+    totals = np.bincount(segment, weights, minlength=num_segments)
+    scaled = weights * (np.diff(indptr) / np.where(totals > 0, totals, 1))[segment]
+    # Vose's algorithm lets each small entry (scaled < 1) alias a large one, which gives
+    # up the missing mass and becomes small itself once it drops below 1, aliasing the
+    # next large. Sweeping a segment's smalls and larges in order, large t is the donor
+    # of every small whose preceding cumulative deficit is below the larges' cumulative
+    # excess up to t, so the whole sweep reduces to prefix sums and binary searches.
+    smalls = np.flatnonzero(scaled < 1)
+    larges = np.flatnonzero(scaled >= 1)
+    small_segment, large_segment = segment[smalls], segment[larges]
+    small_end = np.cumsum(np.bincount(small_segment, minlength=num_segments))
+    large_end = np.cumsum(np.bincount(large_segment, minlength=num_segments))
+    large_start = large_end - np.bincount(large_segment, minlength=num_segments)
+    # Global prefix sums of the deficits, and each segment's excesses moved onto the same
+    # scale (excess_level[t] is where large t runs dry). Both searches below compare
+    # these same two arrays, so an exact tie is resolved the same way for the small and
+    # for the large involved.
+    deficit = np.cumsum(1.0 - scaled[smalls])
+    excess = np.cumsum(scaled[larges] - 1.0)
+    deficit_before = np.concatenate(([0.0], deficit))
+    deficit_base = deficit_before[small_end - np.bincount(small_segment, minlength=num_segments)]
+    excess_base = np.concatenate(([0.0], excess))[large_start]
+    excess_level = excess - excess_base[large_segment] + deficit_base[large_segment]
+    # Rounding can let a segment's last level overshoot the next segment's first one.
+    np.maximum.accumulate(excess_level, out=excess_level)
+    deficit_before = deficit_before[:-1]
+    
+    prob = np.ones(len(weights))
+    alias = np.arange(len(weights))
+    
+    # A small's donor is the first large that hasn't run dry before its turn.
+    has_donor = large_end[small_segment] > large_start[small_segment]
+    donor = np.searchsorted(excess_level, deficit_before, side="right")
+    donor = np.clip(donor, large_start[small_segment], large_end[small_segment] - 1)
+    prob[smalls] = np.where(has_donor, scaled[smalls], 1.0)
+    alias[smalls[has_donor]] = larges[donor[has_donor]]
+    
+    # A large serves every small whose turn starts below its level. If the last of them
+    # takes it past that level it keeps what is left and aliases the next large.
+    small_start = small_end - np.bincount(small_segment, minlength=num_segments)
+    last_served = np.clip(np.searchsorted(deficit_before, excess_level, side="left"),
+                          small_start[large_segment], small_end[large_segment]) - 1
+    rank = np.arange(len(larges))
+    exhausted = (last_served >= small_start[large_segment]) & (rank < large_end[large_segment] - 1)
+    exhausted[exhausted] = deficit[last_served[exhausted]] > excess_level[exhausted]
+    remaining = 1.0 + excess_level[exhausted] - deficit[last_served[exhausted]]
+    prob[larges[exhausted]] = np.clip(remaining, 0.0, 1.0)
+    alias[larges[exhausted]] = larges[rank[exhausted] + 1]
+    return prob, alias
+
+def _sample_alias(starts: np.ndarray, counts: np.ndarray, prob: np.ndarray, alias: np.ndarray,
+                  rng: np.random.Generator) -> np.ndarray:
+    """One draw per segment starts[i]:starts[i] + counts[i] (all non-empty)."""
+    slots = starts + (rng.random(len(starts)) * counts).astype(np.int64)
+    return np.where(rng.random(len(starts)) < prob[slots], slots, alias[slots])
+
+class RandomWalker:
+    """Batched first-order or node2vec (p, q) random walks over a CSRGraph."""
+    
+    def __init__(self, graph: CSRGraph, p: float = 1.0, q: float = 1.0, max_table_entries: int = 500_000_000):
+        self.graph = graph
+        self.p = p
+        self.q = q
+        weights = np.asarray(graph.weights, dtype=np.float64)
+        self._prob, self._alias = build_alias_tables(graph.indptr, weights)
+        self.second_order = not (p == 1 and q == 1)
+        if self.second_order:
+            # Table of arc e = (t, v) lists every arc (v, x) leaving its target.
+            degrees = graph.out_degrees()
+            sizes = degrees[graph.indices]
+            if sizes.sum() > max_table_entries:
+                raise ValueError(f"node2vec tables need {sizes.sum():,} entries (> max_table_entries)")
+            self._table_ptr = np.zeros(len(sizes) + 1, dtype=np.int64)
+            np.cumsum(sizes, out=self._table_ptr[1:])
+            next_arcs, _ = _edge_positions(graph.indptr, graph.indices.astype(np.int64))
+            previous = np.repeat(graph.sources(), sizes)
+            following = graph.indices[next_arcs].astype(np.int64)
+            n = graph.num_vertices
+            arc_keys = np.sort(graph.sources() * n + graph.indices)
+            keys = previous * n + following
+            found = np.minimum(np.searchsorted(arc_keys, keys), len(arc_keys) - 1)
+            bias = np.where(following == previous, 1 / p, np.where(arc_keys[found] == keys, 1.0, 1 / q))
+            del previous, following, keys, found
+            self._table_prob, self._table_alias = build_alias_tables(self._table_ptr, weights[next_arcs] * bias)
+            index_dtype = np.int32 if len(sizes) < 2**31 else np.int64
+            self._table_arcs = next_arcs.astype(index_dtype)
+    
+    def walk(self, starts, walk_length: int, seed=None) -> np.ndarray:
+        """
+        One walk from each start vertex, all advanced together.
+        
+        Returns:
+        np.ndarray: (len(starts), walk_length) vertices, -1 after a walk hits a dead end.
+        Time: O(walk_length * len(starts))
+        """
+        graph = self.graph
+        rng = np.random.default_rng(seed)
+        starts = np.atleast_1d(np.asarray(starts, dtype=np.int64))
+        walks = np.full((len(starts), walk_length), -1, dtype=np.int64)
+        if walk_length == 0:
+            return walks
+        walks[:, 0] = starts
+        walkers = np.arange(len(starts))
+        vertices = starts
+        arcs = None
+        for step in range(1, walk_length):
+            if arcs is None or not self.second_order:
+                segment_starts = graph.indptr[vertices]
+                counts = graph.indptr[vertices + 1] - segment_starts
+                moving = counts > 0
+                walkers, segment_starts, counts = walkers[moving], segment_starts[moving], counts[moving]
+                arcs = _sample_alias(segment_starts, counts, self._prob, self._alias, rng)
+            else:
+                segment_starts = self._table_ptr[arcs]
+                counts = self._table_ptr[arcs + 1] - segment_starts
+                moving = counts > 0
+                walkers, segment_starts, counts = walkers[moving], segment_starts[moving], counts[moving]
+                slots = _sample_alias(segment_starts, counts, self._table_prob, self._table_alias, rng)
+                arcs = self._table_arcs[slots].astype(np.int64)
+            if not len(walkers):
+                break
+            vertices = graph.indices[arcs].astype(np.int64)
+            walks[walkers, step] = vertices
+        return walks
+    
+    def _walk_range(self, job) -> np.ndarray:
+        first, last, walk_length, dtype, seed_sequence = job
+        return self.walk(np.arange(first, last), walk_length, seed_sequence).astype(dtype)
+    
+    def write_walks(self, path: str, num_walks: int, walk_length: int, seed: int = 0,
+                    processes: int = 1, shard_size: int = 100_000) -> int:
+        """
+        Write num_walks walks from every vertex to a .npy file, shard by shard.
+        
+        Args:
+        path (str): Output file, shape (num_walks * num_vertices, walk_length)
+        seed (int): Root seed; shard i draws from the i-th child of SeedSequence(seed)
+        processes (int): Worker processes; the output does not depend on it
+        shard_size (int): Start vertices per shard
+        
+        Returns:
+        int: Number of walks written
+        """
+        n = self.graph.num_vertices
+        dtype = next(t for t in (np.int16, np.int32, np.int64) if n <= np.iinfo(t).max)
+        # Shard (row, first, last) walks from vertices first..last - 1 into rows row.. of the file.
+        shards = [(r * n + first, first, min(first + shard_size, n))
+                  for r in range(num_walks) for first in range(0, n, shard_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(shards))
+        jobs = [(first, last, walk_length, dtype, s) for (_, first, last), s in zip(shards, seeds)]
+        output = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(num_walks * n, walk_length))
+        if processes > 1:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # Forked workers share the alias tables instead of unpickling a copy each.
+            context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+            with ProcessPoolExecutor(processes, mp_context=context, initializer=_init_walk_worker,
+                                     initargs=(self,)) as executor:
+                for (row, _, _), walks in zip(shards, executor.map(_walk_shard, jobs)):
+                    output[row:row + len(walks)] = walks
+        else:
+            for (row, _, _), job in zip(shards, jobs):
+                walks = self._walk_range(job)
+                output[row:row + len(walks)] = walks
+        output.flush()
+        del output
+        return num_walks * n
+
+_worker_walker = None
+
+def _init_walk_worker(walker: RandomWalker):
+    global _worker_walker
+    _worker_walker = walker
+
+def _walk_shard(job) -> np.ndarray:
+    return _worker_walker._walk_range(job)
+
+def benchmark_random_walks(num_vertices: int = 200_000, num_edges: int = 1_000_000, walk_length: int = 80,
+                           num_walks: int = 10, processes: int = 4):
+    """Step-at-a-time Python walks vs. RandomWalker, then sharded walks written to disk."""
+    import tempfile
+    
+    sources, targets, _ = generate_random_edges(num_vertices, num_edges)
+    graph = Graph()
+    for u, v in zip(sources.tolist(), targets.tolist()):
+        graph.add_edge(u, v)
+    csr = CSRGraph.from_graph(graph)
+    print(f"Random graph: {num_vertices:,} vertices, {num_edges:,} edges, walks of length {walk_length}")
+    
+    sample = random.Random(0).sample(range(num_vertices), 10_000)
+    start_time = timeit.default_timer()
+    for start in sample:
+        walk = [start]
+        for _ in range(walk_length - 1):
+            walk.append(random.choice(graph.graph[walk[-1]])[0])
+    python_rate = len(sample) / (timeit.default_timer() - start_time)
+    print(f"{'Python, one step at a time':<34}{python_rate:>12,.0f} walks/s")
+    
+    starts = np.arange(num_vertices)
+    for name, p, q in [("RandomWalker (uniform)", 1.0, 1.0), ("RandomWalker (p=0.5, q=2)", 0.5, 2.0)]:
+        walker, build_time = benchmark_algorithm(RandomWalker, csr, p, q)
+        walks, elapsed = benchmark_algorithm(walker.walk, starts, walk_length, 0)
+        print(f"{name:<34}{num_vertices / elapsed:>12,.0f} walks/s (tables built in {build_time:.2f} s)")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for workers in (1, processes):
+            paths.append(os.path.join(directory, f"walks_{workers}.npy"))
+            count, elapsed = benchmark_algorithm(walker.write_walks, paths[-1], num_walks, walk_length,
+                                                 processes=workers)
+            print(f"write_walks, {workers} process(es): {count:,} walks in {elapsed:.2f} s, "
+                  f"{os.path.getsize(paths[-1]) / 2**20:,.0f} MB")
+        first, second = (np.load(path, mmap_mode="r") for path in paths)
+        print("Same walks for any number of processes:", bool(np.array_equal(first, second)))
+        del first, second
+
+# Maximum flow and minimum-cost flow
+# ----------------------------------
+# The Edmonds-Karp demo in QuickStart/_algorithms.py keeps capacities in a V x V matrix,
+# so every BFS scans a full row per vertex: O(V^2) per augmenting path and O(V^2)
+# memory, which rules out anything past a few thousand vertices. FlowNetwork stores the
+# residual graph as edge arrays instead. Edge 2i is the i-th added edge and 2i + 1 its
+# reverse, so the partner of edge e is e ^ 1, and pushing f units along e is
+# cap[e] -= f; cap[e ^ 1] += f. Edge ids are grouped by tail vertex into CSR offsets.
+# - Dinic's algorithm: BFS levels from the source, then a blocking flow along edges that
+#   go exactly one level down, with a per-vertex "current edge" pointer so dead ends
+#   are never rescanned. O(V^2 E) in general, O(E sqrt(V)) on unit-capacity bipartite
+#   (assignment) networks.
+# - Highest-label push-relabel (Goldberg and Tarjan, 1988): vertices hold excess flow and
+#   push it to neighbors one height lower; the highest active vertex goes first, and
+#   periodic global relabeling (exact heights from a reverse BFS) keeps the number of
+#   relabels low in practice. O(V^2 sqrt(E)).
+# - min_cost_flow: primal-dual successive shortest paths. Dijkstra on reduced costs
+#   cost(u, v) + potential[u] - potential[v] >= 0 finds the distances, and a Dinic
+#   blocking flow then saturates every shortest path of that length at once.
+# All solvers are iterative and run on plain lists, the fastest element access in CPython.
+
+class FlowNetwork:
+    """A directed flow network stored as paired residual edge arrays."""
+    
+    def __init__(self, num_vertices: int):
+        self.num_vertices = num_vertices
+        self._head = []      # target vertex of every residual edge
+        self._cap = []       # residual capacity
+        self._cost = []      # cost per unit of flow (negated on reverse edges)
+        self._capacity = []  # original capacity of every added edge
+        self._adjacency = None
+    
+    @classmethod
+    def from_graph(cls, graph: Union[Graph, CSRGraph]) -> "FlowNetwork":
+        """A network with one edge per arc of graph, using the weights as capacities."""
+        if isinstance(graph, Graph):
+            graph = CSRGraph.from_graph(graph)
+        network = cls(graph.num_vertices)
+        network.add_edges(graph.sources(), graph.indices, graph.weights)
+        return network
+    
+    def add_edge(self, u: int, v: int, capacity, cost=0) -> int:
+        """Add an edge u -> v and return its id (ids count up from 0)."""
+        if not (0 <= u < self.num_vertices and 0 <= v < self.num_vertices):
+            raise ValueError(f"edge {u} -> {v} out of range for {self.num_vertices} vertices")
+        if capacity < 0:
+            raise ValueError("capacities must be non-negative")
+        self._head += (v, u)
+        self._cap += (capacity, 0)
+        self._cost += (cost, -cost)
+        self._capacity.append(capacity)
+        self._adjacency = None
+        return len(self._capacity) - 1
+    
+    def add_edges(self, sources, targets, capacities, costs=None) -> np.ndarray:
+        """Add many edges from parallel arrays and return their ids."""
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        capacities = np.asarray(capacities)
+        costs = np.zeros(len(sources), dtype=np.int64) if costs is None else np.asarray(costs)
+        if not len(sources) == len(targets) == len(capacities) == len(costs):
+            raise ValueError("sources, targets, capacities and costs must have the same length")
+        if len(sources) and (min(sources.min(), targets.min()) < 0
+                             or max(sources.max(), targets.max()) >= self.num_vertices):
+            raise ValueError(f"vertex id out of range for {self.num_vertices} vertices")
+        if (capacities < 0).any():
+            raise ValueError("capacities must be non-negative")
+        first = len(self._capacity)
+        self._head += np.column_stack((targets, sources)).ravel().tolist()
+        self._cap += np.column_stack((capacities, np.zeros_like(capacities))).ravel().tolist()
+        self._cost += np.column_stack((costs, -costs)).ravel().tolist()
+        self._capacity += capacities.tolist()
+        self._adjacency = None
+        return np.arange(first, len(self._capacity))
+    
+    @property
+    def num_edges(self) -> int:
+        return len(self._capacity)
+    
+    def edges(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sources, targets and capacities of the added edges, indexed by edge id."""
+        return (np.asarray(self._head[1::2], dtype=np.int64), np.asarray(self._head[0::2], dtype=np.int64),
+                np.asarray(self._capacity))
+    
+    def _edges_by_tail(self) -> Tuple[List[int], List[int]]:
+        """CSR offsets and residual edge ids grouped by tail vertex (cached)."""
+        if self._adjacency is None:
+            tails = np.asarray(self._head, dtype=np.int64).reshape(-1, 2)[:, ::-1].ravel()
+            offsets = np.zeros(self.num_vertices + 1, dtype=np.int64)
+            np.cumsum(np.bincount(tails, minlength=self.num_vertices), out=offsets[1:])
+            self._adjacency = offsets.tolist(), np.argsort(tails, kind="stable").tolist()
+        return self._adjacency
+    
+    def reset(self):
+        """Remove all flow."""
+        self._cap = [c for capacity in self._capacity for c in (capacity, 0)]
+    
+    def flows(self) -> np.ndarray:
+        """Flow on every added edge, indexed by edge id."""
+        return np.asarray(self._cap[1::2])
+    
+    def max_flow(self, source: int, sink: int, method: str = "dinic"):
+        """
+        Push a maximum flow from source to sink on top of any flow already present.
+        
+        Args:
+        method (str): "dinic" or "push-relabel"
+        
+        Returns:
+        The value of the flow added. Afterwards flows() gives the flow per edge and
+        min_cut(source) a minimum cut.
+        """
+        if method not in ("dinic", "push-relabel"):
+            raise ValueError(f"unknown method: {method!r}")
+        if source == sink:
+            raise ValueError("source and sink must differ")
+        if method == "dinic":
+            return self._dinic(source, sink)
+        return self._push_relabel(source, sink)
+    
+    def _levels(self, source: int, sink: int, potential=None) -> Optional[List[int]]:
+        """
+        BFS levels over residual edges (only those with zero reduced cost if potential is
+        given); None if sink is unreachable.
+        """
+        offsets, edges = self._edges_by_tail()
+        head, cap, cost = self._head, self._cap, self._cost
+        level = [-1] * self.num_vertices
+        level[source] = 0
+        queue = [source]
+        for u in queue:  # queue doubles as the visit order
+            next_level = level[u] + 1
+            for e in edges[offsets[u]:offsets[u + 1]]:
+                v = head[e]
+                if level[v] < 0 and cap[e] > 0 and (potential is None or cost[e] + potential[u] == potential[v]):
+                    level[v] = next_level
+                    if v == sink:
+                        return level
+                    queue.append(v)
+        return None
+    
+    def _blocking_flow(self, source: int, sink: int, level: List[int], potential=None):
+        """Saturate every source-sink path that steps down the levels, without recursion."""
+        offsets, edges = self._edges_by_tail()
+        head, cap, cost = self._head, self._cap, self._cost
+        pointer = offsets[:-1]  # current edge of every vertex
+        total = 0
+        path = []
+        u = source
+        while True:
+            if u == sink:
+                pushed = min(cap[e] for e in path)
+                total += pushed
+                first_saturated = None
+                for i, e in enumerate(path):
+                    cap[e] -= pushed
+                    cap[e ^ 1] += pushed
+                    if first_saturated is None and cap[e] == 0:
+                        first_saturated = i
+                # Resume from the tail of the first edge that became full.
+                del path[first_saturated:]
+                u = head[path[-1]] if path else source
+                continue
+            i, end = pointer[u], offsets[u + 1]
+            target_level = level[u] + 1
+            while i < end:
+                e = edges[i]
+                v = head[e]
+                if (cap[e] > 0 and level[v] == target_level
+                        and (potential is None or cost[e] + potential[u] == potential[v])):
+                    break
+                i += 1
+            pointer[u] = i
+            if i < end:
+                path.append(e)
+                u = v
+            elif u == source:
+                return total
+            else:
+                level[u] = -1  # dead end for the rest of this phase
+                e = path.pop()
+                u = head[e ^ 1]
+                pointer[u] += 1
+    
+    def _dinic(self, source: int, sink: int):
+        total = 0
+        while True:
+            level = self._levels(source, sink)
+            if level is None:
+                return total
+            total += self._blocking_flow(source, sink, level)
+    
+    def _push_relabel(self, source: int, sink: int):
+        offsets, edges = self._edges_by_tail()
+        head, cap = self._head, self._cap
+        n = self.num_vertices
+        top = 2 * n  # no vertex with excess ever needs a height this large
+        excess = [0] * n
+        
+        for e in edges[offsets[source]:offsets[source + 1]]:
+            if cap[e] > 0:
+                excess[head[e]] += cap[e]
+                excess[source] -= cap[e]
+                cap[e ^ 1] += cap[e]
+                cap[e] = 0
+        
+        # Relabeling one vertex at a time lets heights drift far below their true
+        # distances; after this much work, recompute them exactly.
+        relabel_budget = 6 * n + len(head) // 2
+        while True:
+            # Global relabel: height = residual distance to the sink, or n + distance
+            # to the source for vertices whose excess can only go back there.
+            height = [top] * n
+            for root, base in ((sink, 0), (source, n)):
+                height[root] = base
+                queue = [root]
+                for v in queue:
+                    for e in edges[offsets[v]:offsets[v + 1]]:
+                        u = head[e]
+                        if height[u] == top and cap[e ^ 1] > 0 and u != source:
+                            height[u] = height[v] + 1
+                            queue.append(u)
+            pointer = offsets[:-1]
+            buckets = [[] for _ in range(top)]
+            for v in range(n):
+                if excess[v] > 0 and v != sink and v != source and height[v] < top:
+                    buckets[height[v]].append(v)
+            highest = top - 1
+            work = 0
+            
+            while highest >= 0 and work < relabel_budget:
+                if not buckets[highest]:
+                    highest -= 1
+                    continue
+                u = buckets[highest].pop()
+                hu = height[u]
+                # Discharge u: push along edges one level down, relabel when none are left.
+                while True:
+                    i, end = pointer[u], offsets[u + 1]
+                    while i < end:
+                        e = edges[i]
+                        v = head[e]
+                        if cap[e] > 0 and height[v] == hu - 1:
+                            pushed = min(excess[u], cap[e])
+                            cap[e] -= pushed
+                            cap[e ^ 1] += pushed
+                            excess[u] -= pushed
+                            if excess[v] == 0 and v != sink and v != source:
+                                buckets[hu - 1].append(v)
+                            excess[v] += pushed
+                            if excess[u] == 0:
+                                break
+                        i += 1
+                    pointer[u] = i
+                    if excess[u] == 0:
+                        break
+                    # Relabel to one above the lowest residual neighbor.
+                    work += end - offsets[u] + 12
+                    hu = top
+                    for e in edges[offsets[u]:end]:
+                        if cap[e] > 0 and height[head[e]] < hu:
+                            hu = height[head[e]]
+                    hu = min(hu + 1, top)
+                    height[u] = hu
+                    pointer[u] = offsets[u]
+                    if hu == top or work >= relabel_budget:
+                        break
+                if excess[u] > 0 and hu < top:
+                    buckets[hu].append(u)
+                highest = max(highest, min(hu, top - 1))
+            if work < relabel_budget:
+                return excess[sink]
+    
+    def min_cut(self, source: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Minimum cut of the current (maximum) flow.
+        
+        Returns:
+        Tuple of a boolean mask of the vertices still reachable from source in the
+        residual graph, and the ids of the saturated edges leaving that set.
+        """
+        offsets, edges = self._edges_by_tail()
+        head, cap = self._head, self._cap
+        reachable = bytearray(self.num_vertices)
+        reachable[source] = 1
+        queue = [source]
+        for u in queue:
+            for e in edges[offsets[u]:offsets[u + 1]]:
+                if cap[e] > 0 and not reachable[head[e]]:
+                    reachable[head[e]] = 1
+                    queue.append(head[e])
+        side = np.frombuffer(bytes(reachable), dtype=bool)
+        sources, targets, _ = self.edges()
+        return side, np.flatnonzero(side[sources] & ~side[targets])
+    
+    def min_cost_flow(self, source: int, sink: int, max_flow=None) -> Tuple[float, float]:
+        """
+        Send up to max_flow units (as much as possible if None) at minimum total cost.
+        
+        Returns:
+        Tuple of (flow added, total cost of all flow in the network). Costs may be
+        negative as long as the residual graph has no negative cycle. Exact for integer costs.
+        Only cycles reachable from source are detected (ValueError); a negative cycle
+        elsewhere is left alone, so the result is a minimum-cost source-sink flow, not
+        the minimum-cost circulation networkx's min_cost_flow would find.
+        """
+        offsets, edges = self._edges_by_tail()
+        head, cap, cost = self._head, self._cap, self._cost
+        n = self.num_vertices
+        potential = [0] * n
+        if any(c < 0 for e, c in enumerate(cost) if cap[e] > 0):
+            residual = [e for e in range(len(head)) if cap[e] > 0]
+            graph = CSRGraph.from_edges([head[e ^ 1] for e in residual], [head[e] for e in residual],
+                                        [cost[e] for e in residual], n)
+            distances, _, cycle = bellman_ford_vectorized(graph, source)
+            if cycle:
+                raise ValueError(f"negative-cost cycle: {cycle}")
+            potential = np.where(np.isfinite(distances), distances, 0).tolist()
+        
+        remaining = float("inf") if max_flow is None else max_flow
+        total_flow = 0
+        while remaining > 0:
+            # Dijkstra on reduced costs, up to the sink.
+            dist = [float("inf")] * n
+            parent_edge = [-1] * n
+            dist[source] = 0
+            heap = [(0, source)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                if u == sink:
+                    break
+                pu = potential[u]
+                for e in edges[offsets[u]:offsets[u + 1]]:
+                    if cap[e] > 0:
+                        v = head[e]
+                        nd = d + cost[e] + pu - potential[v]
+                        if nd < dist[v]:
+                            dist[v] = nd
+                            parent_edge[v] = e
+                            heapq.heappush(heap, (nd, v))
+            if dist[sink] == float("inf"):
+                break
+            # Capping unsettled vertices at dist[sink] keeps every reduced cost non-negative.
+            limit = dist[sink]
+            potential = [p + (d if d < limit else limit) for p, d in zip(potential, dist)]
+            
+            # Every residual edge with zero reduced cost now lies on a shortest path.
+            pushed = 0
+            if max_flow is None:
+                while True:
+                    level = self._levels(source, sink, potential)
+                    if level is None:
+                        break
+                    pushed += self._blocking_flow(source, sink, level, potential)
+            if pushed == 0:
+                # One shortest path at a time: with a flow limit, or when rounding in
+                # non-integer costs leaves no exactly-zero path.
+                path = []
+                v = sink
+                while v != source:
+                    path.append(parent_edge[v])
+                    v = head[parent_edge[v] ^ 1]
+                pushed = min(remaining, min(cap[e] for e in path))
+                for e in path:
+                    cap[e] -= pushed
+                    cap[e ^ 1] += pushed
+            total_flow += pushed
+            remaining -= pushed
+        total_cost = sum(f * c for f, c in zip(self._cap[1::2], self._cost[0::2]))
+        return total_flow, total_cost
+
+def generate_assignment_network(num_workers: int, num_jobs: int, choices_per_worker: int = 5,
+                                seed: int = 0) -> Tuple[FlowNetwork, int, int]:
+    """
+    source -> worker -> job -> sink, every edge of capacity 1; each worker can take
+    choices_per_worker random jobs at a random cost of 1..100. Returns (network, source, sink).
+    """
+    rng = np.random.default_rng(seed)
+    source, sink = num_workers + num_jobs, num_workers + num_jobs + 1
+    network = FlowNetwork(num_workers + num_jobs + 2)
+    workers = np.arange(num_workers)
+    jobs = num_workers + np.arange(num_jobs)
+    choices = np.repeat(workers, choices_per_worker)
+    network.add_edges(np.full(num_workers, source), workers, np.ones(num_workers, dtype=np.int64))
+    network.add_edges(choices, num_workers + rng.integers(0, num_jobs, len(choices)),
+                      np.ones(len(choices), dtype=np.int64), rng.integers(1, 101, len(choices)))
+    network.add_edges(jobs, np.full(num_jobs, sink), np.ones(num_jobs, dtype=np.int64))
+    return network, source, sink
+
+def benchmark_max_flow(num_workers: int = 50_000, matrix_workers: int = 300, cost_workers: int = 3_000):
+    """Matrix Edmonds-Karp vs. FlowNetwork on assignment networks, then min-cost assignment."""
+    def edmonds_karp_matrix(capacity, source, sink):
+        # The QuickStart/_algorithms.py approach: BFS over full rows of a V x V matrix.
+        n = len(capacity)
+        total = 0
+        while True:
+            parent = [-1] * n
+            parent[source] = source
+            queue = deque([source])
+            while queue and parent[sink] < 0:
+                u = queue.popleft()
+                for v, c in enumerate(capacity[u]):
+                    if parent[v] < 0 and c > 0:
+                        parent[v] = u
+                        queue.append(v)
+            if parent[sink] < 0:
+                return total
+            pushed, v = float("inf"), sink
+            while v != source:
+                pushed = min(pushed, capacity[parent[v]][v])
+                v = parent[v]
+            v = sink
+            while v != source:
+                capacity[parent[v]][v] -= pushed
+                capacity[v][parent[v]] += pushed
+                v = parent[v]
+            total += pushed
+    
+    network, source, sink = generate_assignment_network(matrix_workers, matrix_workers)
+    capacity = [[0] * network.num_vertices for _ in range(network.num_vertices)]
+    for u, v, c in zip(*(array.tolist() for array in network.edges())):
+        capacity[u][v] += c
+    flow, elapsed = benchmark_algorithm(edmonds_karp_matrix, capacity, source, sink)
+    print(f"{matrix_workers} x {matrix_workers} assignment: matrix Edmonds-Karp {elapsed:.2f} s (flow {flow}), ", end="")
+    flow, elapsed = benchmark_algorithm(lambda net: net.max_flow(source, sink), network)
+    print(f"Dinic {elapsed * 1000:.1f} ms (flow {flow})")
+    
+    network, source, sink = generate_assignment_network(num_workers, num_workers)
+    print(f"{num_workers:,} x {num_workers:,} assignment: {network.num_vertices:,} vertices, {network.num_edges:,} edges")
+    for method in ("dinic", "push-relabel"):
+        network.reset()
+        flow, elapsed = benchmark_algorithm(lambda net: net.max_flow(source, sink, method), network)
+        side, cut = network.min_cut(source)
+        assert len(cut) == flow
+        print(f"{method:<14}{elapsed:>7.2f} s, flow {flow:,}, min cut of {len(cut):,} edges")
+    
+    network, source, sink = generate_assignment_network(cost_workers, cost_workers)
+    (flow, cost), elapsed = benchmark_algorithm(lambda net: net.min_cost_flow(source, sink), network)
+    print(f"Min-cost assignment of {cost_workers:,} workers: {elapsed:.2f} s, {flow:,} assigned, total cost {cost:,}")
+
+# Friend recommendations by mutual friends
+# ----------------------------------------
+# SocialNetwork.recommend_friends() runs a BFS per request and ranks candidates by
+# distance alone. Ranking friends-of-friends by the number of mutual friends is the
+# usual signal, and the counts for user u are row u of A @ A (A = adjacency matrix)
+# minus u's existing friends. FriendRecommendationIndex computes those rows for a batch
+# of users at a time with array operations: expand every (user, friend, friend-of-friend)
+# path, count repeated (user, friend-of-friend) pairs with one sort, and keep the k best
+# per user. The result lives in two (num_users, k) int32 arrays, so a request is a row
+# lookup. Batches can be spread over a process pool.
+# A new friendship u - v only changes the counts of pairs that share u or v:
+# - every friend w of u gains v as a candidate (or v's count with w goes up by one), and
+#   vice versa; one sorted-set intersection gives the new count,
+# - u and v stop being candidates for each other, so their own rows are recomputed.
+# Friendships added after the build are kept in small per-user sets next to the CSRGraph.
+
+def mutual_friend_top_k(graph: CSRGraph, users: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The k non-friends of each user with the most mutual friends (ties: smaller id first).
+    
+    Args:
+    graph (CSRGraph): Undirected friendships without duplicate edges or self-loops
+    users (np.ndarray): The users to compute rows for
+    
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: (len(users), k) candidate ids (-1 padded) and
+    mutual-friend counts. Time: O(P log P) for P friend-of-friend paths
+    """
+    n = graph.num_vertices
+    users = np.asarray(users, dtype=np.int64)
+    friend_positions, degrees = _edge_positions(graph.indptr, users)
+    owners = np.repeat(np.arange(len(users)), degrees)
+    friends = graph.indices[friend_positions].astype(np.int64)
+    path_positions, path_counts = _edge_positions(graph.indptr, friends)
+    rows = np.repeat(owners, path_counts)
+    keys, counts = np.unique(rows * n + graph.indices[path_positions], return_counts=True)
+    rows, candidates = np.divmod(keys, n)
+    keep = (candidates != users[rows]) & ~np.isin(keys, owners * n + friends)
+    rows, candidates, counts = rows[keep], candidates[keep], counts[keep]
+    
+    # Sort by row, then count descending; the stable sort keeps candidates ascending on ties.
+    levels = int(counts.max()) + 1 if len(counts) else 1
+    order = np.argsort(rows * levels + (levels - 1 - counts), kind="stable")
+    rows, candidates, counts = rows[order], candidates[order], counts[order]
+    rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+    top = rank < k
+    ids = np.full((len(users), k), -1, dtype=np.int32)
+    mutual = np.zeros((len(users), k), dtype=np.int32)
+    ids[rows[top], rank[top]] = candidates[top]
+    mutual[rows[top], rank[top]] = counts[top]
+    return ids, mutual
+
+class FriendRecommendationIndex:
+    """Per-user top-k friend suggestions by mutual-friend count, updated as friendships are added."""
+    
+    def __init__(self, graph: CSRGraph, ids: np.ndarray, mutual: np.ndarray):
+        self.graph = graph
+        self.ids = ids
+        self.mutual = mutual
+        self._added = defaultdict(set)  # friendships added after the build
+    
+    @classmethod
+    def build(cls, graph: Union[Graph, CSRGraph], k: int = 10, batch_size: int = 10_000,
+              processes: int = 1) -> "FriendRecommendationIndex":
+        """Compute every user's top-k, batch_size users at a time, on up to processes processes."""
+        if isinstance(graph, Graph):
+            graph = CSRGraph.from_graph(graph)
+        # Duplicate friendships or self-loops would inflate the counts.
+        n = graph.num_vertices
+        sources, targets = graph.sources(), graph.indices.astype(np.int64)
+        keys = np.unique(np.concatenate((sources * n + targets, targets * n + sources)))
+        keys = keys[keys // n != keys % n]
+        graph = CSRGraph.from_edges(keys // n, keys % n, num_vertices=n)
+        graph.directed = False
+        batches = [np.arange(first, min(first + batch_size, n)) for first in range(0, n, batch_size)]
+        if processes > 1:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+            with ProcessPoolExecutor(processes, mp_context=context, initializer=_init_recommendation_worker,
+                                     initargs=(graph, k)) as executor:
+                results = list(executor.map(_recommendation_batch, batches))
+        else:
+            results = [mutual_friend_top_k(graph, batch, k) for batch in batches]
+        ids = np.concatenate([r[0] for r in results]) if results else np.empty((0, k), dtype=np.int32)
+        mutual = np.concatenate([r[1] for r in results]) if results else np.empty((0, k), dtype=np.int32)
+        return cls(graph, ids, mutual)
+    
+    @property
+    def k(self) -> int:
+        return self.ids.shape[1]
+    
+    def friends(self, user: int) -> Set[int]:
+        friends = set(self.graph.neighbors(user).tolist()) if user < self.graph.num_vertices else set()
+        return friends | self._added[user] if user in self._added else friends
+    
+    def recommend(self, user: int, k: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Up to k stored suggestions as (user, mutual friends), best first. Time: O(k)"""
+        if not 0 <= user < len(self.ids):
+            return []
+        k = self.k if k is None else min(k, self.k)
+        return [(c, m) for c, m in zip(self.ids[user, :k].tolist(), self.mutual[user, :k].tolist()) if c >= 0]
+    
+    def add_friendship(self, u: int, v: int):
+        """Record a new friendship and update every row it changes."""
+        if u == v or v in self.friends(u):
+            return
+        if max(u, v) >= len(self.ids):
+            extra = max(u, v) + 1 - len(self.ids)
+            self.ids = np.vstack((self.ids, np.full((extra, self.k), -1, dtype=self.ids.dtype)))
+            self.mutual = np.vstack((self.mutual, np.zeros((extra, self.k), dtype=self.mutual.dtype)))
+        self._added[u].add(v)
+        self._added[v].add(u)
+        for a, b in ((u, v), (v, u)):
+            # a is now a mutual friend of b and each of a's other friends.
+            b_friends = self.friends(b)
+            for w in self.friends(a):
+                if w != b and w not in b_friends:
+                    self._offer(w, b, len(self.friends(w) & b_friends))
+        for user in (u, v):
+            friends = self.friends(user)
+            counts = defaultdict(int)
+            for friend in friends:
+                for candidate in self.friends(friend):
+                    counts[candidate] += 1
+            best = heapq.nsmallest(self.k, ((-m, c) for c, m in counts.items()
+                                            if c != user and c not in friends))
+            self._store(user, [(c, -m) for m, c in best])
+    
+    def _offer(self, user: int, candidate: int, count: int):
+        """candidate's mutual-friend count with user went up to count; the other counts are unchanged."""
+        row = [(c, m) for c, m in self.recommend(user) if c != candidate]
+        row.append((candidate, count))
+        row.sort(key=lambda item: (-item[1], item[0]))
+        self._store(user, row[:self.k])
+    
+    def _store(self, user: int, row: List[Tuple[int, int]]):
+        self.ids[user] = -1
+        self.mutual[user] = 0
+        for i, (candidate, count) in enumerate(row):
+            self.ids[user, i] = candidate
+            self.mutual[user, i] = count
+
+_recommendation_job = None
+
+def _init_recommendation_worker(graph: CSRGraph, k: int):
+    global _recommendation_job
+    _recommendation_job = (graph, k)
+
+def _recommendation_batch(users: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    graph, k = _recommendation_job
+    return mutual_friend_top_k(graph, users, k)
+
+def benchmark_friend_recommendations(num_users: int = 100_000, num_friendships: int = 1_000_000,
+                                     num_requests: int = 1_000, processes: int = 4):
+    """BFS per request vs. a precomputed mutual-friend index, and incremental updates."""
+    sources, targets, _ = generate_random_edges(num_users, num_friendships)
+    network = SocialNetwork()
+    for u, v in zip(sources.tolist(), targets.tolist()):
+        network.add_friendship(u, v)
+    print(f"Social network: {num_users:,} users, {num_friendships:,} friendships")
+    users = random.Random(0).sample(range(num_users), num_requests)
+    
+    start_time = timeit.default_timer()
+    for user in users:
+        network.recommend_friends(user)
+    bfs_time = (timeit.default_timer() - start_time) / num_requests
+    print(f"recommend_friends with BFS:   {bfs_time * 1e3:8.3f} ms per request")
+    
+    for workers in (1, processes):
+        _, elapsed = benchmark_algorithm(lambda g: network.build_recommendation_index(processes=workers), None)
+        print(f"Index build, {workers} process(es): {elapsed:.2f} s, "
+              f"{(network.index.ids.nbytes + network.index.mutual.nbytes) / 2**20:.1f} MB")
+    start_time = timeit.default_timer()
+    for user in users:
+        network.recommend_mutual_friends(user)
+    lookup_time = (timeit.default_timer() - start_time) / num_requests
+    print(f"recommend_mutual_friends:     {lookup_time * 1e3:8.3f} ms per request")
+    
+    new_friendships = [tuple(random.Random(i).sample(range(num_users), 2)) for i in range(num_requests)]
+    start_time = timeit.default_timer()
+    for u, v in new_friendships:
+        network.add_friendship(u, v)
+    update_time = (timeit.default_timer() - start_time) / num_requests
+    rebuilt = FriendRecommendationIndex.build(network.graph)
+    exact = all(network.recommend_mutual_friends(u) == rebuilt.recommend(u)[:5] for pair in new_friendships[:100] for u in pair)
+    print(f"add_friendship with index:    {update_time * 1e3:8.3f} ms per friendship "
+          f"(matches a full rebuild: {exact})")
+
+# Hamiltonian paths and the traveling salesman problem
+# ----------------------------------------------------
+# Plain backtracking tries vertex orders one by one, O(n!) in the worst case, and stops
+# being usable around 15 vertices. solve_tsp picks among three strategies:
+# - Held-Karp (1962) dynamic programming: cost[S][v] is the cheapest path that starts at
+#   vertex 0, visits exactly the set S and ends at v. Processing the sets in order of
+#   size, each cost[S][v] is a minimum over cost[S - {v}][u] + w(u, v), computed for all
+#   sets of one size at once with NumPy. O(2^n n^2) time and O(2^n n) memory: about
+#   170 MB at n = 21, and the practical limit.
+# - Branch and bound: a depth-first search over partial tours that prunes a branch when
+#   its cost plus a lower bound on the rest reaches the best tour found so far. The rest
+#   is one edge into the unvisited vertices, a path through them (no lighter than their
+#   minimum spanning tree on min(w(u, v), w(v, u))) and one edge back to 0.
+# - Local search: a nearest-neighbor tour, then 2-opt moves (reverse a segment; only for
+#   symmetric weights, since reversing changes the direction of every edge inside it)
+#   and Or-opt moves (relocate a run of 1-3 vertices) until none improves the tour.
+# Everything takes an optional time budget and returns the best tour found, with a flag
+# saying whether it is proven optimal. A Hamiltonian path (rather than a cycle) is a
+# cycle through an extra vertex that is 0 away from every vertex.
+
+def held_karp(weights: np.ndarray) -> Tuple[float, List[int]]:
+    """
+    The cheapest cycle through all vertices, starting at vertex 0, by bitmask DP.
+    
+    Returns:
+    Tuple of the cost (inf if there is no cycle) and the cycle without the closing
+    vertex 0. Time: O(2^n n^2), Space: O(2^n n)
+    """
+    n = len(weights)
+    if n <= 1:
+        return 0.0, list(range(n))
+    m = n - 1  # vertex i + 1 is bit i of a set
+    inner = weights[1:, 1:]
+    size = 1 << m
+    cost = np.full((size, m), np.inf)
+    bits = np.arange(m)
+    cost[1 << bits, bits] = weights[0, 1:]
+    sets = np.arange(size)
+    set_sizes = np.zeros(size, dtype=np.int8)
+    for bit in range(m):
+        set_sizes += (sets >> bit) & 1
+    by_size = np.argsort(set_sizes, kind="stable")
+    layer_end = np.cumsum(np.bincount(set_sizes, minlength=m + 1))
+    for k in range(2, m + 1):
+        layer = by_size[layer_end[k - 1]:layer_end[k]]
+        for v in range(m):
+            ending = layer[(layer >> v) & 1 == 1]
+            # cost[S - {v}][u] is inf for u outside S - {v}, so the minimum skips them.
+            cost[ending, v] = (cost[ending ^ (1 << v)] + inner[:, v]).min(axis=1)
+    
+    full = size - 1
+    totals = cost[full] + weights[1:, 0]
+    last = int(np.argmin(totals))
+    if not np.isfinite(totals[last]):
+        return float("inf"), []
+    # Walk back: the previous vertex is the one whose subproblem cost explains this one.
+    tour = [last]
+    remaining = full
+    while remaining & (remaining - 1):
+        previous_set = remaining ^ (1 << tour[-1])
+        tour.append(int(np.argmin(cost[previous_set] + inner[:, tour[-1]])))
+        remaining = previous_set
+    return float(totals[last]), [0] + [v + 1 for v in reversed(tour)]
+
+def _tour_cost(weights: np.ndarray, tour) -> float:
+    tour = np.asarray(tour)
+    return float(weights[tour, np.roll(tour, -1)].sum()) if len(tour) > 1 else 0.0
+
+def _spanning_tree_weight(weights: np.ndarray, vertices: np.ndarray) -> float:
+    """Prim's algorithm on the dense submatrix of the given vertices. O(k^2)"""
+    sub = weights[np.ix_(vertices, vertices)]
+    best = sub[0].copy()
+    in_tree = np.zeros(len(vertices), dtype=bool)
+    in_tree[0] = True
+    best[0] = np.inf
+    total = 0.0
+    for _ in range(len(vertices) - 1):
+        v = int(np.argmin(best))
+        total += best[v]
+        in_tree[v] = True
+        best = np.minimum(best, sub[v])
+        best[in_tree] = np.inf
+    return total
+
+def tsp_branch_and_bound(weights: np.ndarray, best_cost: float = float("inf"), best_tour: Optional[List[int]] = None,
+                         deadline: Optional[float] = None) -> Tuple[float, List[int], bool]:
+    """
+    Depth-first branch and bound with minimum-spanning-tree lower bounds.
+    
+    Args:
+    best_cost, best_tour: An incumbent tour to beat (e.g. from tsp_local_search)
+    deadline (float): timeit.default_timer() value at which to stop searching
+    
+    Returns:
+    Tuple of the best cost, its tour and whether the search finished (proving optimality).
+    """
+    n = len(weights)
+    symmetric = np.minimum(weights, weights.T)
+    best = [best_cost, best_tour or []]
+    visited = np.zeros(n, dtype=bool)
+    visited[0] = True
+    path = [0]
+    timed_out = False
+    
+    def search(cost: float):
+        nonlocal timed_out
+        if deadline is not None and timeit.default_timer() > deadline:
+            timed_out = True
+            return
+        u = path[-1]
+        if len(path) == n:
+            if cost + weights[u, 0] < best[0]:
+                best[0], best[1] = cost + weights[u, 0], list(path)
+            return
+        rest = np.flatnonzero(~visited)
+        bound = cost + weights[u, rest].min() + weights[rest, 0].min() + _spanning_tree_weight(symmetric, rest)
+        if bound >= best[0]:
+            return
+        for v in rest[np.argsort(weights[u, rest], kind="stable")].tolist():
+            step = cost + weights[u, v]
+            if step >= best[0]:
+                break  # children are sorted, so the rest are no cheaper
+            visited[v] = True
+            path.append(v)
+            search(step)
+            path.pop()
+            visited[v] = False
+            if timed_out:
+                return
+    
+    if n <= 1:
+        return 0.0, list(range(n)), True
+    search(0.0)
+    return float(best[0]), best[1], not timed_out
+
+def tsp_local_search(weights: np.ndarray, tour: Optional[List[int]] = None,
+                     deadline: Optional[float] = None) -> Tuple[float, List[int]]:
+    """
+    Improve a tour (nearest neighbor from 0 if None) with 2-opt and Or-opt moves until
+    no move helps or the deadline passes. Returns (cost, tour starting at 0).
+    """
+    n = len(weights)
+    if n <= 3:
+        tour = list(range(n)) if tour is None else tour
+        return _tour_cost(weights, tour), list(tour)
+    # Missing edges get a finite penalty so gains stay comparable; any move that removes
+    # one is an improvement.
+    finite = weights[np.isfinite(weights)]
+    penalty = (np.abs(finite).max() if len(finite) else 1.0) * n + 1
+    w = np.where(np.isfinite(weights), weights, penalty)
+    symmetric = np.array_equal(w, w.T)
+    
+    if tour is None:
+        tour = [0]
+        unvisited = np.ones(n, dtype=bool)
+        unvisited[0] = False
+        for _ in range(n - 1):
+            candidates = np.flatnonzero(unvisited)
+            nearest = int(candidates[np.argmin(w[tour[-1], candidates])])
+            tour.append(nearest)
+            unvisited[nearest] = False
+    tour = np.array(tour)
+    tour = np.roll(tour, -int(np.flatnonzero(tour == 0)[0]))
+    
+    improved = True
+    while improved and (deadline is None or timeit.default_timer() < deadline):
+        improved = False
+        if symmetric:
+            # 2-opt: replace edges (a, b) and (c, d) by (a, c) and (b, d).
+            for i in range(n - 2):
+                a, b = tour[i], tour[i + 1]
+                c, d = tour[i + 2:], np.roll(tour, -1)[i + 2:]
+                if i == 0:
+                    c, d = c[:-1], d[:-1]  # (c, d) = (last, 0) would share vertex 0 with (a, b)
+                gains = w[a, c] + w[b, d] - w[a, b] - w[c, d]
+                j = int(np.argmin(gains))
+                if gains[j] < -1e-9:
+                    tour[i + 1:i + 3 + j] = tour[i + 1:i + 3 + j][::-1]
+                    improved = True
+        # Or-opt: move tour[i:i + length] between two other consecutive vertices.
+        for length in (1, 2, 3):
+            i = 1
+            while i + length <= n and n - length >= 3:
+                segment = tour[i:i + length]
+                before, after = tour[i - 1], tour[(i + length) % n]
+                removal_gain = w[before, segment[0]] + w[segment[-1], after] - w[before, after]
+                rest = np.concatenate((tour[:i], tour[i + length:]))
+                x, y = rest, np.roll(rest, -1)
+                insertion = w[x, segment[0]] + w[segment[-1], y] - w[x, y]
+                j = int(np.argmin(insertion))
+                if insertion[j] < removal_gain - 1e-9:
+                    tour = np.concatenate((rest[:j + 1], segment, rest[j + 1:]))
+                    tour = np.roll(tour, -int(np.flatnonzero(tour == 0)[0]))
+                    improved = True
+                i += 1
+            if deadline is not None and timeit.default_timer() >= deadline:
+                break
+    return _tour_cost(weights, tour), tour.tolist()
+
+def solve_tsp(weights: Union[Graph, CSRGraph, np.ndarray], cycle: bool = True, start: Optional[int] = None,
+              time_budget: Optional[float] = None, method: str = "auto") -> Tuple[float, List[int], bool]:
+    """
+    Cheapest Hamiltonian cycle (traveling salesman tour) or Hamiltonian path.
+    
+    Args:
+    weights: A dense weight matrix (inf = no edge), Graph or CSRGraph
+    cycle (bool): Return to the first vertex (True) or stop at the last one (False)
+    start (int): First vertex (for a path, any vertex if None)
+    time_budget (float): Seconds to search; the best solution so far is returned
+    method (str): "auto", "held-karp", "branch-and-bound" or "local-search". "auto"
+                  uses Held-Karp up to 20 vertices; beyond that, local search and then
+                  branch and bound for whatever budget is left (without a budget,
+                  branch and bound only runs up to 40 vertices)
+    
+    Returns:
+    Tuple of cost (inf if nothing was found), the vertex order (a cycle is not closed)
+    and whether the result is proven optimal.
+    """
+    if method not in ("auto", "held-karp", "branch-and-bound", "local-search"):
+        raise ValueError(f"unknown method: {method!r}")
+    deadline = None if time_budget is None else timeit.default_timer() + time_budget
+    if not isinstance(weights, np.ndarray):
+        weights = distance_matrix(weights)
+    weights = np.asarray(weights, dtype=np.float64)
+    n = len(weights)
+    fixed_start = start is not None
+    start = start if fixed_start else 0
+    # Reorder so the first vertex is 0; for a path, add a vertex n that is free to reach
+    # from everywhere and (with a fixed start) only leads to start.
+    order = np.concatenate(([start], np.delete(np.arange(n), start))) if n else np.arange(0)
+    w = weights[np.ix_(order, order)].copy()
+    np.fill_diagonal(w, np.inf)
+    if not cycle:
+        extended = np.full((n + 1, n + 1), np.inf)
+        extended[:n, :n] = w
+        extended[:n, n] = 0
+        if not fixed_start or n == 0:
+            extended[n, :n] = 0
+        else:
+            extended[n, 0] = 0
+        w = np.roll(extended, 1, axis=(0, 1))  # the extra vertex becomes vertex 0
+    
+    if method == "held-karp" or (method == "auto" and len(w) <= 21):
+        cost, tour = held_karp(w)
+        proven = True
+    else:
+        # Branch and bound prunes far more with a good tour to beat from the start.
+        local_deadline = deadline
+        if method != "local-search" and deadline is not None:
+            local_deadline = timeit.default_timer() + time_budget / 4
+        cost, tour = tsp_local_search(w, deadline=local_deadline)
+        proven = False
+        if method == "branch-and-bound" or (method == "auto" and (deadline is not None or len(w) <= 41)):
+            cost, tour, proven = tsp_branch_and_bound(w, cost, tour, deadline=deadline)
+    
+    if not np.isfinite(cost):
+        return float("inf"), [], proven
+    if not cycle:
+        tour = [v - 1 for v in tour[1:]]
+    return float(cost), order[tour].tolist(), proven
+
+def find_hamiltonian_path(graph: Union[Graph, CSRGraph], cycle: bool = False,
+                          time_budget: Optional[float] = None) -> Optional[List[int]]:
+    """A Hamiltonian path (or cycle) of the graph, or None if there is none (or none was found in time)."""
+    weights = np.where(np.isfinite(distance_matrix(graph)), 1.0, np.inf)
+    _, order, _ = solve_tsp(weights, cycle=cycle, time_budget=time_budget)
+    return order or None
+
+def benchmark_tsp(time_budget: float = 10.0):
+    """Backtracking vs. Held-Karp, branch and bound and local search on random points."""
+    def backtracking_tsp(weights):
+        # The textbook approach: extend a path vertex by vertex, undo at dead ends.
+        n = len(weights)
+        best = [float("inf"), None]
+        path, visited = [0], [False] * n
+        visited[0] = True
+        def extend(cost):
+            if cost >= best[0]:
+                return
+            if len(path) == n:
+                if cost + weights[path[-1]][0] < best[0]:
+                    best[0], best[1] = cost + weights[path[-1]][0], list(path)
+                return
+            for v in range(1, n):
+                if not visited[v]:
+                    visited[v] = True
+                    path.append(v)
+                    extend(cost + weights[path[-2]][v])
+                    path.pop()
+                    visited[v] = False
+        extend(0.0)
+        return best[0], best[1]
+    
+    def random_points(n, seed=0):
+        points = np.random.default_rng(seed).random((n, 2))
+        return np.sqrt(((points[:, None] - points[None]) ** 2).sum(axis=2))
+    
+    print(f"{'n':>5} {'method':<18} {'cost':>10} {'optimal':>8} {'time (s)':>9}")
+    for n in (10, 11, 12):
+        weights = random_points(n)
+        (cost, _), elapsed = benchmark_algorithm(lambda g: backtracking_tsp(weights.tolist()), None)
+        print(f"{n:>5} {'backtracking':<18} {cost:>10.4f} {'yes':>8} {elapsed:>9.3f}")
+        (cost, _, _), elapsed = benchmark_algorithm(lambda g: solve_tsp(weights, method="held-karp"), None)
+        print(f"{n:>5} {'held-karp':<18} {cost:>10.4f} {'yes':>8} {elapsed:>9.3f}")
+    for n in (16, 20):
+        weights = random_points(n)
+        (cost, _, _), elapsed = benchmark_algorithm(lambda g: solve_tsp(weights, method="held-karp"), None)
+        print(f"{n:>5} {'held-karp':<18} {cost:>10.4f} {'yes':>8} {elapsed:>9.3f}")
+    for n, method in [(14, "branch-and-bound"), (30, "auto"), (200, "local-search"), (1000, "local-search")]:
+        weights = random_points(n)
+        (cost, _, proven), elapsed = benchmark_algorithm(
+            lambda g: solve_tsp(weights, time_budget=time_budget, method=method), None)
+        print(f"{n:>5} {method:<18} {cost:>10.4f} {'yes' if proven else 'no':>8} {elapsed:>9.3f}")
+
+# Eulerian paths in multigraphs
+# -----------------------------
+# Hierholzer's algorithm (1873) walks unused edges until it gets stuck, which can only
+# happen at the end of the path, then backs up to the last vertex that still has unused
+# edges and splices in a detour from there. Written recursively it needs one stack
+# frame per edge, and removing each used edge from a Python list is O(degree). This
+# version keeps the walk on an explicit stack and gives every vertex a cursor into its
+# CSR edge slice, so each edge is looked at a constant number of times: O(V + E).
+# Undirected edges are stored in both endpoints' slices under one edge id, and a used
+# flag makes the second copy get skipped. Typical inputs are de Bruijn graphs in genome
+# assembly: vertices are (k-1)-mers, every k-mer of the reads is an edge, and an
+# Eulerian path spells the sequence.
+
+def _eulerian_edges(graph: Union[Graph, CSRGraph, Tuple[np.ndarray, np.ndarray]],
+                    directed: bool) -> Tuple[np.ndarray, np.ndarray, int, bool]:
+    """Edge arrays (one entry per undirected edge), vertex count and directedness of the input."""
+    if isinstance(graph, Graph):
+        graph = CSRGraph.from_graph(graph)
+    if isinstance(graph, CSRGraph):
+        sources, targets = graph.sources(), graph.indices.astype(np.int64)
+        if not graph.directed:
+            # Both directions are stored; keep u < v, and every other copy of a self-loop.
+            loops = sources == targets
+            loop_copy = np.cumsum(loops) % 2 == 1
+            keep = (sources < targets) | (loops & loop_copy)
+            sources, targets = sources[keep], targets[keep]
+        return sources, targets, graph.num_vertices, graph.directed
+    sources, targets = (np.asarray(array, dtype=np.int64) for array in graph)
+    num_vertices = int(max(sources.max(), targets.max())) + 1 if len(sources) else 0
+    return sources, targets, num_vertices, directed
+
+def _eulerian_degree_start(sources: np.ndarray, targets: np.ndarray, num_vertices: int, directed: bool,
+                           circuit: bool) -> Optional[int]:
+    """The start vertex the degrees force (or the lowest non-isolated one); None if the degrees rule it out."""
+    out_degrees = np.bincount(sources, minlength=num_vertices)
+    in_degrees = np.bincount(targets, minlength=num_vertices)
+    if directed:
+        balance = out_degrees - in_degrees
+        unbalanced = np.flatnonzero(balance)
+        if len(unbalanced) == 0:
+            return int(sources.min())
+        if circuit or len(unbalanced) != 2 or sorted(balance[unbalanced].tolist()) != [-1, 1]:
+            return None
+        return int(unbalanced[balance[unbalanced] == 1][0])
+    odd = np.flatnonzero((out_degrees + in_degrees) % 2)
+    if len(odd) == 0:
+        return int(min(sources.min(), targets.min()))
+    if circuit or len(odd) != 2:
+        return None
+    return int(odd[0])
+
+def eulerian_start(graph: Union[Graph, CSRGraph, Tuple[np.ndarray, np.ndarray]], directed: bool = True,
+                   circuit: bool = False) -> Optional[int]:
+    """
+    Existence check: the vertex an Eulerian path (or circuit) can start at, or None.
+    
+    A path exists when the degrees allow it (every vertex balanced, or one extra out-edge
+    at the start and one extra in-edge at the end; for undirected graphs zero or two
+    odd-degree vertices) and all edges lie in one weakly connected component. O(V + E)
+    
+    Args:
+    graph: A Graph, CSRGraph or (sources, targets) pair of edge arrays
+    directed (bool): Whether a (sources, targets) pair is directed
+    circuit (bool): Require the path to end where it started
+    """
+    sources, targets, num_vertices, directed = _eulerian_edges(graph, directed)
+    if len(sources) == 0:
+        return None
+    start = _eulerian_degree_start(sources, targets, num_vertices, directed, circuit)
+    if start is None:
+        return None
+    # The edges form one component iff a spanning forest of the touched vertices is a tree.
+    # Borůvka needs O(log V) array passes where a BFS needs one per level (E on a path).
+    touched = np.count_nonzero(np.bincount(sources, minlength=num_vertices) + np.bincount(targets, minlength=num_vertices))
+    forest = boruvka_mst_arrays(sources, targets, np.zeros(len(sources)), num_vertices)
+    return start if len(forest) == touched - 1 else None
+
+def eulerian_path(graph: Union[Graph, CSRGraph, Tuple[np.ndarray, np.ndarray]], directed: bool = True,
+                  circuit: bool = False, start: Optional[int] = None,
+                  return_edges: bool = False) -> Optional[Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]]:
+    """
+    An Eulerian path (every edge exactly once) by iterative Hierholzer, for multigraphs
+    with parallel edges and self-loops.
+    
+    Args:
+    graph: A Graph, CSRGraph or (sources, targets) pair of edge arrays
+    directed (bool): Whether a (sources, targets) pair is directed
+    circuit (bool): Require the path to end where it started
+    start (int): Start vertex when the path is a circuit (otherwise the degrees fix it)
+    return_edges (bool): Also return the edge ids in path order (indices into the
+                         edge arrays; parallel edges can carry different labels)
+    
+    Returns:
+    The E + 1 vertices of the path (and the E edge ids), or None if there is no
+    Eulerian path. Time: O(V + E)
+    """
+    sources, targets, num_vertices, directed = _eulerian_edges(graph, directed)
+    num_edges = len(sources)
+    if num_edges == 0:
+        return None
+    forced = _eulerian_degree_start(sources, targets, num_vertices, directed, circuit)
+    if forced is None:
+        return None
+    if start is not None and not 0 <= start < num_vertices:
+        raise ValueError(f"start vertex {start} out of range")
+    if start is None or _eulerian_degree_start(sources, targets, num_vertices, directed, True) is None:
+        start = forced  # only a circuit can start anywhere
+    
+    edge_ids = np.arange(num_edges)
+    if directed:
+        tails, heads, ids = sources, targets, edge_ids
+    else:
+        tails = np.concatenate((sources, targets))
+        heads = np.concatenate((targets, sources))
+        ids = np.concatenate((edge_ids, edge_ids))
+    order = np.argsort(tails, kind="stable")
+    indptr = np.zeros(num_vertices + 1, dtype=np.int64)
+    np.cumsum(np.bincount(tails, minlength=num_vertices), out=indptr[1:])
+    if indptr[start + 1] == indptr[start]:
+        return None
+    heads, ids = heads[order].tolist(), ids[order].tolist()
+    cursor, end = indptr[:-1].tolist(), indptr[1:].tolist()
+    used = bytearray(num_edges)
+    
+    stack, stack_edges = [start], [-1]
+    path, path_edges = [], []
+    while stack:
+        v = stack[-1]
+        i = cursor[v]
+        if not directed:
+            while i < end[v] and used[ids[i]]:
+                i += 1
+        if i < end[v]:
+            cursor[v] = i + 1
+            used[ids[i]] = 1
+            stack.append(heads[i])
+            stack_edges.append(ids[i])
+        else:
+            cursor[v] = i
+            path.append(stack.pop())
+            path_edges.append(stack_edges.pop())
+    if len(path) != num_edges + 1:
+        return None  # some edges are not connected to the start
+    vertices = np.array(path[::-1], dtype=np.int64)
+    if return_edges:
+        return vertices, np.array(path_edges[-2::-1], dtype=np.int64)
+    return vertices
+
+def de_bruijn_edges(sequence: str, k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The de Bruijn graph of a DNA sequence: one edge per k-mer, from its first to its last
+    (k - 1)-mer. Returns (sources, targets, node_codes) with nodes numbered 0..n-1 and
+    node_codes the 2-bit packed (k - 1)-mer of each node (k <= 32).
+    """
+    codes = np.frombuffer(sequence.encode(), dtype=np.uint8)
+    bases = np.full(256, 255, dtype=np.uint8)
+    bases[np.frombuffer(b"ACGT", dtype=np.uint8)] = np.arange(4, dtype=np.uint8)
+    digits = bases[codes].astype(np.uint64)
+    if (digits == 255).any():
+        raise ValueError("sequence must only contain A, C, G and T")
+    if not 2 <= k <= 32 or len(digits) < k:
+        raise ValueError("need 2 <= k <= 32 and at least k bases")
+    num_kmers = len(digits) - k + 2  # (k - 1)-mers
+    packed = np.zeros(num_kmers, dtype=np.uint64)
+    for offset in range(k - 1):
+        packed = (packed << np.uint64(2)) | digits[offset:offset + num_kmers]
+    node_codes, nodes = np.unique(packed, return_inverse=True)
+    return nodes[:-1].astype(np.int64), nodes[1:].astype(np.int64), node_codes
+
+def spell_path(vertices: np.ndarray, node_codes: np.ndarray, k: int) -> str:
+    """The DNA sequence spelled by a path of de Bruijn graph nodes."""
+    codes = node_codes[vertices]
+    first = [(int(codes[0]) >> (2 * (k - 2 - i))) & 3 for i in range(k - 1)]
+    letters = np.frombuffer(b"ACGT", dtype=np.uint8)
+    spelled = np.concatenate((letters[first], letters[(codes[1:] & np.uint64(3)).astype(np.int64)]))
+    return spelled.tobytes().decode()
+
+def benchmark_eulerian_path(genome_length: int = 2_000_000, k: int = 31, recursive_edges: int = 200_000):
+    """Recursive list-based Hierholzer vs. the iterative CSR version, and de Bruijn assembly."""
+    def hierholzer_recursive(adjacency, v, path):
+        # The textbook version: remove each edge from a list and recurse along it.
+        while adjacency[v]:
+            u = adjacency[v].pop(0)
+            hierholzer_recursive(adjacency, u, path)
+        path.append(v)
+    
+    rng = np.random.default_rng(0)
+    for num_edges in (500, recursive_edges):
+        # A random Eulerian digraph: a random closed walk over num_edges // 10 vertices.
+        walk = rng.integers(0, max(num_edges // 10, 2), num_edges)
+        sources, targets = walk, np.roll(walk, -1)
+        adjacency = defaultdict(list)
+        for u, v in zip(sources.tolist(), targets.tolist()):
+            adjacency[u].append(v)
+        path = []
+        start_time = timeit.default_timer()
+        try:
+            hierholzer_recursive(adjacency, int(sources[0]), path)
+            recursive = f"{timeit.default_timer() - start_time:.3f} s"
+        except RecursionError:
+            recursive = "RecursionError"
+        _, elapsed = benchmark_algorithm(lambda g: eulerian_path((sources, targets)), None)
+        print(f"{num_edges:>9,} edges: recursive {recursive}, iterative CSR {elapsed:.3f} s")
+    
+    genome = np.frombuffer(b"ACGT", dtype=np.uint8)[rng.integers(0, 4, genome_length)].tobytes().decode()
+    (sources, targets, node_codes), build_time = benchmark_algorithm(lambda g: de_bruijn_edges(genome, k), None)
+    print(f"de Bruijn graph of a {genome_length:,}-base genome (k={k}): {len(node_codes):,} nodes, "
+          f"{len(sources):,} edges, built in {build_time:.2f} s")
+    start_time = timeit.default_timer()
+    exists = eulerian_start((sources, targets)) is not None
+    check_time = timeit.default_timer() - start_time
+    vertices, path_time = benchmark_algorithm(lambda g: eulerian_path((sources, targets)), None)
+    print(f"Existence check {check_time:.2f} s ({exists}), Eulerian path {path_time:.2f} s, "
+          f"reassembled genome matches: {spell_path(vertices, node_codes, k) == genome}")
+
 # 9. How to Contribute
 # --------------------
 # To contribute to this note sheet:
@@ -618,6 +3583,780 @@ def prim_mst_optimized(graph: Graph) -> List[Tuple[int, int, int]]:
 
 # Your contributions help keep this resource valuable for Python developers at all levels. Thank you for your interest in improving this note sheet!
 
+# Unit Tests
+class TestCSRGraph(unittest.TestCase):
+    def random_graphs(self, rng, n, m, directed, dag=False):
+        """The same random multigraph as a dict-based Graph and as a CSRGraph."""
+        graph = Graph(directed=directed)
+        for v in range(n):
+            graph.graph[v]
+        sources, targets, weights = [], [], []
+        for _ in range(m):
+            u, v = rng.randrange(n), rng.randrange(n)
+            if dag and u >= v:
+                continue
+            sources.append(u)
+            targets.append(v)
+            weights.append(rng.randint(1, 9))
+            graph.add_edge(u, v, weights[-1])
+        return graph, CSRGraph.from_edges(sources, targets, weights, n, directed=directed)
+    
+    def test_matches_dict_graph(self):
+        rng = random.Random(0)
+        for trial, directed in itertools.product(range(20), (True, False)):
+            with self.subTest(trial=trial, directed=directed):
+                graph, csr = self.random_graphs(rng, 25, 40, directed)
+                for u in range(25):
+                    self.assertEqual(csr.neighbors(u).tolist(), [v for v, _ in graph.graph[u]])
+                    self.assertEqual(csr.edge_weights(u).tolist(), [w for _, w in graph.graph[u]])
+                self.assertEqual(sorted(csr.get_edges()), sorted(graph.get_edges()))
+                converted = CSRGraph.from_graph(graph)
+                for name in ("indptr", "indices", "weights"):
+                    np.testing.assert_array_equal(getattr(converted, name), getattr(csr, name))
+                for start in (0, 7, 24):
+                    self.assertEqual(bfs(csr, start), bfs(graph, start))
+                    expected = dijkstra(graph, start)
+                    self.assertEqual(dijkstra(csr, start).tolist(), [expected[v] for v in range(25)])
+                if directed:
+                    components = {frozenset(c) for c in strongly_connected_components(graph)}
+                    self.assertEqual({frozenset(c) for c in strongly_connected_components(csr)}, components)
+    
+    def test_topological_sort(self):
+        rng = random.Random(1)
+        for trial in range(20):
+            graph, csr = self.random_graphs(rng, 30, 60, directed=True, dag=True)
+            order = topological_sort(csr)
+            self.assertEqual(order, topological_sort(graph))
+            position = {v: i for i, v in enumerate(order)}
+            self.assertEqual(sorted(order), list(range(30)))
+            for u, v, _ in csr.get_edges():
+                self.assertLess(position[u], position[v])
+    
+    def test_immutable_and_save_load(self):
+        import tempfile
+        _, csr = self.random_graphs(random.Random(2), 50, 120, directed=False)
+        with self.assertRaises(ValueError):
+            csr.indices[0] = 1
+        transposed = CSRGraph.from_edges([0, 0, 2], [1, 2, 1], [1.0, 2.0, 3.0]).transpose()
+        self.assertEqual([transposed.neighbors(u).tolist() for u in range(3)], [[], [0, 2], [0]])
+        with tempfile.TemporaryDirectory() as directory:
+            csr.save(directory)
+            for mmap in (True, False):
+                loaded = CSRGraph.load(directory, mmap=mmap)
+                self.assertFalse(loaded.directed)
+                for name in ("indptr", "indices", "weights"):
+                    np.testing.assert_array_equal(getattr(loaded, name), getattr(csr, name))
+                self.assertEqual(bfs(loaded, 0), bfs(csr, 0))
+                del loaded
+    
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            CSRGraph.from_edges([0, -1], [1, 0])
+        with self.assertRaises(ValueError):
+            CSRGraph.from_edges([0, 3], [1, 0], num_vertices=3)
+        with self.assertRaises(ValueError):
+            CSRGraph.from_edges([0], [1, 2])
+        named = Graph()
+        named.add_edge("a", "b")
+        with self.assertRaises(ValueError):
+            CSRGraph.from_graph(named)
+
+class TestFrontierBFS(unittest.TestCase):
+    def hop_distances(self, graph, sources):
+        distances = [-1] * graph.num_vertices
+        queue = deque()
+        for source in sources:
+            distances[source] = 0
+            queue.append(source)
+        while queue:
+            vertex = queue.popleft()
+            for neighbor in graph.neighbors(vertex).tolist():
+                if distances[neighbor] < 0:
+                    distances[neighbor] = distances[vertex] + 1
+                    queue.append(neighbor)
+        return distances
+    
+    def test_matches_queue_bfs(self):
+        rng = np.random.default_rng(0)
+        settings = [("top-down", {}), ("bottom-up", {}), ("auto", {}),
+                    ("auto", {"alpha": 1e6, "beta": 1.5})]  # switches direction every few levels
+        for trial, directed in itertools.product(range(10), (True, False)):
+            n, m = [(60, 70), (300, 900)][trial % 2]
+            graph = CSRGraph.from_edges(rng.integers(0, n, m), rng.integers(0, n, m), num_vertices=n,
+                                        directed=directed)
+            for sources in ([0], [3, 3, 17], list(range(0, n, 25))):
+                expected = self.hop_distances(graph, sorted(set(sources)))
+                for direction, thresholds in settings:
+                    with self.subTest(trial=trial, directed=directed, sources=sources, direction=direction):
+                        distances, parents = bfs_frontier(graph, sources, direction, **thresholds)
+                        self.assertEqual(distances.tolist(), expected)
+                        for v in range(n):
+                            path = path_from_parents(parents, v)
+                            if expected[v] < 0:
+                                self.assertEqual((parents[v], path), (-1, []))
+                                continue
+                            self.assertEqual(len(path), expected[v] + 1)
+                            self.assertIn(path[0], sources)
+                            for u, w in zip(path, path[1:]):
+                                self.assertIn(w, graph.neighbors(u).tolist())
+    
+    def test_scalar_source_and_bad_direction(self):
+        graph = CSRGraph.from_edges([0, 1, 2], [1, 2, 3], directed=False)
+        distances, parents = bfs_frontier(graph, 2)
+        self.assertEqual(distances.tolist(), [2, 1, 0, 1])
+        self.assertEqual(parents[2], 2)
+        with self.assertRaises(ValueError):
+            bfs_frontier(graph, 0, direction="sideways")
+
+class TestPointToPointSearch(unittest.TestCase):
+    def path_length(self, graph, path):
+        total = 0.0
+        for u, v in zip(path, path[1:]):
+            lo, hi = graph.indptr[u], graph.indptr[u + 1]
+            parallel = graph.weights[lo:hi][graph.indices[lo:hi] == v]
+            self.assertGreater(len(parallel), 0, f"{u} -> {v} is not an edge")
+            total += parallel.min()
+        return total
+    
+    def check_queries(self, graph, queries, heuristics):
+        search = PointToPointSearch(graph)  # reused, so stale entries from older queries must be ignored
+        for source, target in queries:
+            expected = dijkstra(graph, source)[target]
+            results = [search.dijkstra(source, target), search.bidirectional_dijkstra(source, target)]
+            results += [search.astar(source, target, heuristic) for heuristic in heuristics]
+            for distance, path in results:
+                if np.isinf(expected):
+                    self.assertEqual((distance, path), (float('infinity'), []))
+                    continue
+                self.assertAlmostEqual(distance, expected)
+                self.assertEqual((path[0], path[-1]), (source, target))
+                self.assertAlmostEqual(self.path_length(graph, path), expected)
+    
+    def test_random_graphs(self):
+        rng = np.random.default_rng(0)
+        for trial, directed in itertools.product(range(6), (True, False)):
+            with self.subTest(trial=trial, directed=directed):
+                n, m = 40, 70 if directed else 45
+                graph = CSRGraph.from_edges(rng.integers(0, n, m), rng.integers(0, n, m),
+                                            rng.integers(1, 10, m).astype(float), n, directed=directed)
+                queries = [(s, t) for s in range(0, n, 3) for t in range(n)]
+                self.check_queries(graph, queries, [landmark_heuristic(graph, num_landmarks=3, seed=trial)])
+    
+    def test_road_network(self):
+        graph, coordinates = generate_road_network(12, 9, seed=1)
+        rng = np.random.default_rng(1)
+        queries = rng.integers(0, graph.num_vertices, (60, 2)).tolist() + [[5, 5]]
+        self.check_queries(graph, queries, [euclidean_heuristic(coordinates), landmark_heuristic(graph, 4)])
+
+class TestSCC(unittest.TestCase):
+    def random_graph(self, rng, n, m, directed=True):
+        graph = Graph(directed=directed)
+        for v in range(n):
+            graph.graph[v]
+        for _ in range(m):
+            graph.add_edge(rng.randrange(n), rng.randrange(n), rng.randint(1, 9))
+        return graph
+    
+    def assertCycle(self, graph, cycle):
+        """cycle is closed and uses each edge at most as often as the graph has it."""
+        self.assertGreater(len(cycle), 1)
+        self.assertEqual(cycle[0], cycle[-1])
+        key = (lambda u, v: (u, v)) if graph.directed else (lambda u, v: frozenset((u, v)))
+        available = Counter(key(u, v) for u, v, _ in graph.get_edges())
+        used = Counter(key(u, v) for u, v in zip(cycle, cycle[1:]))
+        for edge, count in used.items():
+            self.assertLessEqual(count, available[edge], f"{set(edge)} used {count} times")
+    
+    def test_tarjan_and_condensation(self):
+        rng = random.Random(0)
+        for trial in range(30):
+            with self.subTest(trial=trial):
+                graph = self.random_graph(rng, 25, rng.randint(10, 60))
+                csr = CSRGraph.from_graph(graph)
+                count, labels = tarjan_scc(csr)
+                expected = {frozenset(c) for c in strongly_connected_components(graph)}
+                components = defaultdict(set)
+                for v, label in enumerate(labels.tolist()):
+                    components[label].add(v)
+                self.assertEqual(sorted(components), list(range(count)))
+                self.assertEqual({frozenset(c) for c in components.values()}, expected)
+                for u, v, _ in graph.get_edges():
+                    self.assertGreaterEqual(labels[u], labels[v])
+                
+                dag, dag_labels = condensation(csr)
+                self.assertEqual(dag.num_vertices, count)
+                self.assertTrue((dag_labels == count - 1 - labels).all())
+                cheapest = {}
+                for u, v, w in graph.get_edges():
+                    a, b = int(dag_labels[u]), int(dag_labels[v])
+                    if a != b:
+                        cheapest[a, b] = min(w, cheapest.get((a, b), w))
+                self.assertEqual(sorted((u, v, w) for u, v, w in dag.get_edges()),
+                                 sorted((a, b, w) for (a, b), w in cheapest.items()))
+                self.assertTrue(all(u < v for u, v, _ in dag.get_edges()))
+    
+    def test_find_cycle(self):
+        rng = random.Random(1)
+        for trial, directed in itertools.product(range(40), (True, False)):
+            with self.subTest(trial=trial, directed=directed):
+                graph = self.random_graph(rng, 15, rng.randint(0, 20), directed)
+                csr = CSRGraph.from_graph(graph)
+                cycle = find_cycle(csr)
+                if directed:
+                    exists = has_cycle(graph)
+                else:
+                    exists = len(graph.get_edges()) > 15 - len(strongly_connected_components(csr))
+                self.assertEqual(bool(cycle), exists)
+                self.assertEqual(has_cycle(csr), exists)
+                if exists:
+                    self.assertCycle(graph, cycle)
+    
+    def test_undirected_trees_and_multi_edges(self):
+        tree = CSRGraph.from_edges([0, 1, 1], [1, 2, 3], directed=False)
+        self.assertEqual(find_cycle(tree), [])
+        self.assertFalse(has_cycle(tree))
+        self.assertEqual(find_cycle(CSRGraph.from_edges([0, 1, 0], [1, 2, 1], directed=False)), [0, 1, 0])
+        self.assertEqual(find_cycle(CSRGraph.from_edges([0, 1], [1, 1], directed=False)), [1, 1])
+    
+    def test_deep_chain(self):
+        n = 20_000  # far past the recursion limit
+        sources = np.arange(n)
+        chain = CSRGraph.from_edges(sources[:-1], sources[1:], num_vertices=n)
+        self.assertEqual(find_cycle(chain), [])
+        self.assertEqual(tarjan_scc(chain)[0], n)
+        looped = CSRGraph.from_edges(sources, (sources + 1) % n)
+        self.assertEqual(tarjan_scc(looped)[0], 1)
+        self.assertEqual(len(find_cycle(looped)), n + 1)
+
+class TestRandomWalks(unittest.TestCase):
+    def alias_distribution(self, indptr, prob, alias):
+        # Each slot is picked with probability 1/n and keeps prob of it, the rest goes to its alias.
+        segment = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        share = 1.0 / np.diff(indptr)[segment]
+        return (np.bincount(np.arange(len(prob)), prob * share, len(prob))
+                + np.bincount(alias, (1 - prob) * share, len(prob)))
+    
+    def assertAliasMatches(self, indptr, weights):
+        prob, alias = build_alias_tables(indptr, weights)
+        segment = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        self.assertTrue(np.all((alias >= indptr[segment]) & (alias < indptr[segment + 1])))
+        totals = np.bincount(segment, weights, len(indptr) - 1)[segment]
+        expected = weights / np.where(totals > 0, totals, 1)
+        np.testing.assert_allclose(self.alias_distribution(indptr, prob, alias)[totals > 0],
+                                   expected[totals > 0], atol=1e-9)
+    
+    def test_alias_tables_with_ties(self):
+        self.assertAliasMatches(np.array([0, 5]), np.array([2.0, 1, 4, 4, 4]))
+        rng = np.random.default_rng(0)
+        indptr = np.concatenate(([0], np.cumsum(rng.integers(1, 12, 500))))
+        self.assertAliasMatches(indptr, rng.integers(1, 5, indptr[-1]).astype(float))
+        self.assertAliasMatches(indptr, rng.choice([0.5, 1.0, 2.0], indptr[-1]))
+        self.assertAliasMatches(indptr, rng.random(indptr[-1]))
+    
+    def test_node2vec_tables(self):
+        rng = np.random.default_rng(1)
+        graph = CSRGraph.from_edges(rng.integers(0, 100, 1000), rng.integers(0, 100, 1000), directed=False)
+        sources = graph.sources()
+        arcs = set(zip(sources.tolist(), graph.indices.tolist()))
+        for p, q in [(0.5, 2.0), (2.0, 0.5)]:
+            with self.subTest(p=p, q=q):
+                walker = RandomWalker(graph, p, q)
+                # Rebuild each arc's biased weights one entry at a time.
+                weights = []
+                for t, v in zip(sources.tolist(), graph.indices.tolist()):
+                    for x in graph.indices[graph.indptr[v]:graph.indptr[v + 1]].tolist():
+                        weights.append(1 / p if x == t else 1.0 if (t, x) in arcs else 1 / q)
+                self.assertAliasMatches(walker._table_ptr, np.array(weights))
+    
+    def test_simple_node2vec_with_non_integer_vertices(self):
+        graph = Graph()
+        for u, v in [("a", "b"), ("b", "c"), (("x", 1), "a")]:
+            graph.add_edge(u, v)
+        embeddings = simple_node2vec(graph, dimensions=4, p=0.5, q=2.0)
+        self.assertEqual(set(embeddings), {"a", "b", "c", ("x", 1)})
+
+class TestFlowNetwork(unittest.TestCase):
+    # (u, v, capacity, cost); 1 -> 2 has a negative cost.
+    EDGES = [(0, 1, 4, 2), (0, 2, 3, 4), (1, 2, 2, -1), (1, 3, 3, 3),
+             (2, 4, 5, 1), (3, 5, 4, 1), (4, 3, 2, 1), (4, 5, 3, 2)]
+    
+    def network(self, num_vertices: int = 6) -> FlowNetwork:
+        network = FlowNetwork(num_vertices)
+        for u, v, capacity, cost in self.EDGES:
+            network.add_edge(u, v, capacity, cost)
+        return network
+    
+    def assertConserved(self, network, source, sink, value):
+        sources, targets, capacities = network.edges()
+        flows = network.flows()
+        self.assertTrue(np.all((flows >= 0) & (flows <= capacities)))
+        net = np.bincount(sources, flows, network.num_vertices) - np.bincount(targets, flows, network.num_vertices)
+        expected = np.zeros(network.num_vertices)
+        expected[[source, sink]] = value, -value
+        np.testing.assert_array_equal(net, expected)
+    
+    def test_max_flow_and_min_cut(self):
+        for method in ("dinic", "push-relabel"):
+            with self.subTest(method=method):
+                network = self.network()
+                self.assertEqual(network.max_flow(0, 5, method=method), 7)
+                self.assertConserved(network, 0, 5, 7)
+                side, cut = network.min_cut(0)
+                self.assertTrue(side[0] and not side[5])
+                self.assertEqual(network.edges()[2][cut].sum(), 7)
+    
+    def test_min_cost_flow(self):
+        network = self.network()
+        self.assertEqual(network.min_cost_flow(0, 5), (7, 41))
+        self.assertConserved(network, 0, 5, 7)
+        network.reset()
+        self.assertEqual(network.min_cost_flow(0, 5, max_flow=3), (3, 14))
+        self.assertConserved(network, 0, 5, 3)
+    
+    def test_negative_cycles(self):
+        network = self.network(8)
+        # Unreachable from the source: not detected, and the s-t answer is unchanged.
+        network.add_edge(6, 7, 1, -5)
+        network.add_edge(7, 6, 1, 1)
+        self.assertEqual(network.min_cost_flow(0, 5), (7, 41))
+        network = self.network()
+        network.add_edge(2, 1, 1, 0)  # closes 1 -> 2 -> 1 at cost -1
+        with self.assertRaises(ValueError):
+            network.min_cost_flow(0, 5)
+
+class TestDynamicDAG(unittest.TestCase):
+    def assertTopological(self, dag, edges):
+        position = {node: i for i, node in enumerate(dag.order())}
+        self.assertEqual(len(position), len(dag))
+        for u, v in edges:
+            self.assertLess(position[u], position[v])
+    
+    def test_random_inserts_keep_order_valid(self):
+        rng = random.Random(0)
+        rank = list(range(60))
+        rng.shuffle(rank)
+        dag = DynamicDAG()
+        edges = []
+        for _ in range(400):
+            a, b = rng.sample(range(60), 2)
+            edge = (a, b) if rank[a] < rank[b] else (b, a)
+            dag.add_edge(*edge)
+            edges.append(edge)
+            self.assertTopological(dag, edges)
+    
+    def test_cycle_is_rejected_without_changes(self):
+        dag = DynamicDAG()
+        for u, v in [(0, 1), (1, 2), (2, 3), (4, 1)]:
+            dag.add_edge(u, v)
+        before = dag.order()
+        for u, v in [(3, 0), (2, 1), (3, 4), (2, 2)]:
+            with self.subTest(edge=(u, v)):
+                with self.assertRaises(ValueError):
+                    dag.add_edge(u, v)
+                self.assertEqual(dag.order(), before)
+                self.assertNotIn(v, dag.successors[u])
+        dag.add_edge(3, 5)
+        self.assertTopological(dag, [(0, 1), (1, 2), (2, 3), (4, 1), (3, 5)])
+    
+    def test_affected_by(self):
+        dag = DynamicDAG()
+        for u, v in [("a", "b"), ("b", "c"), ("a", "d"), ("e", "c")]:
+            dag.add_edge(u, v)
+        self.assertEqual(set(dag.affected_by("a")), {"b", "c", "d"})
+        position = {node: i for i, node in enumerate(dag.order())}
+        affected = dag.affected_by("a")
+        self.assertEqual(affected, sorted(affected, key=position.__getitem__))
+        self.assertEqual(dag.affected_by("c"), [])
+        with self.assertRaises(KeyError):
+            dag.affected_by("z")
+
+class TestFriendRecommendationIndex(unittest.TestCase):
+    def brute_force(self, friends, user, k):
+        counts = defaultdict(int)
+        for friend in friends[user]:
+            for candidate in friends[friend]:
+                if candidate != user and candidate not in friends[user]:
+                    counts[candidate] += 1
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:k]
+    
+    def test_build_and_incremental_inserts(self):
+        rng = random.Random(0)
+        friends = defaultdict(set)
+        graph = Graph()
+        for _ in range(150):
+            u, v = rng.sample(range(40), 2)
+            graph.add_edge(u, v)  # repeats are deliberate: duplicates must not inflate counts
+            friends[u].add(v)
+            friends[v].add(u)
+        for batch_size, processes in [(1, 1), (7, 2), (10_000, 1)]:
+            with self.subTest(batch_size=batch_size, processes=processes):
+                index = FriendRecommendationIndex.build(graph, k=4, batch_size=batch_size, processes=processes)
+                for user in range(40):
+                    self.assertEqual(index.recommend(user), self.brute_force(friends, user, 4))
+        # Inserts, including friendships that bring in users 40..44.
+        for step in range(60):
+            u, v = rng.sample(range(45 if step % 3 else 40), 2)
+            index.add_friendship(u, v)
+            friends[u].add(v)
+            friends[v].add(u)
+            for user in range(45):
+                self.assertEqual(index.recommend(user), self.brute_force(friends, user, 4), (step, user))
+    
+    def test_social_network_methods(self):
+        network = SocialNetwork()
+        for u, v in [(1, 2), (1, 3), (2, 4), (3, 4), (4, 5)]:
+            network.add_friendship(u, v)
+        self.assertEqual(network.recommend_friends(1), [(2, 1), (3, 1), (4, 2), (5, 3)])
+        with self.assertRaises(RuntimeError):
+            network.recommend_mutual_friends(1)
+        network.build_recommendation_index()
+        self.assertEqual(network.recommend_friends(1), [(2, 1), (3, 1), (4, 2), (5, 3)])
+        self.assertEqual(network.recommend_mutual_friends(1), [(4, 2)])
+
+class TestFloydWarshallMatrix(unittest.TestCase):
+    def random_graph(self, rng, n, m, directed=True):
+        # w(u, v) = c + h[u] - h[v] with c >= 0 gives negative edges but no negative cycle.
+        h = [rng.randint(0, 8) for _ in range(n)]
+        graph = Graph(directed=directed)
+        for v in range(n):
+            graph.graph[v]
+        for u, v in rng.sample([(u, v) for u in range(n) for v in range(n) if u < v or directed and u != v], m):
+            graph.add_edge(u, v, rng.randint(0, 9) + (h[u] - h[v] if directed else 0))
+        return graph
+    
+    def test_matches_dict_floyd_warshall(self):
+        rng = random.Random(0)
+        for trial, directed in itertools.product(range(8), (True, False)):
+            graph = self.random_graph(rng, 17, 40, directed)
+            expected = floyd_warshall(graph)
+            for source in (graph, CSRGraph.from_graph(graph), distance_matrix(graph)):
+                for block_size in (None, 1, 4, 128):
+                    with self.subTest(trial=trial, directed=directed, source=type(source).__name__,
+                                      block_size=block_size):
+                        original = source.copy() if isinstance(source, np.ndarray) else None
+                        dist, pred = floyd_warshall_matrix(source, block_size=block_size)
+                        if original is not None:
+                            np.testing.assert_array_equal(source, original)
+                        for (u, v), distance in expected.items():
+                            self.assertEqual(dist[u, v], distance)
+                            path = reconstruct_path(pred, u, v)
+                            if np.isinf(distance):
+                                self.assertEqual(path, [])
+                                continue
+                            self.assertEqual((path[0], path[-1]), (u, v))
+                            weights = [min(w for x, w in graph.graph[a] if x == b) for a, b in zip(path, path[1:])]
+                            self.assertEqual(sum(weights), distance)
+    
+    def test_negative_cycles(self):
+        graph = Graph(directed=True)
+        for u, v, w in [(0, 1, 1), (1, 2, -2), (2, 1, 1), (2, 3, 1), (4, 0, 1)]:
+            graph.add_edge(u, v, w)
+        with self.assertRaises(ValueError):
+            floyd_warshall_matrix(graph)
+        dist, pred = floyd_warshall_matrix(graph, block_size=2, check_negative_cycles=False)
+        self.assertEqual(negative_cycle_vertices(dist).tolist(), [1, 2])
+        self.assertEqual(dist[3, 0], np.inf)
+        with self.assertRaises(ValueError):
+            reconstruct_path(pred, 0, 3)
+
+class TestBoruvkaMST(unittest.TestCase):
+    def assertSpanningForest(self, graph, forest, expected):
+        edges = Counter((min(u, v), max(u, v), w) for u, v, w in graph.get_edges())
+        parent = list(range(max(graph.get_vertices()) + 1))
+        def find(v):
+            while parent[v] != v:
+                v = parent[v]
+            return v
+        for u, v, w in forest:
+            self.assertGreater(edges[min(u, v), max(u, v), w], 0, f"({u}, {v}, {w}) is not an edge")
+            edges[min(u, v), max(u, v), w] -= 1
+            self.assertNotEqual(find(u), find(v), "forest contains a cycle")
+            parent[find(u)] = find(v)
+        self.assertEqual(len(forest), len(expected))
+        self.assertEqual(sum(w for _, _, w in forest), sum(w for _, _, w in expected))
+    
+    def test_matches_kruskal(self):
+        rng = random.Random(0)
+        for trial in range(40):
+            # Few distinct weights force many ties; sparse trials leave the graph disconnected.
+            n, m = rng.randint(1, 30), rng.randint(0, 60)
+            graph = Graph()
+            for v in range(n):
+                graph.graph[v]
+            for _ in range(m):
+                graph.add_edge(rng.randrange(n), rng.randrange(n), rng.randint(1, 3 if trial % 2 else 100))
+            expected = kruskal_mst(graph)
+            with self.subTest(trial=trial):
+                self.assertSpanningForest(graph, boruvka_mst(graph), expected)
+                self.assertSpanningForest(graph, boruvka_mst(CSRGraph.from_graph(graph)), expected)
+    
+    def test_edge_arrays(self):
+        # A 4-cycle with equal weights plus a parallel cheaper edge and an isolated vertex.
+        sources, targets = np.array([0, 1, 2, 3, 0]), np.array([1, 2, 3, 0, 1])
+        forest = boruvka_mst_arrays(sources, targets, np.array([1.0, 1.0, 1.0, 1.0, 0.5]), 5)
+        self.assertEqual(len(forest), 3)
+        self.assertIn(4, forest.tolist())
+        self.assertEqual(len(boruvka_mst_arrays(sources[:0], targets[:0], np.empty(0), 3)), 0)
+
+class TestBellmanFord(unittest.TestCase):
+    def random_graph(self, rng, n, m, low, high):
+        graph = Graph(directed=True)
+        for v in range(n):
+            graph.graph[v]
+        for u, v in rng.sample([(u, v) for u in range(n) for v in range(n) if u != v], m):
+            graph.add_edge(u, v, rng.randint(low, high))
+        return graph
+    
+    def assertNegativeCycle(self, graph, cycle):
+        self.assertGreater(len(cycle), 2)
+        self.assertEqual(cycle[0], cycle[-1])
+        weights = {(u, v): w for u, v, w in graph.get_edges()}
+        for u, v in zip(cycle, cycle[1:]):
+            self.assertIn((u, v), weights)
+        self.assertLess(sum(weights[u, v] for u, v in zip(cycle, cycle[1:])), 0)
+    
+    def test_distances_without_negative_cycles(self):
+        rng = random.Random(0)
+        for trial in range(30):
+            # w(u, v) = c + h[u] - h[v] with c >= 0: some edges are negative, but every
+            # cycle sums to its c's, so none is negative.
+            h = [rng.randint(0, 10) for _ in range(12)]
+            graph = Graph(directed=True)
+            for v in range(12):
+                graph.graph[v]
+            for _ in range(40):
+                u, v = rng.sample(range(12), 2)
+                graph.add_edge(u, v, rng.randint(0, 5) + h[u] - h[v])
+            expected = bellman_ford(graph, 0)
+            for method in ("vectorized", "spfa"):
+                with self.subTest(trial=trial, method=method):
+                    distances, pred, cycle = bellman_ford_vectorized(graph, 0, method)
+                    self.assertEqual(cycle, [])
+                    self.assertEqual(distances.tolist(), [expected[v] for v in range(12)])
+                    for v in range(1, 12):
+                        if np.isfinite(distances[v]):
+                            self.assertTrue(any(t == v and distances[int(pred[v])] + w == distances[v]
+                                                for t, w in graph.graph[int(pred[v])]))
+    
+    def test_negative_cycles(self):
+        rng = random.Random(1)
+        for trial in range(30):
+            graph = self.random_graph(rng, 10, 30, -3, 10)
+            reaches_cycle = False
+            try:
+                expected = bellman_ford(graph, 0)
+            except ValueError:
+                reaches_cycle = True
+            for method in ("vectorized", "spfa"):
+                with self.subTest(trial=trial, method=method):
+                    distances, _, cycle = bellman_ford_vectorized(graph, 0, method)
+                    self.assertEqual(bool(cycle), reaches_cycle)
+                    if cycle:
+                        self.assertNegativeCycle(graph, cycle)
+                    else:
+                        self.assertEqual(distances.tolist(), [expected[v] for v in range(10)])
+                    _, _, any_cycle = bellman_ford_vectorized(graph, None, method)
+                    if reaches_cycle:
+                        self.assertNegativeCycle(graph, any_cycle)
+    
+    def test_unreachable_negative_cycle(self):
+        graph = Graph(directed=True)
+        for u, v, w in [(0, 1, 2), (1, 2, 3), (3, 4, -2), (4, 3, 1)]:
+            graph.add_edge(u, v, w)
+        for method in ("vectorized", "spfa"):
+            with self.subTest(method=method):
+                distances, _, cycle = bellman_ford_vectorized(graph, 0, method)
+                self.assertEqual(cycle, [])
+                self.assertEqual(distances[:3].tolist(), [0, 2, 5])
+                _, _, cycle = bellman_ford_vectorized(graph, None, method)
+                self.assertNegativeCycle(graph, cycle)
+                self.assertEqual(set(cycle), {3, 4})
+
+class TestContractionHierarchy(unittest.TestCase):
+    def assertPath(self, graph, path, source, target, distance):
+        self.assertEqual((path[0], path[-1]), (source, target))
+        total = 0
+        for u, v in zip(path, path[1:]):
+            lo, hi = graph.indptr[u], graph.indptr[u + 1]
+            parallel = graph.weights[lo:hi][graph.indices[lo:hi] == v]
+            self.assertGreater(len(parallel), 0, f"{u} -> {v} is not an edge")
+            total += parallel.min()
+        self.assertEqual(total, distance)
+    
+    def test_queries_match_dijkstra(self):
+        rng = np.random.default_rng(0)
+        for directed in (True, False):
+            for trial in range(5):
+                with self.subTest(directed=directed, trial=trial):
+                    # Sparse enough that some pairs are unreachable.
+                    n, m = 40, 45 if directed else 30
+                    graph = CSRGraph.from_edges(rng.integers(0, n, m), rng.integers(0, n, m),
+                                                rng.integers(1, 10, m), n, directed=directed)
+                    hierarchy = ContractionHierarchy.build(graph, witness_limit=[100, 3][trial % 2])
+                    shortcuts = (hierarchy.forward_middle >= 0).sum() + (hierarchy.backward_middle >= 0).sum()
+                    self.assertGreater(shortcuts, 0)  # so unpacking is exercised
+                    unreachable = 0
+                    for source in range(n):
+                        expected = dijkstra(graph, source)
+                        for target in range(n):
+                            distance, path = hierarchy.query(source, target)
+                            self.assertEqual(distance, expected[target])
+                            if np.isinf(expected[target]):
+                                self.assertEqual(path, [])
+                                unreachable += 1
+                            else:
+                                self.assertPath(graph, path, source, target, distance)
+                    self.assertGreater(unreachable, 0)
+
+class TestTSP(unittest.TestCase):
+    def tour_cost(self, weights, order, cycle):
+        steps = list(zip(order, order[1:] + order[:1])) if cycle else list(zip(order, order[1:]))
+        return sum(weights[u][v] for u, v in steps) if steps else 0.0
+    
+    def brute_force(self, weights, cycle, start):
+        n = len(weights)
+        firsts = [0] if cycle else ([start] if start is not None else range(n))
+        best = float("inf")
+        for first in firsts:
+            for rest in itertools.permutations([v for v in range(n) if v != first]):
+                best = min(best, self.tour_cost(weights, [first, *rest], cycle))
+        return best
+    
+    def random_weights(self, rng, n, symmetric, missing):
+        weights = rng.integers(1, 20, (n, n)).astype(float)
+        if symmetric:
+            weights = np.minimum(weights, weights.T)
+        weights[rng.random((n, n)) < missing] = np.inf
+        if symmetric:
+            weights = np.minimum(weights, weights.T)
+        return weights
+    
+    def test_against_brute_force(self):
+        rng = np.random.default_rng(0)
+        for n in range(2, 8):
+            for symmetric, missing in [(True, 0.0), (False, 0.0), (True, 0.4), (False, 0.5)]:
+                weights = self.random_weights(rng, n, symmetric, missing)
+                modes = [(True, None), (False, None), (False, int(rng.integers(n)))]
+                for (cycle, start), method in itertools.product(modes, ["held-karp", "branch-and-bound",
+                                                                        "local-search"]):
+                    with self.subTest(n=n, symmetric=symmetric, missing=missing, cycle=cycle,
+                                      start=start, method=method):
+                        optimum = self.brute_force(weights, cycle, start)
+                        cost, order, proven = solve_tsp(weights, cycle=cycle, start=start, method=method)
+                        if np.isinf(cost):
+                            self.assertEqual(order, [])
+                            if method != "local-search":
+                                self.assertTrue(np.isinf(optimum))
+                            continue
+                        self.assertEqual(sorted(order), list(range(n)))
+                        if start is not None:
+                            self.assertEqual(order[0], start)
+                        self.assertEqual(cost, self.tour_cost(weights, order, cycle))
+                        if method == "local-search":
+                            self.assertGreaterEqual(cost, optimum)
+                        else:
+                            self.assertEqual(cost, optimum)
+                            self.assertTrue(proven)
+    
+    def test_no_hamiltonian_path(self):
+        star = Graph()
+        for leaf in (1, 2, 3):
+            star.add_edge(0, leaf)
+        self.assertIsNone(find_hamiltonian_path(star))
+        self.assertEqual(len(find_hamiltonian_path(CSRGraph.from_edges([0, 1, 2], [1, 2, 3], directed=False))), 4)
+
+class TestEulerianPath(unittest.TestCase):
+    def brute_force(self, sources, targets, directed, circuit):
+        """Whether some ordering of the edges forms an Eulerian path (circuit), by backtracking."""
+        moves = defaultdict(list)
+        for edge, (u, v) in enumerate(zip(sources, targets)):
+            moves[u].append((edge, v))
+            if not directed and u != v:
+                moves[v].append((edge, u))
+        used = [False] * len(sources)
+        
+        def extend(v, remaining, start):
+            if remaining == 0:
+                return not circuit or v == start
+            for edge, u in moves[v]:
+                if not used[edge]:
+                    used[edge] = True
+                    found = extend(u, remaining - 1, start)
+                    used[edge] = False
+                    if found:
+                        return True
+            return False
+        
+        return any(extend(v, len(sources), v) for v in list(moves))
+    
+    def assertEulerian(self, sources, targets, directed, vertices, edges, circuit=False):
+        self.assertEqual(sorted(edges.tolist()), list(range(len(sources))))
+        self.assertEqual(len(vertices), len(edges) + 1)
+        for step, edge in enumerate(edges):
+            ends = (vertices[step], vertices[step + 1])
+            expected = (sources[edge], targets[edge])
+            self.assertIn(ends, [expected] if directed else [expected, expected[::-1]])
+        if circuit:
+            self.assertEqual(vertices[0], vertices[-1])
+    
+    def test_random_multigraphs_against_brute_force(self):
+        rng = np.random.default_rng(0)
+        for trial in range(300):
+            n, m = int(rng.integers(1, 5)), int(rng.integers(1, 8))
+            sources, targets = rng.integers(0, n, m), rng.integers(0, n, m)
+            for directed, circuit in itertools.product([True, False], [False, True]):
+                with self.subTest(trial=trial, directed=directed, circuit=circuit):
+                    exists = self.brute_force(sources.tolist(), targets.tolist(), directed, circuit)
+                    result = eulerian_path((sources, targets), directed=directed, circuit=circuit,
+                                           return_edges=True)
+                    start = eulerian_start((sources, targets), directed=directed, circuit=circuit)
+                    self.assertEqual(result is not None, exists)
+                    self.assertEqual(start is not None, exists)
+                    if exists:
+                        vertices, edges = result
+                        self.assertEqual(vertices[0], start)
+                        self.assertEulerian(sources, targets, directed, vertices, edges, circuit)
+    
+    def test_parallel_edges_and_self_loops(self):
+        # Undirected: 0-1 doubled, a loop at 1, 1-2 and a doubled loop at 2; 1 and 2 have odd degree.
+        sources, targets = np.array([0, 1, 1, 1, 2, 2]), np.array([1, 0, 1, 2, 2, 2])
+        vertices, edges = eulerian_path((sources, targets), directed=False, return_edges=True)
+        self.assertEulerian(sources, targets, False, vertices, edges)
+        csr_vertices = eulerian_path(CSRGraph.from_edges(sources, targets, directed=False))
+        self.assertEqual(len(csr_vertices), len(sources) + 1)
+        self.assertEqual(Counter(map(frozenset, zip(csr_vertices.tolist(), csr_vertices[1:].tolist()))),
+                         Counter(map(frozenset, zip(sources.tolist(), targets.tolist()))))
+        # Directed circuit with parallel edges and a loop, from a requested start vertex.
+        sources, targets = np.array([0, 0, 1, 1, 2, 2]), np.array([1, 1, 0, 1, 0, 0])
+        self.assertIsNone(eulerian_path((sources, targets)))  # 0 -> 1 twice but only 1 -> 0 once
+        sources, targets = np.array([0, 0, 1, 1, 1, 2]), np.array([1, 1, 0, 1, 2, 0])
+        vertices, edges = eulerian_path((sources, targets), circuit=True, start=1, return_edges=True)
+        self.assertEqual(vertices[0], 1)
+        self.assertEulerian(sources, targets, True, vertices, edges, circuit=True)
+    
+    def test_no_eulerian_path(self):
+        # Balanced degrees but two components.
+        self.assertIsNone(eulerian_path((np.array([0, 1, 2, 3]), np.array([1, 0, 3, 2]))))
+        self.assertIsNone(eulerian_start((np.array([0, 1, 2, 3]), np.array([1, 0, 3, 2]))))
+        # Four odd-degree vertices (a star with three leaves plus one more edge).
+        star = (np.array([0, 0, 0, 1]), np.array([1, 2, 3, 4]))
+        self.assertIsNone(eulerian_path(star, directed=False))
+        self.assertIsNone(eulerian_path((np.array([], dtype=np.int64), np.array([], dtype=np.int64))))
+    
+    def test_de_bruijn_round_trip(self):
+        rng = np.random.default_rng(1)
+        for k in (3, 5, 12):
+            sequence = "".join(rng.choice(list("ACGT"), 400))
+            sources, targets, node_codes = de_bruijn_edges(sequence, k)
+            vertices = eulerian_path((sources, targets))
+            spelled = spell_path(vertices, node_codes, k)
+            self.assertEqual(len(spelled), len(sequence))
+            # Any Eulerian path spells a sequence with the same multiset of k-mers.
+            kmers = lambda text: Counter(text[i:i + k] for i in range(len(text) - k + 1))
+            self.assertEqual(kmers(spelled), kmers(sequence))
+        sources, targets, node_codes = de_bruijn_edges("ACGTTGCA", 8)
+        self.assertEqual(spell_path(eulerian_path((sources, targets)), node_codes, 8), "ACGTTGCA")
+
 def main():
     # Demonstrate basic graph operations
     graph = Graph()
@@ -642,6 +4381,74 @@ def main():
     # Demonstrate performance analysis
     print("\nPerformance Analysis:")
     demonstrate_performance_analysis()
+    
+    print("\nCSR graph backend:")
+    csr = CSRGraph.from_graph(graph)
+    print(csr, "BFS:", bfs(csr, 0), "Dijkstra:", dijkstra(csr, 0).tolist())
+    compare_graph_backends()
+    
+    distances, parents = bfs_frontier(csr, [0])
+    print("\nFrontier BFS hop distances from 0:", distances.tolist(),
+          "path to 4:", path_from_parents(parents, 4))
+    benchmark_frontier_bfs()
+    
+    search = PointToPointSearch(csr)
+    print("\nBidirectional Dijkstra from 0 to 4:", search.bidirectional_dijkstra(0, 4))
+    benchmark_route_queries()
+    
+    hierarchy = ContractionHierarchy.build(csr)
+    print("\nContraction hierarchy query from 0 to 4:", hierarchy.query(0, 4))
+    benchmark_contraction_hierarchy()
+    
+    dist, pred = floyd_warshall_matrix(graph)
+    print("\nFloyd-Warshall matrix distances from 0:", dist[0].tolist(), "path 0 -> 4:", reconstruct_path(pred, 0, 4))
+    benchmark_floyd_warshall()
+    
+    print("\nVectorized Bellman-Ford from 0:", bellman_ford_vectorized(graph, 0)[0].tolist())
+    benchmark_bellman_ford()
+    
+    print("\nBorůvka's MST:", boruvka_mst(graph))
+    benchmark_mst()
+    
+    dag, components = condensation(CSRGraph.from_graph(graph))
+    print("\nCondensation of the example graph:", dag, "component of each vertex:", components.tolist())
+    benchmark_scc()
+    
+    build = DynamicDAG()
+    for target, dependency in [("app", "lib"), ("lib", "utils"), ("tests", "app"), ("docs", "utils")]:
+        build.add_edge(dependency, target)
+    print("\nBuild order:", build.order(), "rebuilding utils affects:", build.affected_by("utils"))
+    try:
+        build.add_edge("app", "utils")
+    except ValueError as error:
+        print("Rejected:", error)
+    benchmark_dynamic_dag()
+    
+    walker = RandomWalker(csr, p=0.5, q=2.0)
+    print("\nnode2vec walks (p=0.5, q=2) from every vertex:", walker.walk(csr.get_vertices(), 6, seed=0).tolist())
+    benchmark_random_walks()
+    
+    network = FlowNetwork.from_graph(graph)
+    flow = network.max_flow(0, 4)
+    sources, targets, _ = network.edges()
+    _, cut = network.min_cut(0)
+    print("\nMaximum flow from 0 to 4:", flow, "min cut:", list(zip(sources[cut].tolist(), targets[cut].tolist())))
+    benchmark_max_flow()
+    
+    print()
+    benchmark_friend_recommendations()
+    
+    cost, path, optimal = solve_tsp(graph, cycle=False, start=0)
+    print("\nShortest Hamiltonian path from 0:", path, "cost:", cost, "optimal:", optimal)
+    benchmark_tsp()
+    
+    print("\nExample graph has an Eulerian path:", eulerian_start(graph) is not None)
+    bridges = (np.array([0, 0, 0, 0, 0, 1, 2, 1]), np.array([1, 1, 2, 2, 3, 3, 3, 2]))  # Königsberg plus one bridge
+    print("Eulerian path over the bridges:", eulerian_path(bridges, directed=False).tolist())
+    benchmark_eulerian_path()
+    
+    # Run unit tests
+    unittest.main(argv=[''], exit=False)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
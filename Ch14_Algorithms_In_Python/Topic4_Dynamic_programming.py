@@ -15,9 +15,14 @@
 # Author: Sabbir Hossain
 
 import time
+import bisect
 import functools
-from typing import List, Dict, Tuple, Callable
+import itertools
+import os
+from typing import List, Dict, Tuple, Callable, Optional
 import random
+from collections import Counter
+import unittest
 
 # 1. Overview and Historical Context
 # ----------------------------------
@@ -306,11 +311,11 @@ def q_learning(num_episodes: int, learning_rate: float, discount_factor: float,
     
     def get_next_state(state: int, action: int) -> int:
         if action == 0:  # Up
-            return max(state - 4, state)
+            return state - 4 if state >= 4 else state
         elif action == 1:  # Right
             return state + 1 if state % 4 < 3 else state
         elif action == 2:  # Down
-            return min(state + 4, state)
+            return state + 4 if state < 12 else state
         else:  # Left
             return state - 1 if state % 4 > 0 else state
     
@@ -497,6 +502,1481 @@ def demonstrate_performance_analysis():
     print(f"Standard DP: Result = {result_dp}, Time = {dp_time:.6f} seconds")
     print(f"Optimized DP: Result = {result_optimized}, Time = {optimized_time:.6f} seconds")
 
+# Knapsack and subset sum beyond the O(nW) table
+# ----------------------------------------------
+# - Subset sum only needs to know which sums are reachable, one bit each. Keeping them
+#   in a Python int, adding item x is `reachable |= reachable << x`: the shift and OR
+#   run in C over W/64 machine words, so the O(nW) work is done 64 cells at a time.
+# - 0/1 knapsack needs values, so it keeps one NumPy row of W + 1 best values and
+#   updates it with one vectorized maximum per item. The row alone cannot say which
+#   items were used, and keeping every row costs O(nW) memory. Instead, every
+#   sqrt(n)-th row is saved as a checkpoint; reconstruction walks the blocks backwards,
+#   recomputing each block's rows from its checkpoint: O(sqrt(n) W) memory for about
+#   twice the time.
+# - Bounded items (at most c copies) are split into copies of 1, 2, 4, ... items, so
+#   O(log c) 0/1 items cover every count. Unbounded items use the fact that the best
+#   value at w with k copies is max over k of row[w - k*wt] + k*val: along each residue
+#   class mod wt that is a running maximum, one np.maximum.accumulate per item.
+# - With few items and a huge capacity, meet in the middle enumerates the 2^(n/2)
+#   subsets of each half, sorts one half by weight with a running best value, and
+#   binary-searches the best partner for every subset of the other: O(2^(n/2) n).
+
+def _checkpoint_interval(num_stages: int) -> int:
+    return max(1, int(np.ceil(np.sqrt(num_stages))))
+
+def subset_sums_bitset(nums: List[int], limit: int) -> int:
+    """
+    All subset sums up to limit, as a Python int whose bit s is set iff s is reachable.
+    Time Complexity: O(n * limit / 64)
+    Space Complexity: O(limit / 64)
+    """
+    mask = (1 << (limit + 1)) - 1
+    reachable = 1
+    for x in nums:
+        reachable |= (reachable << x) & mask
+    return reachable
+
+def subset_sum_bitset(nums: List[int], target: int) -> Optional[List[int]]:
+    """
+    Indices of a subset of nums (non-negative integers) summing to target, or None.
+    Time Complexity: O(n * target / 64), about twice that of subset_sums_bitset
+    Space Complexity: O(sqrt(n) * target / 64) for the checkpoints
+    """
+    if target < 0 or any(x < 0 for x in nums):
+        raise ValueError("subset_sum_bitset needs non-negative numbers and target")
+    mask = (1 << (target + 1)) - 1
+    interval = _checkpoint_interval(len(nums))
+    checkpoints = []
+    reachable = 1
+    for i, x in enumerate(nums):
+        if i % interval == 0:
+            checkpoints.append(reachable)
+        reachable |= (reachable << x) & mask
+    if not reachable >> target & 1:
+        return None
+    
+    chosen = []
+    remaining = target
+    for block in range(len(checkpoints) - 1, -1, -1):
+        # Rebuild the bitsets before each item of the block, then walk it backwards.
+        rows = [checkpoints[block]]
+        first, last = block * interval, min((block + 1) * interval, len(nums))
+        for i in range(first, last - 1):
+            rows.append(rows[-1] | ((rows[-1] << nums[i]) & mask))
+        for i in range(last - 1, first - 1, -1):
+            if not rows[i - first] >> remaining & 1:  # not reachable without item i
+                chosen.append(i)
+                remaining -= nums[i]
+    return chosen[::-1]
+
+def _knapsack_stages(wt: List[int], counts) -> List[Tuple[int, int]]:
+    """Split items into 0/1 stages of (item, copies) by binary splitting; an unbounded item is (item, 0)."""
+    stages = []
+    for item, weight in enumerate(wt):
+        if weight <= 0:
+            raise ValueError("item weights must be positive")
+        count = 1 if counts is None else counts[item]
+        if count is None:
+            stages.append((item, 0))
+            continue
+        copies = 1
+        while count > 0:
+            stages.append((item, min(copies, count)))
+            count -= copies
+            copies *= 2
+    return stages
+
+def _apply_stage(row: np.ndarray, weight: int, value, copies: int):
+    """Add one stage to a row of best values, in place."""
+    if copies:  # 0/1 choice of `copies` copies
+        shift = weight * copies
+        if shift < len(row):
+            row[shift:] = np.maximum(row[shift:], row[:-shift] + value * copies)
+        return
+    # Unbounded: within each residue class r, w = r + j*weight and the best value is
+    # j*value + max over i <= j of (row[r + i*weight] - i*value).
+    chains = -(-len(row) // weight)
+    padded = np.zeros(chains * weight, dtype=row.dtype)
+    padded[:len(row)] = row
+    grid = padded.reshape(chains, weight)
+    offsets = (np.arange(chains) * value)[:, None]
+    row[:] = (np.maximum.accumulate(grid - offsets, axis=0) + offsets).ravel()[:len(row)]
+
+def knapsack_rolling(W: int, wt: List[int], val: List, counts: Optional[List[Optional[int]]] = None
+                     ) -> Tuple[float, List[int]]:
+    """
+    Knapsack with a rolling NumPy row and checkpointed item reconstruction.
+    
+    Args:
+    W (int): Capacity
+    wt, val: Item weights (positive integers) and values
+    counts: Copies available of each item; None for 0/1 knapsack, and a None entry
+            for an unbounded item
+    
+    Returns:
+    Tuple of the best value and the chosen item indices (repeated for copies).
+    Time Complexity: O(W * sum(log c_i)), twice that with reconstruction
+    Space Complexity: O(sqrt(stages) * W)
+    """
+    values = np.asarray(val)
+    dtype = np.int64 if np.issubdtype(values.dtype, np.integer) or len(values) == 0 else np.float64
+    stages = _knapsack_stages(wt, counts)
+    interval = _checkpoint_interval(len(stages))
+    checkpoints = []
+    row = np.zeros(W + 1, dtype=dtype)
+    for s, (item, copies) in enumerate(stages):
+        if s % interval == 0:
+            checkpoints.append(row.copy())
+        _apply_stage(row, wt[item], values[item], copies)
+    best_value = row[W]
+    
+    chosen = []
+    remaining = W
+    rows = np.empty((interval + 1, W + 1), dtype=dtype)  # reused by every block
+    for block in range(len(checkpoints) - 1, -1, -1):
+        first, last = block * interval, min((block + 1) * interval, len(stages))
+        rows[0] = checkpoints[block]
+        for s in range(first, last):
+            item, copies = stages[s]
+            rows[s - first + 1] = rows[s - first]
+            _apply_stage(rows[s - first + 1], wt[item], values[item], copies)
+        for s in range(last - 1, first - 1, -1):
+            before, after = rows[s - first], rows[s - first + 1]
+            if after[remaining] == before[remaining]:
+                continue
+            item, copies = stages[s]
+            if not copies:
+                ks = np.arange(1, remaining // wt[item] + 1)
+                copies = int(ks[np.argmax(before[remaining - ks * wt[item]] + ks * values[item])])
+            chosen.extend([item] * copies)
+            remaining -= copies * wt[item]
+    return best_value.item(), sorted(chosen)
+
+def _subset_sums(wt: np.ndarray, val: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Weight and value of all 2^n subsets; bit i of the subset's index is item i."""
+    weights = np.zeros(1, dtype=np.int64)
+    values = np.zeros(1, dtype=val.dtype)
+    for w, v in zip(wt, val):
+        weights = np.concatenate((weights, weights + w))
+        values = np.concatenate((values, values + v))
+    return weights, values
+
+def knapsack_meet_in_middle(W: int, wt: List[int], val: List) -> Tuple[float, List[int]]:
+    """
+    0/1 knapsack for few items (up to about 40) and any capacity.
+    Time Complexity: O(2^(n/2) * n)
+    Space Complexity: O(2^(n/2))
+    """
+    values = np.asarray(val)
+    if not np.issubdtype(values.dtype, np.integer):
+        values = values.astype(np.float64)
+    weights = np.asarray(wt, dtype=np.int64)
+    half = len(weights) // 2
+    left_weights, left_values = _subset_sums(weights[:half], values[:half])
+    right_weights, right_values = _subset_sums(weights[half:], values[half:])
+    
+    order = np.argsort(right_weights, kind="stable")
+    right_weights, right_values = right_weights[order], right_values[order]
+    # For each prefix of the right half sorted by weight, the index of its best subset.
+    running_best = np.maximum.accumulate(right_values)
+    best_index = np.maximum.accumulate(np.where(right_values == running_best, np.arange(len(order)), 0))
+    
+    fits = np.flatnonzero(left_weights <= W)
+    partner = np.searchsorted(right_weights, W - left_weights[fits], side="right") - 1
+    totals = left_values[fits] + running_best[partner]  # partner >= 0: the empty subset weighs 0
+    pick = int(np.argmax(totals))
+    left_subset, right_subset = int(fits[pick]), int(order[best_index[partner[pick]]])
+    chosen = [i for i in range(half) if left_subset >> i & 1]
+    chosen += [half + i for i in range(len(weights) - half) if right_subset >> i & 1]
+    return totals[pick].item(), chosen
+
+def solve_knapsack(W: int, wt: List[int], val: List, counts: Optional[List[Optional[int]]] = None,
+                   method: str = "auto") -> Tuple[float, List[int]]:
+    """
+    Best value and chosen item indices, by "rolling" (knapsack_rolling) or
+    "meet-in-the-middle" (0/1 only). "auto" picks whichever does less work.
+    """
+    if method == "auto":
+        few_items = counts is None and len(wt) <= 40
+        method = "meet-in-the-middle" if few_items and 2 ** (len(wt) / 2) * len(wt) < (W + 1) * len(wt) else "rolling"
+    if method == "rolling":
+        return knapsack_rolling(W, wt, val, counts)
+    if method == "meet-in-the-middle":
+        if counts is not None:
+            raise ValueError("meet in the middle only solves 0/1 knapsack")
+        return knapsack_meet_in_middle(W, wt, val)
+    raise ValueError(f"unknown method: {method!r}")
+
+def benchmark_knapsack_solvers(subset_items: int = 200, knapsack_sizes=((100, 2_000), (1_000, 100_000)),
+                               split_items: int = 36, bounded_capacity: int = 100_000):
+    """The table-based knapsack/subset-sum solvers vs. the bitset, rolling and meet-in-the-middle ones."""
+    def subset_sum_table(nums, target):
+        # The 1-D boolean list version (as subset_sum_optimized in QuickStart).
+        dp = [False] * (target + 1)
+        dp[0] = True
+        for num in nums:
+            for j in range(target, num - 1, -1):
+                dp[j] = dp[j] or dp[j - num]
+        return dp[target]
+    
+    def timed(function, *args):
+        start_time = timeit.default_timer()
+        result = function(*args)
+        return result, timeit.default_timer() - start_time
+    
+    rng = random.Random(0)
+    nums = [rng.randint(1, 10_000) for _ in range(subset_items)]
+    target = sum(nums) // 3
+    print(f"\nSubset sum, {len(nums)} numbers, target {target:,}:")
+    for name, function in [("1-D boolean list", subset_sum_table),
+                           ("Big-int bitset", lambda n, t: bool(subset_sums_bitset(n, t) >> t & 1)),
+                           ("Bitset + subset", lambda n, t: subset_sum_bitset(n, t) is not None)]:
+        found, elapsed = timed(function, nums, target)
+        print(f"  {name:<18} {found!s:<6} {elapsed:.4f} seconds")
+    
+    for n, W in knapsack_sizes:
+        wt = [rng.randint(1, W // 10) for _ in range(n)]
+        val = [rng.randint(1, 1000) for _ in range(n)]
+        print(f"0/1 knapsack, {n} items, capacity {W:,}:")
+        if n * W <= 1_000_000:
+            value, elapsed = timed(knapsack_dp, W, wt, val)
+            print(f"  {'Standard DP':<18} {value:<10} {elapsed:.4f} seconds")
+        value, elapsed = timed(optimize_knapsack_dp, W, wt, val)
+        print(f"  {'Optimized DP':<18} {value:<10} {elapsed:.4f} seconds (value only)")
+        (value, chosen), elapsed = timed(knapsack_rolling, W, wt, val)
+        assert sum(wt[i] for i in chosen) <= W and sum(val[i] for i in chosen) == value
+        print(f"  {'Rolling + items':<18} {value:<10} {elapsed:.4f} seconds ({len(chosen)} items)")
+    
+    wt = [rng.randint(10**8, 10**9) for _ in range(split_items)]
+    val = [w // 1000 + rng.randint(0, 10**5) for w in wt]
+    W = sum(wt) // 2
+    (value, chosen), elapsed = timed(knapsack_meet_in_middle, W, wt, val)
+    print(f"0/1 knapsack, {split_items} items, capacity {W:,}:\n  {'Meet in the middle':<18} {value:<10} "
+          f"{elapsed:.4f} seconds (a table would need {W + 1:,} cells per row)")
+    
+    wt = [rng.randint(1, 1000) for _ in range(200)]
+    val = [rng.randint(1, 1000) for _ in range(200)]
+    W = bounded_capacity
+    print(f"Bounded/unbounded knapsack, 200 items, capacity {W:,}:")
+    counts = [rng.randint(1, 50) for _ in range(200)]
+    expanded = [i for i, c in enumerate(counts) for _ in range(c)]
+    value, elapsed = timed(optimize_knapsack_dp, W, [wt[i] for i in expanded], [val[i] for i in expanded])
+    print(f"  {'Copies as items':<18} {value:<10} {elapsed:.4f} seconds ({len(expanded):,} 0/1 items)")
+    (value, _), elapsed = timed(knapsack_rolling, W, wt, val, counts)
+    print(f"  {'Binary splitting':<18} {value:<10} {elapsed:.4f} seconds")
+    (value, _), elapsed = timed(knapsack_rolling, W, wt, val, [None] * 200)
+    print(f"  {'Unbounded':<18} {value:<10} {elapsed:.4f} seconds")
+
+# Sequence comparison in linear space
+# -----------------------------------
+# lcs_dp and the edit distance table keep all (m + 1)(n + 1) cells: 10^10 of them for
+# two 100k-line files. Three changes make such inputs practical:
+# - Bit-parallel rows (Allison-Dix for LCS, Myers 1999 / Hyyrö for edit distance): a
+#   DP column is stored as bits (the LCS row's increments, or the edit distance
+#   column's +1/-1 differences) of a Python int, and each symbol of the other sequence
+#   updates all of them with a handful of big-int operations, 64 cells per word.
+# - Hirschberg (1975): the optimal alignment passes through row m/2 at the column k
+#   where forward and reversed last rows sum best; splitting there and recursing
+#   recovers the full alignment in O(m + n) space for about twice the time.
+# - Cutoffs: when only distances up to k matter, cells more than k off the diagonal
+#   can never be <= k (Ukkonen's band, O(k n) time), and the computation stops as soon
+#   as the remaining length cannot bring the distance back under k.
+# edit_distance_batch runs Myers' recurrence for many short pairs at once, one uint64
+# lane per pair in NumPy, for fuzzy matching millions of pairs.
+
+def _match_masks(pattern) -> Dict:
+    """For each symbol of pattern, an int with bit i set where pattern[i] is that symbol."""
+    positions = {}
+    for i, symbol in enumerate(pattern):
+        positions.setdefault(symbol, []).append(i)
+    masks = {}
+    for symbol, where in positions.items():
+        if len(where) > 64:
+            bits = np.zeros(len(pattern), dtype=np.uint8)
+            bits[where] = 1
+            masks[symbol] = int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+        else:
+            mask = 0
+            for i in where:
+                mask |= 1 << i
+            masks[symbol] = mask
+    return masks
+
+def _lcs_row(X, Y) -> List[int]:
+    """LCS lengths of X against every prefix of Y (the last DP row), bit-parallel over X."""
+    m = len(X)
+    masks = _match_masks(X)
+    full = (1 << m) - 1
+    v = full  # zero bits mark the positions where the row's LCS grows
+    row = [0]
+    for symbol in Y:
+        u = v & masks.get(symbol, 0)
+        v = ((v + u) | (v - u)) & full
+        row.append(m - v.bit_count())
+    return row
+
+def _edit_distance_row(X, Y, max_distance: Optional[int] = None) -> Optional[List[int]]:
+    """
+    Edit distances of X to every prefix of Y (the last DP row) by Myers' bit-vector
+    recurrence over X; None once the full distance must exceed max_distance.
+    """
+    m, n = len(X), len(Y)
+    if m == 0:
+        return list(range(n + 1))
+    masks = _match_masks(X)
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    positive, negative, score = full, 0, m  # vertical +1/-1 deltas, D[m][j]
+    row = [m]
+    for j, symbol in enumerate(Y, 1):
+        eq = masks.get(symbol, 0)
+        xv = eq | negative
+        xh = (((eq & positive) + positive) ^ positive) | eq
+        ph = negative | (~(xh | positive) & full)
+        mh = positive & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        if max_distance is not None and score - (n - j) > max_distance:
+            return None  # each remaining column lowers the distance by at most 1
+        ph = ((ph << 1) | 1) & full  # row 0 grows by 1 per column
+        mh = (mh << 1) & full
+        positive = mh | (~(xv | ph) & full)
+        negative = ph & xv
+        row.append(score)
+    return row
+
+def lcs_length_bitparallel(X, Y) -> int:
+    """
+    Length of the longest common subsequence of two sequences (strings, lists of lines).
+    Time Complexity: O(m * n / 64)
+    Space Complexity: O(m + n)
+    """
+    if len(X) < len(Y):
+        X, Y = Y, X  # iterate over the shorter one
+    return _lcs_row(X, Y)[-1] if X and Y else 0
+
+def edit_distance_bitparallel(X, Y, max_distance: Optional[int] = None) -> Optional[int]:
+    """
+    Levenshtein distance by Myers' bit-parallel algorithm, or None if it exceeds
+    max_distance (checked as the computation goes, so hopeless pairs stop early).
+    Time Complexity: O(m * n / 64)
+    Space Complexity: O(m + n)
+    """
+    if len(X) > len(Y):
+        X, Y = Y, X  # fewer bits per word operation
+    if max_distance is not None and len(Y) - len(X) > max_distance:
+        return None
+    row = _edit_distance_row(X, Y, max_distance)
+    return row[-1] if row is not None else None
+
+def edit_distance_banded(X, Y, max_distance: int) -> Optional[int]:
+    """
+    Levenshtein distance if it is at most max_distance, else None. Only cells within
+    max_distance of the diagonal are filled, and the loop stops at the first row whose
+    band is all over the cutoff.
+    Time Complexity: O(k * min(m, n))
+    Space Complexity: O(k)
+    """
+    m, n, k = len(X), len(Y), max_distance
+    if abs(m - n) > k:
+        return None
+    width, over = 2 * k + 1, k + 1
+    # Band index d holds column j = i + d - k.
+    previous = [d - k if 0 <= d - k <= n else over for d in range(width)]
+    for i in range(1, m + 1):
+        current = [over] * width
+        low, high = max(0, k - i), min(width - 1, n - i + k)
+        for d in range(low, high + 1):
+            j = i + d - k
+            if j == 0:
+                current[d] = i
+                continue
+            best = previous[d] + (X[i - 1] != Y[j - 1])
+            if d + 1 < width and previous[d + 1] + 1 < best:
+                best = previous[d + 1] + 1
+            if d > 0 and current[d - 1] + 1 < best:
+                best = current[d - 1] + 1
+            current[d] = min(best, over)
+        if min(current[low:high + 1]) > k:
+            return None
+        previous = current
+    return previous[n - m + k] if previous[n - m + k] <= k else None
+
+def edit_distance_batch(A: List[str], B: List[str], max_distance: Optional[int] = None,
+                        chunk_size: int = 100_000) -> np.ndarray:
+    """
+    Levenshtein distances of many string pairs, one 64-bit lane per pair.
+    
+    Args:
+    A, B: Equal-length lists of strings
+    max_distance (int): Distances above this are reported as -1
+    chunk_size (int): Pairs processed together (memory is about 600 bytes per pair)
+    
+    Returns:
+    np.ndarray of distances. Pairs whose shorter string exceeds 64 characters fall back to
+    edit_distance_bitparallel. Time Complexity: O(sum of longer lengths) vector steps
+    """
+    if len(A) != len(B):
+        raise ValueError("A and B must have the same length")
+    result = np.empty(len(A), dtype=np.int64)
+    for first in range(0, len(A), chunk_size):
+        patterns, texts = A[first:first + chunk_size], B[first:first + chunk_size]
+        swap = [len(a) > len(b) for a, b in zip(patterns, texts)]
+        patterns, texts = ([b if s else a for a, b, s in zip(patterns, texts, swap)],
+                           [a if s else b for a, b, s in zip(patterns, texts, swap)])
+        result[first:first + len(patterns)] = _edit_distance_lanes(patterns, texts, max_distance)
+    if max_distance is not None:
+        result[result > max_distance] = -1
+    return result
+
+def _padded_codes(strings: List[str], width: int, fill: int) -> np.ndarray:
+    """Code points of the strings, one row each, padded with fill up to width."""
+    lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+    codes = np.frombuffer("".join(strings).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    table = np.full((len(strings), width), fill, dtype=np.int64)
+    rows = np.repeat(np.arange(len(strings)), lengths)
+    columns = np.arange(len(codes)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    table[rows, columns] = codes
+    return table
+
+def _edit_distance_lanes(patterns: List[str], texts: List[str], max_distance: Optional[int]) -> np.ndarray:
+    m = np.fromiter(map(len, patterns), dtype=np.int64, count=len(patterns))
+    n = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    distances = n - m  # exact when the pattern is empty, a lower bound otherwise
+    todo = np.flatnonzero((m > 0) & (m <= 64))
+    if max_distance is not None:
+        todo = todo[distances[todo] <= max_distance]
+    for i in np.flatnonzero(m > 64):
+        distance = edit_distance_bitparallel(patterns[i], texts[i], max_distance)
+        distances[i] = max_distance + 1 if distance is None else distance
+    if not len(todo):
+        return distances
+    
+    P = _padded_codes([patterns[i] for i in todo], 64, -1)
+    T = _padded_codes([texts[i] for i in todo], int(n[todo].max()), -2)
+    columns = (np.packbits(P == T[:, j:j + 1], axis=1, bitorder="little").view("<u8").ravel()
+               for j in range(T.shape[1]))
+    distances[todo] = _myers_lanes(columns, m[todo], n[todo])
+    return distances
+
+def _myers_lanes(eq_columns, lengths: np.ndarray, text_lengths: np.ndarray) -> np.ndarray:
+    """
+    Myers' recurrence in one uint64 lane per pair. eq_columns yields, for each text
+    position j, every lane's pattern match mask for its text[j]; lengths are the pattern
+    lengths (1..64). Returns the edit distances.
+    """
+    one = np.uint64(1)
+    lengths = lengths.astype(np.uint64)
+    full = np.where(lengths == 64, np.uint64(2**64 - 1), (one << (lengths % np.uint64(64))) - one)
+    high = one << (lengths - one)
+    positive, negative = full.copy(), np.zeros(len(lengths), dtype=np.uint64)
+    score = lengths.astype(np.int64)
+    for j, eq in enumerate(eq_columns):
+        active = j < text_lengths
+        xv = eq | negative
+        xh = (((eq & positive) + positive) ^ positive) | eq
+        ph = negative | (~(xh | positive) & full)
+        mh = positive & xh
+        step = (ph & high != 0).astype(np.int64) - (mh & high != 0).astype(np.int64)
+        score += np.where(active, step, 0)
+        ph = ((ph << one) | one) & full
+        mh = (mh << one) & full
+        positive = np.where(active, mh | (~(xv | ph) & full), positive)
+        negative = np.where(active, ph & xv, negative)
+    return score
+
+def _align_small(X, Y, offset_x: int, offset_y: int, method: str) -> List[Tuple[str, int, int]]:
+    """Full-table alignment with traceback, for Hirschberg's small base cases."""
+    m, n = len(X), len(Y)
+    lcs = method == "lcs"
+    table = [[0] * (n + 1) for _ in range(m + 1)]
+    for i in range(m + 1):
+        for j in range(n + 1):
+            if i == 0 or j == 0:
+                table[i][j] = 0 if lcs else i + j
+            elif lcs:
+                table[i][j] = table[i - 1][j - 1] + 1 if X[i - 1] == Y[j - 1] else max(table[i - 1][j], table[i][j - 1])
+            else:
+                table[i][j] = min(table[i - 1][j - 1] + (X[i - 1] != Y[j - 1]), table[i - 1][j] + 1, table[i][j - 1] + 1)
+    ops = []
+    i, j = m, n
+    while i or j:
+        if i and j and X[i - 1] == Y[j - 1] and table[i][j] == table[i - 1][j - 1] + lcs:
+            ops.append(("=", offset_x + i - 1, offset_y + j - 1))
+            i, j = i - 1, j - 1
+        elif i and j and not lcs and table[i][j] == table[i - 1][j - 1] + 1:
+            ops.append(("X", offset_x + i - 1, offset_y + j - 1))
+            i, j = i - 1, j - 1
+        elif i and table[i][j] == table[i - 1][j] + (0 if lcs else 1):
+            ops.append(("-", offset_x + i - 1, -1))
+            i -= 1
+        else:
+            ops.append(("+", -1, offset_y + j - 1))
+            j -= 1
+    return ops[::-1]
+
+def _hirschberg(X, Y, offset_x: int, offset_y: int, method: str, ops: List[Tuple[str, int, int]]):
+    # Common prefixes and suffixes are always part of an optimal alignment.
+    start = 0
+    while start < len(X) and start < len(Y) and X[start] == Y[start]:
+        ops.append(("=", offset_x + start, offset_y + start))
+        start += 1
+    end = 0
+    while end < len(X) - start and end < len(Y) - start and X[-1 - end] == Y[-1 - end]:
+        end += 1
+    suffix = [("=", offset_x + len(X) - end + t, offset_y + len(Y) - end + t) for t in range(end)]
+    X, Y = X[start:len(X) - end], Y[start:len(Y) - end]
+    offset_x, offset_y = offset_x + start, offset_y + start
+    
+    if len(X) <= 1 or len(Y) <= 1 or len(X) * len(Y) <= 4096:
+        ops.extend(_align_small(X, Y, offset_x, offset_y, method))
+    else:
+        middle = len(X) // 2
+        row = _lcs_row if method == "lcs" else _edit_distance_row
+        forward = np.array(row(X[:middle], Y))
+        backward = np.array(row(X[middle:][::-1], Y[::-1]))[::-1]
+        totals = forward + backward
+        split = int(np.argmax(totals) if method == "lcs" else np.argmin(totals))
+        _hirschberg(X[:middle], Y[:split], offset_x, offset_y, method, ops)
+        _hirschberg(X[middle:], Y[split:], offset_x + middle, offset_y + split, method, ops)
+    ops.extend(suffix)
+
+def align_sequences(X, Y, method: str = "lcs") -> List[Tuple[str, int, int]]:
+    """
+    Optimal alignment of two sequences in linear space (Hirschberg with bit-parallel rows).
+    
+    Args:
+    X, Y: Strings, or lists of hashable items such as lines
+    method (str): "lcs" (matches, deletions and insertions; a diff) or "edit"
+                  (minimum Levenshtein edits, adding substitutions)
+    
+    Returns:
+    List of (op, i, j): "=" X[i] matches Y[j], "X" X[i] is replaced by Y[j], "-" X[i] is
+    deleted, "+" Y[j] is inserted (the absent index is -1).
+    Time Complexity: O(m * n / 64), Space Complexity: O(m + n)
+    """
+    if method not in ("lcs", "edit"):
+        raise ValueError(f"unknown method: {method!r}")
+    ops = []
+    _hirschberg(X, Y, 0, 0, method, ops)
+    return ops
+
+def lcs_hirschberg(X, Y) -> list:
+    """One longest common subsequence of X and Y, in linear space."""
+    return [X[i] for op, i, _ in align_sequences(X, Y) if op == "="]
+
+def diff_lines(a: List[str], b: List[str]) -> List[str]:
+    """A minimal line diff, in the "  kept", "- removed", "+ added" format of difflib.ndiff."""
+    marks = {"=": "  ", "-": "- ", "+": "+ "}
+    return [marks[op] + (a[i] if op != "+" else b[j]) for op, i, j in align_sequences(a, b)]
+
+def benchmark_sequence_comparison(num_lines: int = 100_000, num_pairs: int = 1_000_000):
+    """Full tables vs. bit-parallel, banded and Hirschberg comparisons."""
+    def edit_distance_table(X, Y):
+        # The full (m + 1) x (n + 1) table, as print_edit_distance in QuickStart builds it.
+        dp = [[i + j if i == 0 or j == 0 else 0 for j in range(len(Y) + 1)] for i in range(len(X) + 1)]
+        for i in range(1, len(X) + 1):
+            for j in range(1, len(Y) + 1):
+                dp[i][j] = min(dp[i - 1][j - 1] + (X[i - 1] != Y[j - 1]), dp[i - 1][j] + 1, dp[i][j - 1] + 1)
+        return dp[-1][-1]
+    
+    def timed(function, *args):
+        start_time = timeit.default_timer()
+        result = function(*args)
+        return result, timeit.default_timer() - start_time
+    
+    rng = random.Random(0)
+    X = "".join(rng.choice("ACGT") for _ in range(2_000))
+    Y = "".join(c if rng.random() > 0.1 else rng.choice("ACGT") for c in X)
+    print(f"\nTwo {len(X):,}-character DNA strings:")
+    for name, function in [("LCS table (lcs_dp)", lcs_dp), ("LCS bit-parallel", lcs_length_bitparallel),
+                           ("Edit distance table", edit_distance_table),
+                           ("Edit bit-parallel", edit_distance_bitparallel),
+                           ("Edit banded, k=200", lambda x, y: edit_distance_banded(x, y, 200)),
+                           ("Edit banded, k=20", lambda x, y: edit_distance_banded(x, y, 20)),
+                           ("Hirschberg alignment", lambda x, y: len(align_sequences(x, y, "edit")))]:
+        result, elapsed = timed(function, X, Y)
+        print(f"  {name:<22} {result!s:<8} {elapsed:.4f} seconds")
+    
+    old = [f"line {rng.randrange(10**6)}" for _ in range(num_lines)]
+    new = list(old)
+    for _ in range(num_lines // 1000):  # scattered edits
+        position = rng.randrange(len(new))
+        if rng.random() < 0.5:
+            del new[position]
+        else:
+            new.insert(position, f"new line {rng.randrange(10**6)}")
+    diff, elapsed = timed(diff_lines, old, new)
+    changed = sum(not line.startswith("  ") for line in diff)
+    print(f"Diff of two {num_lines:,}-line files: {changed} changed lines, {elapsed:.2f} seconds "
+          f"(a full table would have {(len(old) + 1) * (len(new) + 1):,} cells)")
+    
+    words = ["".join(rng.choice("abcdefghij") for _ in range(rng.randint(5, 20))) for _ in range(1000)]
+    A = [rng.choice(words) for _ in range(num_pairs)]
+    B = ["".join(c for c in w if rng.random() > 0.1) for w in (rng.choice(words) if rng.random() < 0.5 else a for a in A)]
+    sample = 20_000
+    _, elapsed = timed(lambda: [edit_distance_bitparallel(a, b, 3) for a, b in zip(A[:sample], B[:sample])])
+    print(f"Fuzzy matching {num_pairs:,} pairs (distance <= 3): bit-parallel one pair at a time "
+          f"{elapsed * num_pairs / sample:.1f} seconds (estimated)")
+    distances, elapsed = timed(edit_distance_batch, A, B, 3)
+    print(f"  edit_distance_batch {elapsed:.1f} seconds, {np.count_nonzero(distances >= 0):,} matches")
+
+# Fuzzy dictionary lookup
+# -----------------------
+# Comparing a query with every word of a 2M-word dictionary costs 2M edit distances.
+# Two indexes avoid most of them:
+# - BK-tree (Burkhard and Keller, 1973): each node holds a word, and a child hangs
+#   under the edge labeled with its distance to the parent. Edit distance is a metric,
+#   so if the query is d away from a node, matches within k can only be in children
+#   labeled d - k .. d + k. Queries here go level by level, computing the distances of
+#   the whole frontier with edit_distance_batch; the tree is bulk-built the same way.
+#   Works for any k at query time, but visits a sizable fraction of the tree for k >= 2.
+# - Symmetric delete (Garbe's SymSpell): if two words are within k edits, deleting at
+#   most k characters from each makes them equal. Every word is indexed under all its
+#   <= k deletions, and a query looks up its own deletions: a few dozen hash probes, then
+#   exact distances for the candidates only. As in SymSpell, only the first
+#   prefix_length characters are used (matches still differ by <= k deletions there),
+#   which keeps the index at O(prefix_length^k) entries per word. Deletion variants
+#   are generated and hashed for all words at once with NumPy, and stored as sorted
+#   64-bit hashes with a CSR list of word ids.
+# Both store the words as one UTF-8 buffer with offsets, so save/load is a handful of
+# .npy files and load(mmap=True) opens a large index without reading it.
+
+_DELETE_HASH_BASE = np.uint64(0x100000001B3)
+
+def _code_matrix(words: List[str], width: int) -> np.ndarray:
+    """Code points of the first `width` characters of each word, 0-padded."""
+    clipped = [word[:width] for word in words]
+    lengths = np.fromiter(map(len, clipped), dtype=np.int64, count=len(clipped))
+    codes = np.frombuffer("".join(clipped).encode("utf-32-le"), dtype=np.uint32)
+    matrix = np.zeros((len(words), width), dtype=np.uint64)
+    rows = np.repeat(np.arange(len(words)), lengths)
+    columns = np.arange(len(codes)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    matrix[rows, columns] = codes
+    return matrix
+
+def _delete_hashes(matrix: np.ndarray, max_distance: int) -> np.ndarray:
+    """Hashes of every way to delete up to max_distance columns, shape (rows, variants)."""
+    width = matrix.shape[1]
+    variants = []
+    for count in range(max_distance + 1):
+        for deleted in itertools.combinations(range(width), count):
+            h = np.zeros(len(matrix), dtype=np.uint64)
+            for column in range(width):
+                if column not in deleted:
+                    code = matrix[:, column]
+                    # Padding is skipped, so deleting past the end is the same as not deleting.
+                    h = np.where(code != 0, h * _DELETE_HASH_BASE + code, h)
+            variants.append(h)
+    return np.stack(variants, axis=1)
+
+def _word_delete_hashes(word: str, width: int, max_distance: int) -> np.ndarray:
+    """_delete_hashes for a single word, in plain Python (much faster for one row)."""
+    codes = [ord(c) for c in word[:width]]
+    base, mask = int(_DELETE_HASH_BASE), 2**64 - 1
+    hashes = set()
+    for count in range(min(max_distance, len(codes)) + 1):
+        for deleted in itertools.combinations(range(len(codes)), count):
+            h = 0
+            for i, code in enumerate(codes):
+                if i not in deleted:
+                    h = (h * base + code) & mask
+            hashes.add(h)
+    return np.array(sorted(hashes), dtype=np.uint64)
+
+class _WordStore:
+    """Words kept as one UTF-8 buffer plus offsets and lengths (shared by the fuzzy indexes)."""
+    
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray, lengths: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+        self.lengths = lengths
+        self._codes = None  # all code points, decoded on first use by _padded_word_codes
+    
+    @staticmethod
+    def _pack(words: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        encoded = [word.encode() for word in words]
+        offsets = np.zeros(len(words) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        lengths = np.fromiter(map(len, words), dtype=np.int32, count=len(words))
+        return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets, lengths
+    
+    def word(self, i: int) -> str:
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode()
+    
+    def _padded_word_codes(self, ids: np.ndarray, fill: int) -> np.ndarray:
+        """Code points of words ids, one column each (shape (max length, len(ids))), padded with fill."""
+        if self._codes is None:
+            self._codes = np.frombuffer(self.blob.tobytes().decode().encode("utf-32-le"), dtype=np.uint32)
+            self._code_offsets = np.zeros(len(self) + 1, dtype=np.int64)
+            np.cumsum(self.lengths, out=self._code_offsets[1:])
+        lengths = self.lengths[ids].astype(np.int64)
+        table = np.full((int(lengths.max(initial=0)), len(ids)), fill, dtype=np.int64)
+        columns = np.repeat(np.arange(len(ids)), lengths)
+        rows = np.arange(len(columns)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        table[rows, columns] = self._codes[np.repeat(self._code_offsets[ids], lengths) + rows]
+        return table
+    
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+    
+    def _save_arrays(self, directory: str, **arrays):
+        os.makedirs(directory, exist_ok=True)
+        arrays.update(blob=self.blob, offsets=self.offsets, lengths=self.lengths, backend=np.array(type(self).__name__))
+        for name, array in arrays.items():
+            np.save(os.path.join(directory, f"{name}.npy"), array)
+    
+    @staticmethod
+    def _load_arrays(directory: str, names: List[str], mmap: bool) -> List[np.ndarray]:
+        mode = "r" if mmap else None
+        return [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode) for name in names]
+
+class BKTree(_WordStore):
+    """A BK-tree over edit distance; node i's children are nodes first_child[i] .. + num_children[i]."""
+    
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray, lengths: np.ndarray, node_word: np.ndarray,
+                 parent_distance: np.ndarray, first_child: np.ndarray, num_children: np.ndarray):
+        super().__init__(blob, offsets, lengths)
+        self.node_word = node_word
+        self.parent_distance = parent_distance
+        self.first_child = first_child
+        self.num_children = num_children
+    
+    @classmethod
+    def build(cls, words: List[str]) -> "BKTree":
+        """
+        Bulk-build the tree level by level: each level's pending words are compared with
+        their node's word in one batch and grouped by distance into child nodes.
+        Time Complexity: O(N * depth) batched edit distances
+        """
+        words = list(dict.fromkeys(words))
+        n = len(words)
+        node_word = np.zeros(n, dtype=np.int64)
+        parent_distance = np.zeros(n, dtype=np.int64)
+        first_child = np.zeros(n, dtype=np.int64)
+        num_children = np.zeros(n, dtype=np.int64)
+        # The pending words of a level, and the node each of them sits under.
+        members = np.arange(1, n)
+        owner = np.zeros(n - 1 if n else 0, dtype=np.int64)
+        next_node = 1
+        while len(members):
+            pivots = node_word[owner]
+            distances = edit_distance_batch([words[i] for i in pivots.tolist()], [words[i] for i in members.tolist()])
+            order = np.lexsort((distances, owner))
+            members, owner, distances = members[order], owner[order], distances[order]
+            # A new child starts wherever (owner, distance) changes; its first word becomes the node.
+            boundary = np.r_[True, (owner[1:] != owner[:-1]) | (distances[1:] != distances[:-1])]
+            starts = np.flatnonzero(boundary)
+            children = next_node + np.arange(len(starts))
+            node_word[children] = members[starts]
+            parent_distance[children] = distances[starts]
+            parents = owner[starts]
+            parent_starts = np.flatnonzero(np.r_[True, parents[1:] != parents[:-1]])
+            first_child[parents[parent_starts]] = children[parent_starts]
+            num_children[parents[parent_starts]] = np.diff(np.r_[parent_starts, len(starts)])
+            next_node += len(starts)
+            
+            group = np.cumsum(boundary) - 1
+            rest = np.ones(len(members), dtype=bool)
+            rest[starts] = False
+            members, owner = members[rest], children[group[rest]]
+        return cls(*cls._pack(words), node_word, parent_distance, first_child, num_children)
+    
+    def _distances(self, word: str, ids: np.ndarray) -> np.ndarray:
+        """Edit distances from word to the words ids, with word as every lane's pattern."""
+        if not 0 < len(word) <= 64:
+            return edit_distance_batch([word] * len(ids), [self.word(i) for i in ids.tolist()])
+        # One match mask per distinct symbol of word, looked up for the whole text table at once.
+        symbols, inverse = np.unique([ord(c) for c in word], return_inverse=True)
+        masks = np.zeros(len(symbols), dtype=np.uint64)
+        np.bitwise_or.at(masks, inverse, np.uint64(1) << np.arange(len(word), dtype=np.uint64))
+        texts = self._padded_word_codes(ids, -1)
+        slots = np.minimum(np.searchsorted(symbols, texts), len(symbols) - 1)
+        eq = np.where(symbols[slots] == texts, masks[slots], np.uint64(0))
+        return _myers_lanes(eq, np.full(len(ids), len(word)), self.lengths[ids])
+    
+    def lookup(self, word: str, max_distance: int) -> List[Tuple[str, int]]:
+        """Dictionary words within max_distance edits of word, as (word, distance), closest first."""
+        if not len(self):
+            return []
+        matches = []
+        frontier = np.zeros(1, dtype=np.int64)
+        while len(frontier):
+            nodes = self.node_word[frontier]
+            distances = self._distances(word, nodes)
+            close = np.flatnonzero(distances <= max_distance)
+            matches.extend(zip(map(self.word, nodes[close].tolist()), distances[close].tolist()))
+            counts = self.num_children[frontier]
+            children = np.repeat(self.first_child[frontier] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            near = np.abs(self.parent_distance[children] - np.repeat(distances, counts)) <= max_distance
+            frontier = children[near]
+        return sorted(matches, key=lambda match: (match[1], match[0]))
+    
+    def save(self, directory: str):
+        """Write the index as .npy files into directory."""
+        self._save_arrays(directory, node_word=self.node_word, parent_distance=self.parent_distance,
+                          first_child=self.first_child, num_children=self.num_children)
+    
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "BKTree":
+        return cls(*cls._load_arrays(directory, ["blob", "offsets", "lengths", "node_word", "parent_distance",
+                                                 "first_child", "num_children"], mmap))
+
+class SymmetricDeleteIndex(_WordStore):
+    """A SymSpell-style index: sorted deletion-variant hashes, each with a CSR list of word ids."""
+    
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray, lengths: np.ndarray, keys: np.ndarray,
+                 indptr: np.ndarray, word_ids: np.ndarray, max_distance: int, prefix_length: int):
+        super().__init__(blob, offsets, lengths)
+        self.keys = keys
+        self.indptr = indptr
+        self.word_ids = word_ids
+        self.max_distance = int(max_distance)
+        self.prefix_length = int(prefix_length)
+    
+    @classmethod
+    def build(cls, words: List[str], max_distance: int = 2, prefix_length: int = 7,
+              batch_size: int = 200_000) -> "SymmetricDeleteIndex":
+        """
+        Index every word under the hashes of all <= max_distance deletions of its prefix.
+        Time Complexity: O(N * C(prefix_length, <= k) * prefix_length) vectorized, plus a sort
+        """
+        words = list(dict.fromkeys(words))
+        keys, ids = [], []
+        for first in range(0, len(words), batch_size):
+            hashes = _delete_hashes(_code_matrix(words[first:first + batch_size], prefix_length), max_distance)
+            keys.append(hashes.ravel())
+            ids.append(np.repeat(np.arange(first, first + len(hashes)), hashes.shape[1]))
+        keys = np.concatenate(keys) if keys else np.zeros(0, dtype=np.uint64)
+        ids = np.concatenate(ids) if ids else np.zeros(0, dtype=np.int64)
+        order = np.lexsort((ids, keys))
+        keys, ids = keys[order], ids[order]
+        # Different deletions often give the same string; keep each (key, word) once.
+        distinct = np.ones(len(keys), dtype=bool)
+        distinct[1:] = (keys[1:] != keys[:-1]) | (ids[1:] != ids[:-1])
+        keys, ids = keys[distinct], ids[distinct]
+        first = np.ones(len(keys), dtype=bool)  # empty for an empty dictionary
+        first[1:] = keys[1:] != keys[:-1]
+        starts = np.flatnonzero(first)
+        indptr = np.r_[starts, len(keys)].astype(np.int64)
+        id_dtype = np.int32 if len(words) < 2**31 else np.int64
+        return cls(*cls._pack(words), keys[starts], indptr, ids.astype(id_dtype), max_distance, prefix_length)
+    
+    def lookup(self, word: str, max_distance: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Dictionary words within max_distance (at most the build's) edits of word, closest first."""
+        k = self.max_distance if max_distance is None else max_distance
+        if k > self.max_distance:
+            raise ValueError(f"index was built for max_distance <= {self.max_distance}")
+        hashes = _word_delete_hashes(word, self.prefix_length, k)
+        slots = np.searchsorted(self.keys, hashes)
+        inside = slots < len(self.keys)
+        slots = slots[inside][self.keys[slots[inside]] == hashes[inside]]
+        if not len(slots):
+            return []
+        starts, ends = self.indptr[slots], self.indptr[slots + 1]
+        candidates = np.unique(np.concatenate([self.word_ids[s:e] for s, e in zip(starts.tolist(), ends.tolist())]))
+        candidates = candidates[np.abs(self.lengths[candidates] - len(word)) <= k]
+        candidates = [self.word(i) for i in candidates.tolist()]
+        distances = edit_distance_batch([word] * len(candidates), candidates, k)
+        matches = [(candidates[i], int(distances[i])) for i in np.flatnonzero(distances >= 0)]
+        return sorted(matches, key=lambda match: (match[1], match[0]))
+    
+    def save(self, directory: str):
+        """Write the index as .npy files into directory."""
+        self._save_arrays(directory, keys=self.keys, indptr=self.indptr, word_ids=self.word_ids,
+                          params=np.array([self.max_distance, self.prefix_length]))
+    
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "SymmetricDeleteIndex":
+        *arrays, params = cls._load_arrays(
+            directory, ["blob", "offsets", "lengths", "keys", "indptr", "word_ids", "params"], mmap)
+        return cls(*arrays, *params.tolist())
+
+def build_fuzzy_index(words: List[str], backend: str = "symmetric-delete", max_distance: int = 2):
+    """Build a BKTree ("bk-tree") or SymmetricDeleteIndex ("symmetric-delete") over words."""
+    if backend == "bk-tree":
+        return BKTree.build(words)
+    if backend == "symmetric-delete":
+        return SymmetricDeleteIndex.build(words, max_distance)
+    raise ValueError(f"unknown backend: {backend!r}")
+
+def load_fuzzy_index(directory: str, mmap: bool = True):
+    """Load an index saved by either backend's save()."""
+    backend = str(np.load(os.path.join(directory, "backend.npy")))
+    return {"BKTree": BKTree, "SymmetricDeleteIndex": SymmetricDeleteIndex}[backend].load(directory, mmap)
+
+def benchmark_fuzzy_lookup(num_words: int = 300_000, num_queries: int = 200, max_distance: int = 2):
+    """Brute-force scans vs. the BK-tree and symmetric-delete indexes."""
+    rng = random.Random(0)
+    letters = "etaoinshrdlcumwfgypbvkjxqz"
+    words = list(dict.fromkeys("".join(rng.choices(letters, weights=range(26, 0, -1), k=rng.randint(4, 12)))
+                               for _ in range(num_words)))
+    
+    def typo(word):
+        position = rng.randrange(len(word))
+        edit = rng.choice(["delete", "insert", "replace"])
+        if edit == "delete":
+            return word[:position] + word[position + 1:]
+        return word[:position] + rng.choice(letters) + word[position + (edit == "replace"):]
+    queries = [typo(rng.choice(words)) for _ in range(num_queries)]
+    print(f"\nFuzzy lookup in {len(words):,} words, max distance {max_distance}:")
+    
+    def per_query(lookup, queries):
+        start_time = timeit.default_timer()
+        results = [lookup(query) for query in queries]
+        return results, (timeit.default_timer() - start_time) / len(queries)
+    
+    scan_queries = queries[:5]
+    _, elapsed = per_query(lambda q: [w for w in words if edit_distance_bitparallel(q, w, max_distance) is not None],
+                           scan_queries)
+    print(f"  {'Scan, one pair at a time':<28} {elapsed * 1e3:9.2f} ms per query")
+    expected, elapsed = per_query(lambda q: np.flatnonzero(edit_distance_batch([q] * len(words), words, max_distance) >= 0),
+                                  scan_queries)
+    print(f"  {'Scan, edit_distance_batch':<28} {elapsed * 1e3:9.2f} ms per query")
+    expected = [sorted(words[i] for i in found) for found in expected]
+    
+    for backend in ("bk-tree", "symmetric-delete"):
+        start_time = timeit.default_timer()
+        index = build_fuzzy_index(words, backend, max_distance)
+        build_time = timeit.default_timer() - start_time
+        results, elapsed = per_query(lambda q: index.lookup(q, max_distance), queries)
+        agree = all(sorted(w for w, _ in results[i]) == expected[i] for i in range(len(scan_queries)))
+        _, elapsed_one = per_query(lambda q: index.lookup(q, 1), queries)
+        print(f"  {backend:<28} {elapsed * 1e3:9.2f} ms per query ({elapsed_one * 1e3:.2f} ms for distance 1; "
+              f"build {build_time:.1f} s, matches the scan: {agree})")
+
+# Longest increasing subsequence in O(n log n)
+# --------------------------------------------
+# Patience sorting keeps tails[l] = the smallest value that ends an increasing
+# subsequence of length l + 1. The tails are sorted, so each new element binary-searches
+# the first tail it does not extend (bisect_left for strictly increasing, bisect_right
+# for non-decreasing) and replaces it; the number of tails is the LIS length. Recording,
+# for every element, the element that was the previous tail at that point (its parent)
+# lets the subsequence be read back from the last tail. For NumPy arrays of numbers the
+# same loop runs compiled with Numba, which handles 10M elements in about a second.
+
+@jit(nopython=True)
+def _lis_kernel(values: np.ndarray, strict: bool) -> np.ndarray:
+    n = len(values)
+    tail_values = np.empty(n, dtype=values.dtype)
+    tail_index = np.empty(n, dtype=np.int64)
+    parent = np.empty(n, dtype=np.int64)
+    length = 0
+    for i in range(n):
+        x = values[i]
+        low, high = 0, length
+        while low < high:
+            middle = (low + high) // 2
+            if tail_values[middle] < x or (not strict and tail_values[middle] == x):
+                low = middle + 1
+            else:
+                high = middle
+        tail_values[low] = x
+        tail_index[low] = i
+        parent[i] = tail_index[low - 1] if low > 0 else -1
+        if low == length:
+            length += 1
+    indices = np.empty(length, dtype=np.int64)
+    k = tail_index[length - 1] if length else -1
+    for j in range(length - 1, -1, -1):
+        indices[j] = k
+        k = parent[k]
+    return indices
+
+def lis_indices(seq, key: Callable = None, strict: bool = True) -> List[int]:
+    """
+    Indices of a longest increasing subsequence of seq.
+    
+    Args:
+    seq: Any sequence (NumPy arrays of numbers use the compiled kernel)
+    key (Callable): Compare key(x) instead of x
+    strict (bool): Strictly increasing (True) or non-decreasing (False)
+    
+    Time Complexity: O(n log L), L the LIS length
+    Space Complexity: O(n)
+    """
+    if key is None and isinstance(seq, np.ndarray) and seq.ndim == 1 and np.issubdtype(seq.dtype, np.number):
+        return _lis_kernel(seq, strict).tolist()
+    search = bisect.bisect_left if strict else bisect.bisect_right
+    tail_keys, tail_index, parent = [], [], []
+    for i, x in enumerate(seq):
+        k = x if key is None else key(x)
+        position = search(tail_keys, k)
+        if position == len(tail_keys):
+            tail_keys.append(k)
+            tail_index.append(i)
+        else:
+            tail_keys[position] = k
+            tail_index[position] = i
+        parent.append(tail_index[position - 1] if position else -1)
+    indices = []
+    i = tail_index[-1] if tail_index else -1
+    while i >= 0:
+        indices.append(i)
+        i = parent[i]
+    return indices[::-1]
+
+def longest_increasing_subsequence(seq, key: Callable = None, strict: bool = True) -> list:
+    """A longest increasing (strict=False: non-decreasing) subsequence of seq, as a list of its elements."""
+    return [seq[i] for i in lis_indices(seq, key, strict)]
+
+class StreamingLIS:
+    """
+    LIS of a sequence that arrives one element at a time.
+    
+    push() is O(log L); length and tails are always current. With keep_history=True
+    every element's parent is kept (O(n) memory) so sequence() can rebuild the LIS;
+    otherwise only the O(L) tails are stored.
+    """
+    
+    def __init__(self, key: Callable = None, strict: bool = True, keep_history: bool = True):
+        self.key = key
+        self._search = bisect.bisect_left if strict else bisect.bisect_right
+        self.keep_history = keep_history
+        self.tails = []  # keys of the smallest tails
+        self._tail_index = []
+        self._items = []
+        self._parent = []
+        self._count = 0
+    
+    def push(self, x) -> int:
+        """Add the next element; returns the length of the longest subsequence ending at it."""
+        k = x if self.key is None else self.key(x)
+        position = self._search(self.tails, k)
+        if position == len(self.tails):
+            self.tails.append(k)
+            self._tail_index.append(self._count)
+        else:
+            self.tails[position] = k
+            self._tail_index[position] = self._count
+        if self.keep_history:
+            self._items.append(x)
+            self._parent.append(self._tail_index[position - 1] if position else -1)
+        self._count += 1
+        return position + 1
+    
+    def extend(self, iterable):
+        for x in iterable:
+            self.push(x)
+    
+    @property
+    def length(self) -> int:
+        return len(self.tails)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def sequence(self) -> list:
+        """The current LIS (needs keep_history=True)."""
+        if not self.keep_history:
+            raise ValueError("sequence() needs keep_history=True")
+        result = []
+        i = self._tail_index[-1] if self._tail_index else -1
+        while i >= 0:
+            result.append(self._items[i])
+            i = self._parent[i]
+        return result[::-1]
+
+def max_nested_envelopes(envelopes) -> List[int]:
+    """
+    Longest chain of envelopes (width, height) each strictly inside the next (Russian
+    doll envelopes); returns their indices from the innermost out.
+    
+    Sorting by width ascending and, for equal widths, height descending means any
+    increasing run of heights uses strictly increasing widths, so the answer is a
+    strict LIS over the heights.
+    Time Complexity: O(n log n)
+    """
+    envelopes = np.asarray(envelopes)
+    if len(envelopes) == 0:
+        return []
+    widths, heights = envelopes[:, 0], envelopes[:, 1]
+    order = np.lexsort((-heights, widths))
+    return order[_lis_kernel(np.ascontiguousarray(heights[order]), True)].tolist()
+
+def benchmark_lis(n: int = 10_000_000, python_n: int = 1_000_000, quadratic_n: int = 5_000):
+    """The O(n^2) DP vs. patience sorting with bisect and with the compiled kernel."""
+    def lis_quadratic(arr):
+        # The textbook DP, as in QuickStart.
+        dp = [1] * len(arr)
+        for i in range(1, len(arr)):
+            for j in range(i):
+                if arr[i] > arr[j]:
+                    dp[i] = max(dp[i], dp[j] + 1)
+        return max(dp)
+    
+    def timed(function, *args):
+        start_time = timeit.default_timer()
+        result = function(*args)
+        return result, timeit.default_timer() - start_time
+    
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 10**9, n)
+    _lis_kernel(values[:10], True)  # compile outside the timings
+    print("\nLongest increasing subsequence:")
+    length, elapsed = timed(lis_quadratic, values[:quadratic_n].tolist())
+    print(f"  {quadratic_n:>12,} elements, O(n^2) DP:         length {length:>6}, {elapsed:.3f} seconds")
+    python_values = values[:python_n].tolist()
+    indices, elapsed = timed(lis_indices, python_values)
+    print(f"  {python_n:>12,} elements, bisect:            length {len(indices):>6}, {elapsed:.3f} seconds")
+    indices, elapsed = timed(lis_indices, values)
+    print(f"  {n:>12,} elements, compiled kernel:   length {len(indices):>6}, {elapsed:.3f} seconds")
+    stream = StreamingLIS(keep_history=False)
+    _, elapsed = timed(stream.extend, python_values)
+    print(f"  {python_n:>12,} elements, StreamingLIS:      length {stream.length:>6}, "
+          f"{elapsed / python_n * 1e9:.0f} ns per push")
+    envelopes = rng.integers(1, 10**6, (n // 10, 2))
+    chain, elapsed = timed(max_nested_envelopes, envelopes)
+    print(f"  {n // 10:>12,} envelopes, nesting:          length {len(chain):>6}, {elapsed:.3f} seconds")
+
+# Seam carving with NumPy
+# -----------------------
+# seam_carving above recomputes the energy and the DP in Python loops for every seam.
+# seam_carve keeps the image as an array: the energy is |I(x+1) - I(x-1)| + |I(y+1) - I(y-1)|
+# summed over channels (edges replicated), computed with shifted slices; the
+# cumulative-cost DP is one vectorized minimum of three shifted copies of the previous
+# row per image row, and the seam is traced back up by picking the cheapest of the three
+# cells above. Removing a seam only changes the energy of the pixels whose left/right or
+# up/down neighbors changed, which are the two columns next to the seam in each row, so
+# only those are recomputed. Several seams can be removed per DP pass: every bottom pixel
+# is traced back at once, the cheapest pixel-disjoint seams are removed together, trading
+# some quality for fewer passes.
+
+def gradient_energy(image: np.ndarray) -> np.ndarray:
+    """Energy |dI/dx| + |dI/dy| (central differences, summed over channels) of an (h, w[, c]) image."""
+    pixels = image.astype(np.float32)
+    if pixels.ndim == 2:
+        pixels = pixels[:, :, None]
+    padded = np.pad(pixels, ((1, 1), (1, 1), (0, 0)), mode="edge")
+    dx = np.abs(padded[1:-1, 2:] - padded[1:-1, :-2])
+    dy = np.abs(padded[2:, 1:-1] - padded[:-2, 1:-1])
+    return (dx + dy).sum(axis=2)
+
+def _energy_at(cells: np.ndarray, dtype: np.dtype, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """gradient_energy at the given pixels only; cells holds one opaque item per pixel."""
+    height, width = cells.shape
+    left, right = np.maximum(columns - 1, 0), np.minimum(columns + 1, width - 1)
+    up, down = np.maximum(rows - 1, 0), np.minimum(rows + 1, height - 1)
+    def values(r, c):
+        return cells[r, c].view(dtype).reshape(len(r), -1).astype(np.float32)
+    dx = np.abs(values(rows, right) - values(rows, left))
+    dy = np.abs(values(down, columns) - values(up, columns))
+    return (dx + dy).sum(axis=1)
+
+def _cumulative_energy(energy: np.ndarray) -> np.ndarray:
+    """Cheapest seam cost ending at every pixel, padded with an inf column on each side."""
+    height, width = energy.shape
+    cost = np.full((height, width + 2), np.inf, dtype=energy.dtype)
+    cost[0, 1:-1] = energy[0]
+    best = np.empty(width, dtype=energy.dtype)
+    for i in range(1, height):
+        above = cost[i - 1]
+        np.minimum(above[:-2], above[2:], out=best)
+        np.minimum(best, above[1:-1], out=best)
+        np.add(energy[i], best, out=cost[i, 1:-1])
+    return cost
+
+def _trace_seams(cost: np.ndarray, count: int) -> np.ndarray:
+    """Up to count pixel-disjoint seams, cheapest first, as an (h, seams) array of columns."""
+    height = cost.shape[0]
+    width = cost.shape[1] - 2
+    if count == 1:
+        seam = np.empty((height, 1), dtype=np.int64)
+        j = int(cost[-1].argmin())
+        for i in range(height - 1, 0, -1):
+            seam[i, 0] = j - 1
+            j += int(cost[i - 1, j - 1:j + 2].argmin()) - 1
+        seam[0, 0] = j - 1
+        return seam
+    # Traced upward, two seams that meet follow the same path from there on (and seams
+    # never cross), so tracing every bottom pixel at once and keeping the cheaper seam
+    # wherever two meet leaves only pixel-disjoint seams.
+    window = np.array([-1, 0, 1])
+    totals = cost[-1, 1:-1]
+    position = np.arange(1, width + 1)
+    owner = np.arange(width)
+    for i in range(height - 1, 0, -1):
+        position += cost[i - 1, position[:, None] + window].argmin(axis=1) - 1
+        starts = np.flatnonzero(np.diff(position, prepend=-1))
+        if len(starts) < len(position):
+            run = np.repeat(np.arange(len(starts)), np.diff(starts, append=len(position)))
+            cheapest = np.lexsort((totals[owner], run))[starts]
+            position, owner = position[cheapest], owner[cheapest]
+    ends = owner[np.argsort(totals[owner], kind="stable")[:count]]
+    paths = np.empty((height, len(ends)), dtype=np.int64)
+    paths[-1] = ends + 1
+    for i in range(height - 1, 0, -1):
+        paths[i - 1] = paths[i] - 1 + cost[i - 1, paths[i][:, None] + window].argmin(axis=1)
+    return paths - 1
+
+def seam_carve(image: np.ndarray, num_seams: int, axis: int = 1, seams_per_pass: int = 1) -> np.ndarray:
+    """
+    Content-aware resizing by removing low-energy seams.
+    
+    Args:
+    image (np.ndarray): An (h, w) or (h, w, c) image
+    num_seams (int): Number of pixels to remove along axis
+    axis (int): 1 removes vertical seams (narrower), 0 horizontal seams (shorter)
+    seams_per_pass (int): Seams removed per energy/DP pass (1 is exact greedy carving)
+    
+    Returns:
+    np.ndarray: The carved image, same dtype and channels.
+    Time Complexity: O(h * w) array work per pass, O(h) for the energy update per seam
+    """
+    if axis == 0:
+        return np.swapaxes(seam_carve(np.swapaxes(image, 0, 1), num_seams, 1, seams_per_pass), 0, 1)
+    if not 0 <= num_seams < image.shape[1]:
+        raise ValueError("num_seams must be between 0 and the image width - 1")
+    height, width = image.shape[:2]
+    channels = image.reshape(height, width, -1)
+    energy = gradient_energy(channels)
+    # One opaque item per pixel, so removing seams moves whole pixels in a single pass.
+    cells = np.ascontiguousarray(channels).view(
+        np.dtype((np.void, channels.shape[2] * channels.itemsize))).reshape(height, width)
+    rows = np.arange(height)
+    
+    removed = 0
+    while removed < num_seams:
+        seams = _trace_seams(_cumulative_energy(energy), min(seams_per_pass, num_seams - removed))
+        seams.sort(axis=1)
+        k = seams.shape[1]
+        keep = np.ones((height, width), dtype=bool)
+        keep[rows[:, None], seams] = False
+        width -= k
+        cells = cells[keep].reshape(height, width)
+        energy = energy[keep].reshape(height, width)
+        # New columns next to each removed pixel: its left neighbor and the one that slid in.
+        shifted = seams - np.arange(k)
+        near = np.concatenate((shifted - 1, shifted), axis=1).clip(0, width - 1).ravel()
+        near_rows = np.repeat(rows, 2 * k)
+        energy[near_rows, near] = _energy_at(cells, image.dtype, near_rows, near)
+        removed += k
+    return cells.view(image.dtype).reshape((height, width) + image.shape[2:])
+
+def benchmark_seam_carving(small: Tuple[int, int] = (60, 80), small_seams: int = 10,
+                           large: Tuple[int, int] = (1080, 1920), large_seams: int = 384):
+    """The list-based seam_carving vs. seam_carve, then a 1080p frame carved to 80% width."""
+    def timed(function, *args):
+        start_time = timeit.default_timer()
+        result = function(*args)
+        return result, timeit.default_timer() - start_time
+    
+    rng = np.random.default_rng(0)
+    print("\nSeam carving:")
+    image = rng.integers(0, 256, small, dtype=np.uint8)
+    _, elapsed = timed(seam_carving, image.tolist(), small_seams)
+    print(f"  {small[1]}x{small[0]}, {small_seams} seams, nested lists:          {elapsed:.3f} seconds")
+    _, elapsed = timed(seam_carve, image, small_seams)
+    print(f"  {small[1]}x{small[0]}, {small_seams} seams, NumPy:                 {elapsed:.3f} seconds")
+    # A smooth gradient with noise, so seams have structure to follow.
+    height, width = large
+    frame = (np.linspace(0, 200, width)[None, :, None] + rng.normal(0, 20, (height, width, 3)))
+    frame = frame.clip(0, 255).astype(np.uint8)
+    for seams_per_pass in (1, 16):
+        carved, elapsed = timed(seam_carve, frame, large_seams, 1, seams_per_pass)
+        print(f"  {width}x{height} -> {carved.shape[1]}x{carved.shape[0]}, "
+              f"{seams_per_pass:>2} seam(s) per pass:   {elapsed:.3f} seconds")
+    carved, elapsed = timed(seam_carve, frame, large_seams // 2, 0, 16)
+    print(f"  {width}x{height} -> {carved.shape[1]}x{carved.shape[0]}, horizontal, 16 per pass: {elapsed:.3f} seconds")
+
+# Vectorized tabular reinforcement learning
+# -----------------------------------------
+# q_learning above keeps Q in a dict and plays one episode at a time, so every step pays
+# for Python-level dict lookups and a max over actions. With the states numbered 0..S-1
+# Q is a dense (S, A) array, the grid world's moves are a precomputed (S, A) table of next
+# states, and N independent copies of the environment can be stepped with one gather.
+# Epsilon-greedy selection, the TD targets and the update are then array operations over
+# all N copies. Copies that visit the same (state, action) in a step get the mean of their
+# TD errors, accumulated with np.bincount, so a large N doesn't multiply the learning rate.
+# When the transition model is known, value_iteration solves it directly.
+
+class GridWorldBatch:
+    """
+    num_envs independent copies of a rows x cols grid world, stepped together.
+    
+    Actions are 0 Up, 1 Right, 2 Down, 3 Left; moving into the border stays put. Reaching
+    goal gives reward 1 and ends the episode. With probability slip the move is replaced by
+    a random action. Finished or truncated copies restart at start, so step() can be called
+    indefinitely.
+    """
+    
+    num_actions = 4
+    
+    def __init__(self, num_envs: int, rows: int = 4, cols: int = 4, start: int = 0, goal: Optional[int] = None,
+                 slip: float = 0.0, max_episode_steps: Optional[int] = None, seed: Optional[int] = None):
+        self.num_envs = num_envs
+        self.num_states = rows * cols
+        self.start = start
+        self.goal = self.num_states - 1 if goal is None else goal
+        self.slip = slip
+        self.max_episode_steps = max_episode_steps
+        self.rng = np.random.default_rng(seed)
+        row, col = np.divmod(np.arange(self.num_states), cols)
+        self.next_state = np.stack([
+            np.where(row > 0, row - 1, row) * cols + col,
+            row * cols + np.where(col < cols - 1, col + 1, col),
+            np.where(row < rows - 1, row + 1, row) * cols + col,
+            row * cols + np.where(col > 0, col - 1, col),
+        ], axis=1)
+        self.next_state[self.goal] = self.goal
+        self.reward = (self.next_state == self.goal).astype(np.float64)
+        self.reward[self.goal] = 0.0
+        self.states = np.full(num_envs, start)
+        self.elapsed = np.zeros(num_envs, dtype=np.int64)
+    
+    def reset(self) -> np.ndarray:
+        self.states[:] = self.start
+        self.elapsed[:] = 0
+        return self.states.copy()
+    
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Apply one action per copy.
+        
+        Returns:
+        Tuple: (next_states, rewards, terminated, observations); next_states are the states
+        the actions led to, observations are where each copy continues (start after a reset).
+        """
+        if self.slip:
+            slipped = self.rng.random(self.num_envs) < self.slip
+            actions = np.where(slipped, self.rng.integers(0, self.num_actions, self.num_envs), actions)
+        next_states = self.next_state[self.states, actions]
+        rewards = self.reward[self.states, actions]
+        terminated = next_states == self.goal
+        self.elapsed += 1
+        done = terminated
+        if self.max_episode_steps is not None:
+            done = done | (self.elapsed >= self.max_episode_steps)
+        self.states = np.where(done, self.start, next_states)
+        self.elapsed[done] = 0
+        return next_states, rewards, terminated, self.states.copy()
+    
+    def transition_model(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Dense P[s, a, s'] and expected reward R[s, a], including slip."""
+        S, A = self.num_states, self.num_actions
+        P = np.zeros((S, A, S))
+        R = np.zeros((S, A))
+        for taken in range(A):
+            weight = np.full(A, self.slip / A)
+            weight[taken] += 1.0 - self.slip
+            for a in range(A):
+                P[np.arange(S), taken, self.next_state[:, a]] += weight[a]
+                R[:, taken] += weight[a] * self.reward[:, a]
+        P[self.goal] = 0.0  # absorbing: no future value from the goal
+        return P, R
+
+def epsilon_greedy(Q: np.ndarray, states: np.ndarray, epsilon: float, rng: np.random.Generator) -> np.ndarray:
+    """One action per state: a random one with probability epsilon, else a greedy one (ties broken at random)."""
+    values = Q[states]
+    greedy = np.argmax(rng.random(values.shape) * (values == values.max(axis=1, keepdims=True)), axis=1)
+    explore = rng.random(len(states)) < epsilon
+    return np.where(explore, rng.integers(0, Q.shape[1], len(states)), greedy)
+
+def q_learning_batch(env: GridWorldBatch, num_steps: int, learning_rate: float, discount_factor: float,
+                     epsilon: float, Q: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Q-learning on all copies of env at once.
+    
+    Args:
+    env (GridWorldBatch): The batched environment
+    num_steps (int): Number of batched steps (env.num_envs transitions each)
+    learning_rate (float): Step size of the TD update
+    discount_factor (float): Discount applied to the next state's value
+    epsilon (float): Exploration probability
+    Q (Optional[np.ndarray]): Initial (S, A) table, zeros by default
+    
+    Returns:
+    np.ndarray: The learned (S, A) Q-table.
+    """
+    S, A = env.num_states, env.num_actions
+    Q = np.zeros((S, A)) if Q is None else Q
+    states = env.reset()
+    for _ in range(num_steps):
+        actions = epsilon_greedy(Q, states, epsilon, env.rng)
+        next_states, rewards, terminated, states_after = env.step(actions)
+        targets = rewards + discount_factor * np.where(terminated, 0.0, Q[next_states].max(axis=1))
+        cells = states * A + actions
+        td_sum = np.bincount(cells, weights=targets - Q.ravel()[cells], minlength=S * A)
+        visits = np.bincount(cells, minlength=S * A)
+        Q += learning_rate * (td_sum / np.maximum(visits, 1)).reshape(S, A)
+        states = states_after
+    return Q
+
+def value_iteration(P: np.ndarray, R: np.ndarray, discount_factor: float, tol: float = 1e-10,
+                    max_iterations: int = 10_000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Optimal state values and a greedy policy for a known model.
+    
+    Args:
+    P (np.ndarray): Transition probabilities P[s, a, s']
+    R (np.ndarray): Expected rewards R[s, a]
+    discount_factor (float): Discount factor below 1
+    tol (float): Stop when no value changes by more than this
+    
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: (V, policy)
+    Time Complexity: O(S^2 * A) per sweep
+    """
+    V = np.zeros(P.shape[0])
+    for _ in range(max_iterations):
+        Q = R + discount_factor * (P @ V)
+        V_new = Q.max(axis=1)
+        if np.max(np.abs(V_new - V)) <= tol:
+            V = V_new
+            break
+        V = V_new
+    return V, (R + discount_factor * (P @ V)).argmax(axis=1)
+
+def benchmark_q_learning(rows: int = 8, cols: int = 8, num_envs: int = 4096, num_steps: int = 2_000,
+                         python_steps: int = 200_000):
+    """Dict-based Q-learning one step at a time vs. the batched version, in environment steps per second."""
+    def timed(function, *args):
+        start_time = timeit.default_timer()
+        result = function(*args)
+        return result, timeit.default_timer() - start_time
+    
+    def q_learning_dict(env, steps, learning_rate, discount_factor, epsilon):
+        # q_learning's loop, on env's moves and counting steps instead of episodes.
+        moves = env.next_state.tolist()
+        Q = {(s, a): 0.0 for s in range(env.num_states) for a in range(env.num_actions)}
+        state = env.start
+        for _ in range(steps):
+            if random.random() < epsilon:
+                action = random.randint(0, 3)
+            else:
+                action = max(range(env.num_actions), key=lambda a: Q[(state, a)])
+            next_state = moves[state][action]
+            reward = 1 if next_state == env.goal else 0
+            best_next = 0.0 if next_state == env.goal else max(Q[(next_state, a)] for a in range(env.num_actions))
+            Q[(state, action)] += learning_rate * (reward + discount_factor * best_next - Q[(state, action)])
+            state = env.start if next_state == env.goal else next_state
+        return Q
+    
+    def optimal_share(Q, V):
+        # Fraction of non-goal states whose greedy action is optimal under the exact values.
+        action_values = R + 0.9 * (P @ V)
+        chosen = action_values[np.arange(len(Q)), Q.argmax(axis=1)]
+        optimal = np.isclose(chosen, action_values.max(axis=1))
+        return np.mean(np.delete(optimal, env.goal))
+    
+    print(f"\nTabular Q-learning ({rows}x{cols} grid, 4 actions):")
+    env = GridWorldBatch(1, rows, cols, max_episode_steps=4 * rows * cols, seed=0)
+    P, R = env.transition_model()
+    (V, _), elapsed = timed(value_iteration, P, R, 0.9)
+    print(f"  value iteration:                      {elapsed * 1000:.2f} ms, V[start] = {V[env.start]:.4f}")
+    
+    random.seed(0)
+    _, elapsed = timed(q_learning_dict, env, python_steps, 0.1, 0.9, 0.2)
+    print(f"  dict, one environment:                {python_steps / elapsed:>12,.0f} steps/s")
+    _, elapsed = timed(q_learning_batch, env, python_steps // 20, 0.1, 0.9, 0.2)
+    print(f"  NumPy, one environment:               {python_steps // 20 / elapsed:>12,.0f} steps/s")
+    env = GridWorldBatch(num_envs, rows, cols, max_episode_steps=4 * rows * cols, seed=0)
+    Q, elapsed = timed(q_learning_batch, env, num_steps, 0.5, 0.9, 0.2)
+    print(f"  NumPy, {num_envs} environments:           {num_envs * num_steps / elapsed:>12,.0f} steps/s, "
+          f"greedy policy optimal in {optimal_share(Q, V):.0%} of states")
+
 # 9. How to Contribute
 # --------------------
 # To contribute to this note sheet:
@@ -521,6 +2001,429 @@ def demonstrate_performance_analysis():
 
 # Your contributions help keep this resource valuable for Python developers at all levels. Thank you for your interest in improving this note sheet!
 
+# Unit Tests
+class TestKnapsack(unittest.TestCase):
+    def brute_force(self, W, wt, val, counts=None):
+        """Best value over every combination of copies."""
+        limits = [1 if counts is None else W // w if c is None else c for w, c in zip(wt, counts or wt)]
+        best = 0
+        for copies in itertools.product(*(range(limit + 1) for limit in limits)):
+            if sum(c * w for c, w in zip(copies, wt)) <= W:
+                best = max(best, sum(c * v for c, v in zip(copies, val)))
+        return best
+    
+    def assertSolution(self, W, wt, val, counts, result, expected):
+        value, chosen = result
+        self.assertEqual(value, expected)
+        self.assertLessEqual(sum(wt[i] for i in chosen), W)
+        self.assertEqual(sum(val[i] for i in chosen), value)
+        for item, copies in Counter(chosen).items():
+            limit = 1 if counts is None else counts[item]
+            if limit is not None:
+                self.assertLessEqual(copies, limit)
+    
+    def test_zero_one(self):
+        rng = random.Random(0)
+        for trial in range(60):
+            n, W = rng.randint(1, 10), rng.randint(0, 60)
+            wt = [rng.randint(1, 25) for _ in range(n)]
+            val = [rng.randint(0, 30) for _ in range(n)]
+            expected = self.brute_force(W, wt, val)
+            with self.subTest(trial=trial):
+                self.assertEqual(knapsack_dp(W, wt, val), expected)
+                for result in (knapsack_rolling(W, wt, val), knapsack_meet_in_middle(W, wt, val),
+                               solve_knapsack(W, wt, val)):
+                    self.assertSolution(W, wt, val, None, result, expected)
+    
+    def test_bounded_unbounded_and_mixed(self):
+        rng = random.Random(1)
+        for trial in range(60):
+            n, W = rng.randint(1, 5), rng.randint(0, 40)
+            wt = [rng.randint(1, 12) for _ in range(n)]
+            val = [rng.randint(0, 20) for _ in range(n)]
+            for kind in ("bounded", "unbounded", "mixed"):
+                if kind == "bounded":
+                    counts = [rng.randint(0, 6) for _ in range(n)]
+                elif kind == "unbounded":
+                    counts = [None] * n
+                else:
+                    counts = [rng.choice([None, 0, 1, 2, 5]) for _ in range(n)]
+                with self.subTest(trial=trial, kind=kind, counts=counts):
+                    self.assertSolution(W, wt, val, counts, knapsack_rolling(W, wt, val, counts),
+                                        self.brute_force(W, wt, val, counts))
+    
+    def test_float_values(self):
+        wt, val = [3, 4, 5], [1.5, 2.25, 2.5]
+        value, chosen = knapsack_rolling(8, wt, val)
+        self.assertAlmostEqual(value, 4.0)
+        self.assertEqual(sorted(chosen), [0, 2])
+        self.assertAlmostEqual(knapsack_meet_in_middle(8, wt, val)[0], 4.0)
+    
+    def test_empty_and_zero_capacity(self):
+        self.assertEqual(knapsack_rolling(10, [], []), (0, []))
+        self.assertEqual(knapsack_rolling(0, [2, 3], [5, 6]), (0, []))
+        self.assertEqual(knapsack_rolling(0, [2], [5], [None]), (0, []))
+        self.assertEqual(knapsack_meet_in_middle(10, [], []), (0, []))
+        self.assertEqual(knapsack_meet_in_middle(0, [2, 3], [5, 6]), (0, []))
+        with self.assertRaises(ValueError):
+            knapsack_rolling(10, [0, 2], [1, 1])
+        with self.assertRaises(ValueError):
+            solve_knapsack(10, [2], [1], [3], method="meet-in-the-middle")
+    
+    def test_subset_sum(self):
+        rng = random.Random(2)
+        for trial in range(60):
+            nums = [rng.randint(0, 30) for _ in range(rng.randint(0, 10))]
+            reachable = {sum(c) for r in range(len(nums) + 1) for c in itertools.combinations(nums, r)}
+            limit = rng.randint(0, 100)
+            bits = subset_sums_bitset(nums, limit)
+            self.assertEqual({s for s in range(limit + 1) if bits >> s & 1}, {s for s in reachable if s <= limit})
+            for target in (0, limit, rng.randint(0, 150)):
+                with self.subTest(trial=trial, nums=nums, target=target):
+                    chosen = subset_sum_bitset(nums, target)
+                    if target not in reachable:
+                        self.assertIsNone(chosen)
+                        continue
+                    self.assertEqual(len(set(chosen)), len(chosen))
+                    self.assertEqual(sum(nums[i] for i in chosen), target)
+        with self.assertRaises(ValueError):
+            subset_sum_bitset([1, -2], 3)
+
+class TestSequenceComparison(unittest.TestCase):
+    def tables(self, X, Y):
+        """LCS length and edit distance from the full (m + 1) x (n + 1) tables."""
+        lcs = [[0] * (len(Y) + 1) for _ in range(len(X) + 1)]
+        edit = [[i + j if i == 0 or j == 0 else 0 for j in range(len(Y) + 1)] for i in range(len(X) + 1)]
+        for i in range(1, len(X) + 1):
+            for j in range(1, len(Y) + 1):
+                same = X[i - 1] == Y[j - 1]
+                lcs[i][j] = lcs[i - 1][j - 1] + 1 if same else max(lcs[i - 1][j], lcs[i][j - 1])
+                edit[i][j] = min(edit[i - 1][j - 1] + (not same), edit[i - 1][j] + 1, edit[i][j - 1] + 1)
+        return lcs[-1][-1], edit[-1][-1]
+    
+    def random_pairs(self, rng, count):
+        """Strings over small alphabets (and lists of lines) around the 64-bit word size."""
+        pairs = [("", ""), ("", "abc"), ("kitten", "sitting"), ("a" * 130, "a" * 70 + "b" * 5)]
+        for _ in range(count):
+            alphabet = rng.choice(["ab", "ACGT", "abcdefghij", "äöü€😀x"])
+            X = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 150)))
+            # Similar pairs (a few edits) as well as unrelated ones.
+            Y = "".join(c for c in X if rng.random() > 0.1) if rng.random() < 0.5 else \
+                "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 150)))
+            pairs.append((X, Y))
+        pairs.append(([f"line {i % 7}" for i in range(90)], [f"line {i % 5}" for i in range(80)]))
+        return pairs
+    
+    def test_bitparallel_and_banded(self):
+        for X, Y in self.random_pairs(random.Random(0), 80):
+            lcs, edit = self.tables(X, Y)
+            with self.subTest(X=X, Y=Y):
+                self.assertEqual(lcs_length_bitparallel(X, Y), lcs)
+                self.assertEqual(edit_distance_bitparallel(X, Y), edit)
+                for k in {0, 1, 3, edit - 1, edit, edit + 2} - {-1}:
+                    expected = edit if edit <= k else None
+                    self.assertEqual(edit_distance_bitparallel(X, Y, k), expected)
+                    self.assertEqual(edit_distance_banded(X, Y, k), expected)
+    
+    def test_batch(self):
+        rng = random.Random(1)
+        pairs = [pair for pair in self.random_pairs(rng, 150) if isinstance(pair[0], str)]
+        A, B = [a for a, _ in pairs], [b for _, b in pairs]
+        self.assertTrue(any(min(len(a), len(b)) > 64 for a, b in pairs))
+        expected = np.array([self.tables(a, b)[1] for a, b in pairs])
+        np.testing.assert_array_equal(edit_distance_batch(A, B), expected)
+        np.testing.assert_array_equal(edit_distance_batch(A, B, chunk_size=7), expected)
+        for k in (0, 2, 10):
+            np.testing.assert_array_equal(edit_distance_batch(A, B, k), np.where(expected <= k, expected, -1))
+        with self.assertRaises(ValueError):
+            edit_distance_batch(["a"], [])
+    
+    def assertAlignment(self, X, Y, ops, method, expected_cost):
+        self.assertEqual([i for _, i, _ in ops if i >= 0], list(range(len(X))))
+        self.assertEqual([j for _, _, j in ops if j >= 0], list(range(len(Y))))
+        for op, i, j in ops:
+            self.assertEqual((i >= 0, j >= 0), {"=": (True, True), "X": (True, True),
+                                                "-": (True, False), "+": (False, True)}[op])
+            if op in "=X":
+                self.assertEqual(X[i] == Y[j], op == "=")
+        if method == "lcs":
+            self.assertNotIn("X", [op for op, _, _ in ops])
+            self.assertEqual(sum(op == "=" for op, _, _ in ops), expected_cost)
+        else:
+            self.assertEqual(sum(op != "=" for op, _, _ in ops), expected_cost)
+    
+    def test_alignments(self):
+        rng = random.Random(2)
+        pairs = self.random_pairs(rng, 30)
+        # Long enough for Hirschberg to split instead of using one small table.
+        pairs.append(("".join(rng.choice("ACGT") for _ in range(300)), "".join(rng.choice("ACGT") for _ in range(260))))
+        for X, Y in pairs:
+            lcs, edit = self.tables(X, Y)
+            with self.subTest(X=X, Y=Y):
+                self.assertAlignment(X, Y, align_sequences(X, Y), "lcs", lcs)
+                self.assertAlignment(X, Y, align_sequences(X, Y, "edit"), "edit", edit)
+                common = lcs_hirschberg(X, Y)
+                self.assertEqual(len(common), lcs)
+                for sequence in (X, Y):
+                    remaining = iter(sequence)
+                    self.assertTrue(all(item in remaining for item in common))
+        a, b = ["x", "y", "z"], ["x", "z", "w"]
+        self.assertEqual(diff_lines(a, b), ["  x", "- y", "  z", "+ w"])
+        with self.assertRaises(ValueError):
+            align_sequences("a", "b", "hamming")
+
+class TestFuzzyIndex(unittest.TestCase):
+    @staticmethod
+    def edit_distance(X, Y):
+        row = list(range(len(Y) + 1))
+        for i, x in enumerate(X, 1):
+            previous, row[0] = row[0], i
+            for j, y in enumerate(Y, 1):
+                previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (x != y))
+        return row[-1]
+    
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(0)
+        # A small alphabet makes many words near each other; some are longer than the
+        # 7-character prefix, one is longer than a 64-bit lane, and some repeat.
+        cls.words = ["".join(rng.choice("abcdé") for _ in range(rng.randint(1, 10))) for _ in range(400)]
+        cls.words += ["", "ab" * 40, cls.words[0], "日本語"]
+        typos = []
+        for word in cls.words[:60]:
+            position = rng.randrange(len(word) + 1)
+            typos.append(word[:position] + rng.choice("abcdéx") + word[position + 1:])
+        cls.queries = typos + ["", "x", "abcdabcdabcd", "ab" * 39 + "b", "日本", "日本語"]
+        # Brute-force scan: every word within 2 edits of every query, closest first.
+        cls.scan = {}
+        for query in cls.queries:
+            matches = [(w, cls.edit_distance(query, w)) for w in set(cls.words)]
+            cls.scan[query] = sorted((m for m in matches if m[1] <= 2), key=lambda match: (match[1], match[0]))
+    
+    def brute_force(self, query, k):
+        return [match for match in self.scan[query] if match[1] <= k]
+    
+    def check(self, index):
+        for query in self.queries:
+            for k in range(3):
+                with self.subTest(index=type(index).__name__, query=query, k=k):
+                    self.assertEqual(index.lookup(query, k), self.brute_force(query, k))
+    
+    def test_backends_match_brute_force(self):
+        for backend in ("bk-tree", "symmetric-delete"):
+            index = build_fuzzy_index(self.words, backend, max_distance=2)
+            self.assertEqual(len(index), len(set(self.words)))
+            self.check(index)
+    
+    def test_save_and_load(self):
+        import tempfile
+        for backend in ("bk-tree", "symmetric-delete"):
+            with tempfile.TemporaryDirectory() as directory:
+                build_fuzzy_index(self.words, backend, max_distance=2).save(directory)
+                for mmap in (True, False):
+                    loaded = load_fuzzy_index(directory, mmap=mmap)
+                    self.assertEqual(type(loaded).__name__, {"bk-tree": "BKTree"}.get(backend, "SymmetricDeleteIndex"))
+                    self.check(loaded)
+                    del loaded
+    
+    def test_empty_and_invalid(self):
+        for backend in ("bk-tree", "symmetric-delete"):
+            index = build_fuzzy_index([], backend)
+            self.assertEqual(len(index), 0)
+            self.assertEqual(index.lookup("abc", 2), [])
+        with self.assertRaises(ValueError):
+            build_fuzzy_index(self.words, max_distance=1).lookup("abc", 2)
+        with self.assertRaises(ValueError):
+            build_fuzzy_index(self.words, "trie")
+
+class TestLongestIncreasingSubsequence(unittest.TestCase):
+    @staticmethod
+    def ending_lengths(keys, strict):
+        """O(n^2) DP: the longest increasing subsequence ending at each element."""
+        lengths = []
+        for i, k in enumerate(keys):
+            lengths.append(1 + max((lengths[j] for j in range(i) if (keys[j] < k if strict else keys[j] <= k)),
+                                   default=0))
+        return lengths
+    
+    def assertIncreasing(self, keys, indices, strict):
+        self.assertEqual(indices, sorted(set(indices)))
+        for a, b in zip(indices, indices[1:]):
+            self.assertTrue(keys[a] < keys[b] if strict else keys[a] <= keys[b])
+    
+    def test_against_quadratic_dp(self):
+        rng = np.random.default_rng(0)
+        for trial in range(40):
+            n = int(rng.integers(0, 80))
+            ints = rng.integers(-10, 10 if trial % 2 else 1000, n)  # many duplicates on odd trials
+            inputs = [ints.tolist(), ints, ints.astype(np.int32), ints / 4.0, ints.astype(np.float32)]
+            for strict, seq in itertools.product((True, False), inputs):
+                with self.subTest(trial=trial, strict=strict, kind=type(seq).__name__,
+                                  dtype=getattr(seq, "dtype", None)):
+                    expected = max(self.ending_lengths(list(seq), strict), default=0)
+                    indices = lis_indices(seq, strict=strict)
+                    self.assertEqual(len(indices), expected)
+                    self.assertIncreasing(list(seq), indices, strict)
+                    self.assertEqual(longest_increasing_subsequence(seq, strict=strict), [seq[i] for i in indices])
+    
+    def test_key(self):
+        rng = random.Random(1)
+        words = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 6))) for _ in range(60)]
+        for strict in (True, False):
+            keys = [len(w) for w in words]
+            indices = lis_indices(words, key=len, strict=strict)
+            self.assertEqual(len(indices), max(self.ending_lengths(keys, strict)))
+            self.assertIncreasing(keys, indices, strict)
+            # A key also routes arrays through the Python version: longest decreasing run.
+            values = np.array(keys)
+            indices = lis_indices(values, key=lambda x: -x, strict=strict)
+            self.assertEqual(len(indices), max(self.ending_lengths([-k for k in keys], strict)))
+    
+    def test_streaming(self):
+        rng = random.Random(2)
+        for strict in (True, False):
+            values = [rng.randint(0, 15) for _ in range(120)]
+            expected = self.ending_lengths(values, strict)
+            stream = StreamingLIS(strict=strict)
+            for i, x in enumerate(values):
+                self.assertEqual(stream.push(x), expected[i])
+                self.assertEqual(stream.length, max(expected[:i + 1]))
+                self.assertEqual(len(stream), i + 1)
+            sequence = stream.sequence()
+            self.assertEqual(len(sequence), stream.length)
+            remaining = iter(values)
+            self.assertTrue(all(x in remaining for x in sequence))
+            self.assertTrue(all(a < b if strict else a <= b for a, b in zip(sequence, sequence[1:])))
+        light = StreamingLIS(key=lambda x: -x, keep_history=False)
+        light.extend([5, 3, 4, 1])
+        self.assertEqual(light.length, 3)
+        with self.assertRaises(ValueError):
+            light.sequence()
+    
+    def test_nested_envelopes(self):
+        rng = np.random.default_rng(3)
+        for trial in range(30):
+            envelopes = rng.integers(1, 8, (int(rng.integers(0, 40)), 2))
+            inside = lambda a, b: (envelopes[a] < envelopes[b]).all()
+            by_width = sorted(range(len(envelopes)), key=lambda i: tuple(envelopes[i]))
+            longest = {}
+            for b in by_width:
+                longest[b] = 1 + max((longest[a] for a in longest if inside(a, b)), default=0)
+            with self.subTest(trial=trial):
+                chain = max_nested_envelopes(envelopes)
+                self.assertEqual(len(chain), max(longest.values(), default=0))
+                self.assertTrue(all(inside(a, b) for a, b in zip(chain, chain[1:])))
+        self.assertEqual(max_nested_envelopes([]), [])
+
+class TestSeamCarving(unittest.TestCase):
+    def images(self):
+        rng = np.random.default_rng(0)
+        yield rng.integers(0, 256, (12, 15), dtype=np.uint8)
+        yield rng.integers(0, 256, (9, 14, 3), dtype=np.uint8)
+        yield rng.normal(0, 1, (10, 11, 2)).astype(np.float32)
+        yield rng.integers(-1000, 1000, (8, 13), dtype=np.int16)
+        # Flat regions give many equal-energy ties.
+        yield np.kron(rng.integers(0, 3, (4, 5), dtype=np.uint8), np.ones((3, 3), dtype=np.uint8))
+    
+    def assertRowsAreSubsequences(self, image, carved, axis):
+        if axis == 0:
+            image, carved = np.swapaxes(image, 0, 1), np.swapaxes(carved, 0, 1)
+        for row, carved_row in zip(image, carved):
+            remaining = iter(row.tolist())
+            self.assertTrue(all(pixel in remaining for pixel in carved_row.tolist()))
+    
+    def test_matches_repeated_single_seams(self):
+        for image in self.images():
+            for axis in (1, 0):
+                with self.subTest(shape=image.shape, dtype=image.dtype, axis=axis):
+                    expected = image
+                    for k in range(1, 6):
+                        expected = seam_carve(expected, 1, axis)
+                        np.testing.assert_array_equal(seam_carve(image, k, axis), expected)
+    
+    def test_shape_and_dtype(self):
+        for image in self.images():
+            for axis, seams_per_pass in itertools.product((0, 1), (1, 3, 100)):
+                with self.subTest(shape=image.shape, dtype=image.dtype, axis=axis, seams_per_pass=seams_per_pass):
+                    k = image.shape[axis] // 2
+                    carved = seam_carve(image, k, axis, seams_per_pass)
+                    expected_shape = list(image.shape)
+                    expected_shape[axis] -= k
+                    self.assertEqual(carved.shape, tuple(expected_shape))
+                    self.assertEqual(carved.dtype, image.dtype)
+                    self.assertRowsAreSubsequences(image, carved, axis)
+    
+    def test_limits(self):
+        image = np.arange(20, dtype=np.uint8).reshape(4, 5)
+        np.testing.assert_array_equal(seam_carve(image, 0), image)
+        self.assertEqual(seam_carve(image, 4).shape, (4, 1))
+        with self.assertRaises(ValueError):
+            seam_carve(image, 5)
+        with self.assertRaises(ValueError):
+            seam_carve(image, 4, axis=0)
+
+class TestReinforcementLearning(unittest.TestCase):
+    def optimal_action_values(self, env, discount_factor):
+        P, R = env.transition_model()
+        V, _ = value_iteration(P, R, discount_factor)
+        return R + discount_factor * (P @ V)
+    
+    def assertGreedyOptimal(self, Q, action_values, goal, tolerance=1e-8):
+        chosen = action_values[np.arange(len(Q)), Q.argmax(axis=1)]
+        optimal = chosen >= action_values.max(axis=1) - tolerance
+        self.assertTrue(np.delete(optimal, goal).all(), np.flatnonzero(~optimal).tolist())
+    
+    def test_transition_model(self):
+        for rows, cols, slip, goal in [(4, 4, 0.0, None), (4, 4, 0.3, None), (3, 5, 0.5, 7)]:
+            env = GridWorldBatch(20_000, rows, cols, goal=goal, slip=slip, seed=0)
+            P, R = env.transition_model()
+            sums = P.sum(axis=2)
+            # Every row is a distribution, except the absorbing goal's (no future value).
+            np.testing.assert_allclose(np.delete(sums, env.goal, axis=0), 1.0)
+            np.testing.assert_array_equal(sums[env.goal], 0.0)
+            for state, action in [(0, 0), (0, 2), (env.num_states - 2, 1), (cols + 1, 3)]:
+                if state == env.goal:
+                    continue
+                with self.subTest(rows=rows, cols=cols, slip=slip, state=state, action=action):
+                    env.states[:] = state
+                    next_states, rewards, _, _ = env.step(np.full(env.num_envs, action))
+                    frequencies = np.bincount(next_states, minlength=env.num_states) / env.num_envs
+                    # Within 5 standard errors of the model's probabilities.
+                    tolerance = 5 * np.sqrt(P[state, action] * (1 - P[state, action]) / env.num_envs) + 1e-12
+                    self.assertTrue((np.abs(frequencies - P[state, action]) <= tolerance).all())
+                    self.assertAlmostEqual(rewards.mean(), R[state, action],
+                                           delta=5 * np.sqrt(R[state, action] / env.num_envs) + 1e-12)
+    
+    def test_q_learning_batch_matches_value_iteration(self):
+        for slip in (0.0, 0.2):
+            with self.subTest(slip=slip):
+                env = GridWorldBatch(256, slip=slip, max_episode_steps=50, seed=0)
+                Q = q_learning_batch(env, 2_000 if slip else 500, 0.1 if slip else 0.5, 0.9, 0.2)
+                action_values = self.optimal_action_values(env, 0.9)
+                if slip:
+                    # Sampled updates leave some noise, and some states have near-ties.
+                    np.testing.assert_allclose(Q, action_values, atol=0.05)
+                    self.assertGreedyOptimal(Q, action_values, env.goal, tolerance=0.01)
+                else:
+                    np.testing.assert_allclose(Q, action_values, atol=1e-6)
+                    self.assertGreedyOptimal(Q, action_values, env.goal)
+    
+    def test_q_learning_moves(self):
+        # Up and Down used to leave the state unchanged, so the goal below the start was
+        # unreachable. Now the learned greedy policy walks from 0 to 15 in six moves.
+        random.seed(0)
+        table = q_learning(2000, 0.5, 0.9, 0.5)
+        Q = np.array([[table[(s, a)] for a in range(4)] for s in range(16)])
+        self.assertAlmostEqual(Q[11, 2], 1.0, places=3)  # Down into the goal
+        self.assertAlmostEqual(Q[14, 1], 1.0, places=3)  # Right into the goal
+        self.assertGreedyOptimal(Q, self.optimal_action_values(GridWorldBatch(1), 0.9), 15)
+        state, moves = 0, 0
+        while state != 15 and moves < 16:
+            action = int(Q[state].argmax())
+            state = GridWorldBatch(1).next_state[state, action]
+            moves += 1
+        self.assertEqual((state, moves), (15, 6))
+
 def main():
     # Demonstrate Fibonacci implementations
     n = 10
@@ -537,6 +2440,8 @@ def main():
     print(f"\nLongest Common Subsequence of '{X}' and '{Y}':")
     print(f"Recursive: {lcs_recursive(X, Y, len(X), len(Y))}")
     print(f"DP: {lcs_dp(X, Y)}")
+    print(f"Hirschberg: {''.join(lcs_hirschberg(X, Y))}")
+    print(f"Edit distance (bit-parallel): {edit_distance_bitparallel(X, Y)}")
     
     # Demonstrate Knapsack Problem
     val = [60, 100, 120]
@@ -545,6 +2450,8 @@ def main():
     print("\nKnapsack Problem:")
     print(f"Recursive: {knapsack_recursive(W, wt, val, len(val))}")
     print(f"DP: {knapsack_dp(W, wt, val)}")
+    print(f"Rolling row with items: {knapsack_rolling(W, wt, val)}")
+    print(f"Subset of {wt} summing to 40: {subset_sum_bitset(wt, 40)}")
     
     # Demonstrate Seam Carving
     image = [[random.randint(0, 255) for _ in range(10)] for _ in range(10)]
@@ -556,6 +2463,9 @@ def main():
     print("Resized image:")
     for row in resized_image:
         print(row)
+    print("Resized with NumPy:")
+    for row in seam_carve(np.array(image, dtype=np.uint8), 3):
+        print(row.tolist())
     
     # Demonstrate Q-learning
     print("\nQ-learning:")
@@ -563,9 +2473,33 @@ def main():
     print("Q-table:")
     for state in range(16):
         print(f"State {state}: {[q_table[(state, a)] for a in range(4)]}")
+    env = GridWorldBatch(256, seed=0)
+    Q = q_learning_batch(env, 200, 0.5, 0.99, 0.1)
+    V, policy = value_iteration(*env.transition_model(), 0.99)
+    print("Batched Q-learning greedy actions:", Q.argmax(axis=1).tolist())
+    print("Value iteration V:", np.round(V, 3).reshape(4, 4).tolist())
     
     # Demonstrate Performance Analysis
+    # The benchmarks below run at demo sizes; call them with their default arguments for
+    # the full-size runs (several minutes in total).
     demonstrate_performance_analysis()
+    benchmark_knapsack_solvers(subset_items=50, knapsack_sizes=[(100, 2_000)], split_items=24,
+                               bounded_capacity=10_000)
+    benchmark_sequence_comparison(num_lines=10_000, num_pairs=50_000)
+    
+    index = build_fuzzy_index(["kitten", "sitting", "mitten", "bitten", "knitting"], max_distance=2)
+    print("\nWords within 2 edits of 'kiten':", index.lookup("kiten"))
+    benchmark_fuzzy_lookup(num_words=20_000, num_queries=50)
+    
+    arr = [10, 22, 9, 33, 21, 50, 41, 60, 80]
+    print("\nLongest increasing subsequence of", arr, "is", longest_increasing_subsequence(arr))
+    print("Most nested envelopes:", max_nested_envelopes([(5, 4), (6, 4), (6, 7), (2, 3)]))
+    benchmark_lis(n=1_000_000, python_n=100_000, quadratic_n=1_000)
+    benchmark_seam_carving(large=(270, 480), large_seams=96)
+    benchmark_q_learning(num_envs=512, num_steps=500, python_steps=50_000)
+    
+    # Run unit tests
+    unittest.main(argv=[''], exit=False)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,639 @@
+# Performance Optimization - Benchmarking sorting and searching algorithms - in the Python Programming Language
+# ============================================================================================================
+
+# Table of Contents:
+# 1. Overview and Historical Context
+# 2. Syntax, Key Concepts, and Code Examples
+# 3. Best Practices, Common Pitfalls, and Advanced Tips
+# 4. Integration and Real-World Applications
+# 5. Advanced Concepts and Emerging Trends
+# 6. FAQs and Troubleshooting
+# 7. Recommended Tools, Libraries, and Resources
+# 8. Performance Analysis and Optimization
+# 9. How to Contribute
+
+# Author: Sabbir Hossain
+
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import unittest
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# 1. Overview and Historical Context
+# ----------------------------------
+# The Ch14 note sheets time their algorithms with a single timeit call on one random
+# list. That is enough to show that bubble sort is slow, but it cannot answer the
+# questions that matter once code is being optimized:
+# - Does the change help on the inputs we actually see (sorted logs, reversed
+#   exports, columns with a handful of distinct values)?
+# - Is the difference real, or is it noise from a single run?
+# - Did last week's "cleanup" make anything slower?
+
+# Historical context:
+# - Knuth's "The Art of Computer Programming, Vol. 3" (1973) already analysed sorting
+#   on presorted and reversed inputs, not just random ones.
+# - Bentley and McIlroy's "Engineering a Sort Function" (1993) popularised testing
+#   sorts against a fixed set of adversarial distributions (sawtooth, organ pipe, ...).
+# - Tim Peters' listsort.txt (2002) documents the distributions used to tune Timsort.
+# - Continuous benchmarking tools such as airspeed velocity (asv) and pyperformance
+#   made "compare against a stored baseline" a routine part of CI.
+
+# Significance:
+# - Input distribution changes the winner: insertion-based sorts fly on nearly
+#   sorted data, naive quicksorts collapse on sorted data.
+# - Repeated runs with warmup turn a single anecdote into a measurement.
+# - A stored baseline turns measurements into a regression alarm.
+
+# Common use cases:
+# - Choosing an algorithm for a known data shape
+# - Verifying that an optimization actually helps before merging it
+# - Catching performance regressions in CI
+
+# 2. Syntax, Key Concepts, and Code Examples
+# ------------------------------------------
+
+# Key Concepts:
+# 1. Distribution generators: reproducible inputs of a given shape and size.
+# 2. Benchmark cases: an algorithm plus the adapter that knows how to call it.
+# 3. Measurements: warmup runs, repeated timed runs, and a separate traced run for
+#    the memory peak (tracemalloc slows code down, so it never shares a timed run).
+# 4. Reports: JSON results that can be stored and compared against a baseline.
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CH14_SORTING = os.path.join(REPO_ROOT, "Ch14_Algorithms_In_Python", "Topic1_Sorting_algorithms_e.g.,_merge_sort,_quicksort.py")
+CH14_SEARCHING = os.path.join(REPO_ROOT, "Ch14_Algorithms_In_Python", "Topic2_Searching_algorithms_e.g.,_binary_search.py")
+QUICKSTART_ALGORITHMS = os.path.join(REPO_ROOT, "QuickStart", "_algorithms.py")
+
+DISTRIBUTIONS = ("random", "sorted", "reversed", "few_unique", "organ_pipe", "nearly_sorted")
+DEFAULT_SIZES = (10**3, 10**4, 10**5, 10**6, 10**7)
+
+def generate_distribution(name: str, size: int, seed: int = 0) -> List[int]:
+    """
+    Generate a reproducible list of non-negative integers with a given shape.
+
+    Args:
+    name (str): One of DISTRIBUTIONS
+    size (int): Number of elements
+    seed (int): Seed for the random generator, so every run sees the same data
+
+    Returns:
+    List[int]: The generated values
+    """
+    rng = np.random.default_rng(seed)
+    if name == "random":
+        values = rng.integers(0, max(size, 1) * 10, size=size)
+    elif name == "sorted":
+        values = np.sort(rng.integers(0, max(size, 1) * 10, size=size))
+    elif name == "reversed":
+        values = np.sort(rng.integers(0, max(size, 1) * 10, size=size))[::-1]
+    elif name == "few_unique":
+        values = rng.integers(0, 8, size=size)
+    elif name == "organ_pipe":
+        # 0, 1, ..., n/2, ..., 1, 0: ascending then descending
+        half = np.arange((size + 1) // 2)
+        values = np.concatenate([half, half[: size // 2][::-1]])
+    elif name == "nearly_sorted":
+        # Sorted, then about 1% of the positions swapped at random
+        values = np.arange(size)
+        swaps = size // 100 if size else 0
+        i = rng.integers(0, max(size, 1), size=swaps)
+        j = rng.integers(0, max(size, 1), size=swaps)
+        values[i], values[j] = values[j], values[i].copy()
+    else:
+        raise ValueError(f"Unknown distribution {name!r}; expected one of {DISTRIBUTIONS}")
+    return values.tolist()
+
+def demonstrate_distributions():
+    """Show what each input distribution looks like."""
+    for name in DISTRIBUTIONS:
+        print(f"{name:>14}: {generate_distribution(name, 12, seed=1)}")
+
+class BenchmarkCase:
+    """
+    One algorithm to benchmark and the knowledge of how to call it.
+
+    Args:
+    name (str): Unique name used in reports and baselines
+    func (Callable): The algorithm itself
+    kind (str): "sort" or "search"
+    call (Callable): Adapter taking (func, data) for sorts or (func, data, queries) for
+                     searches; the default calls func(data) or func(data, query)
+    max_size (int): Largest input size the case is run on (quadratic algorithms
+                    would take hours at 10^7)
+    transform (Callable): Optional input conversion done outside the timed region,
+                          e.g. scaling into the value range an algorithm supports
+    batched (bool): For searches, whether call() answers all queries in one call
+    """
+
+    def __init__(self, name: str, func: Callable, kind: str, call: Optional[Callable] = None,
+                 max_size: int = DEFAULT_SIZES[-1], transform: Optional[Callable] = None,
+                 batched: bool = False):
+        self.name = name
+        self.func = func
+        self.kind = kind
+        self.call = call
+        self.max_size = max_size
+        self.transform = transform
+        self.batched = batched
+
+    def __repr__(self):
+        return f"BenchmarkCase(name='{self.name}', kind='{self.kind}', max_size={self.max_size})"
+
+    def run_sort(self, data: List[Any]) -> List[Any]:
+        if self.call is not None:
+            result = self.call(self.func, data)
+        else:
+            result = self.func(data)
+        # Several note-sheet sorts work in place and return None.
+        return data if result is None else result
+
+    def run_search(self, data: List[Any], queries: List[Any]) -> List[int]:
+        if self.batched:
+            return list(self.call(self.func, data, queries))
+        if self.call is not None:
+            return [self.call(self.func, data, q) for q in queries]
+        return [self.func(data, q) for q in queries]
+
+def load_module(path: str, name: str):
+    """Import a note sheet by path; their file names are not valid module names."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def collect_cases() -> List[BenchmarkCase]:
+    """
+    Build the benchmark cases for every sort and search in the Ch14 sorting and
+    searching note sheets and in QuickStart/_algorithms.py.
+
+    QuickStart's selection sort and insertion sort are not included: the script
+    writes them as inline top-level code rather than functions, so there is
+    nothing to load and call.
+    """
+    sorting = load_module(CH14_SORTING, "ch14_sorting")
+    searching = load_module(CH14_SEARCHING, "ch14_searching")
+    quickstart = searching.load_script_functions(QUICKSTART_ALGORITHMS, [
+        "bubble_sort", "merge_sort", "quick_sort", "in_place_quick_sort", "partition",
+        "heap_sort", "build_max_heap", "heapify", "radix_sort", "counting_sort",
+        "bucket_sort", "shell_sort",
+        "linear_search", "recursive_binary_search", "ternary_search", "interpolation_search",
+    ])
+    # Helpers (partition, heapify, ...) are loaded too: the sorts look them up by name.
+    # Selection and insertion sort are missing on purpose; see the docstring.
+
+    def to_bucket_range(data):
+        # QuickStart's bucket_sort expects values in [0, 100).
+        top = max(data) + 1 if data else 1
+        return [value * 100.0 / top for value in data]
+
+    cases = [
+        BenchmarkCase("ch14.bubble_sort", sorting.bubble_sort, "sort", max_size=10**4),
+        BenchmarkCase("ch14.merge_sort", sorting.merge_sort, "sort", max_size=10**6),
+        BenchmarkCase("ch14.quicksort", sorting.quicksort, "sort", max_size=10**6),
+        BenchmarkCase("ch14.timsort", sorting.timsort, "sort"),
+        BenchmarkCase("ch14.hybrid_quicksort", sorting.hybrid_quicksort, "sort", max_size=10**6),
+        BenchmarkCase("ch14.adaptive_merge_sort", sorting.adaptive_merge_sort, "sort",
+                      call=lambda f, data: f(data)[0], max_size=10**6),
+        BenchmarkCase("quickstart.bubble_sort", quickstart["bubble_sort"], "sort", max_size=10**4),
+        BenchmarkCase("quickstart.merge_sort", quickstart["merge_sort"], "sort", max_size=10**6),
+        BenchmarkCase("quickstart.quick_sort", quickstart["quick_sort"], "sort", max_size=10**6),
+        BenchmarkCase("quickstart.in_place_quick_sort", quickstart["in_place_quick_sort"], "sort",
+                      call=lambda f, data: f(data, 0, len(data) - 1), max_size=10**4),
+        BenchmarkCase("quickstart.heap_sort", quickstart["heap_sort"], "sort", max_size=10**6),
+        BenchmarkCase("quickstart.radix_sort", quickstart["radix_sort"], "sort",
+                      call=lambda f, data: f(data) if data else None, max_size=10**6),
+        BenchmarkCase("quickstart.bucket_sort", quickstart["bucket_sort"], "sort",
+                      transform=to_bucket_range, max_size=10**6),
+        BenchmarkCase("quickstart.shell_sort", quickstart["shell_sort"], "sort", max_size=10**6),
+        BenchmarkCase("builtin.sorted", sorted, "sort"),
+
+        BenchmarkCase("ch14.linear_search", searching.linear_search, "search", max_size=10**5),
+        BenchmarkCase("ch14.binary_search", searching.binary_search, "search"),
+        BenchmarkCase("ch14.jump_search", searching.jump_search, "search", max_size=10**6),
+        BenchmarkCase("ch14.interpolation_search", searching.interpolation_search, "search"),
+        BenchmarkCase("ch14.exponential_search", searching.exponential_search, "search", max_size=10**6),
+        BenchmarkCase("ch14.binary_search_bisect", searching.binary_search_bisect, "search"),
+        BenchmarkCase("ch14.SortedIndex.find", searching.SortedIndex, "search", batched=True,
+                      call=lambda cls, data, queries: cls(data, assume_sorted=True).find(queries).tolist()),
+        BenchmarkCase("quickstart.linear_search", quickstart["linear_search"], "search", max_size=10**5),
+        BenchmarkCase("quickstart.recursive_binary_search", quickstart["recursive_binary_search"], "search",
+                      call=lambda f, data, q: f(data, q, 0, len(data) - 1)),
+        BenchmarkCase("quickstart.ternary_search", quickstart["ternary_search"], "search",
+                      call=lambda f, data, q: f(data, 0, len(data) - 1, q)),
+        BenchmarkCase("quickstart.interpolation_search", quickstart["interpolation_search"], "search"),
+    ]
+    return cases
+
+# 3. Best Practices, Common Pitfalls, and Advanced Tips
+# -----------------------------------------------------
+
+# Best Practices:
+# 1. Generate inputs from a seed so that two runs of the suite see identical data.
+# 2. Copy the input before every timed run; an in-place sort would otherwise be timed
+#    on already sorted data from the second repeat onwards.
+# 3. Report the median (robust to outliers) next to the minimum (closest to the true
+#    cost) instead of a single run.
+# 4. Check the output of every case once, so a fast-but-wrong algorithm is reported
+#    as wrong rather than as a speedup.
+
+# Common Pitfalls:
+# 1. Timing with tracemalloc enabled; it can slow allocation-heavy code several-fold.
+# 2. Leaving the garbage collector running during timing, so a collection triggered
+#    by the previous case lands in the middle of the next one.
+# 3. Comparing results from different machines or Python versions against one baseline.
+# 4. Using a regression threshold tighter than the run-to-run noise of the machine.
+
+# Advanced Tips:
+# 1. Pin the process to one CPU and disable frequency scaling for stable numbers.
+# 2. Keep one baseline per machine/interpreter and store its metadata with it.
+# 3. Benchmark the distributions your production data actually has.
+
+def measure(run: Callable[[Any], Any], make_input: Callable[[], Any], repeats: int = 5,
+            warmup: int = 1, track_memory: bool = True) -> Dict[str, Any]:
+    """
+    Time a callable over fresh inputs with warmup and repeats.
+
+    Args:
+    run (Callable): Called with the input produced by make_input
+    make_input (Callable): Produces a fresh input for each run; not timed
+    repeats (int): Number of timed runs
+    warmup (int): Number of untimed runs before timing starts
+    track_memory (bool): Whether to do one extra run under tracemalloc
+
+    Returns:
+    Dict[str, Any]: Timings in seconds, summary statistics and the traced memory peak
+    """
+    for _ in range(warmup):
+        run(make_input())
+
+    times = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            data = make_input()
+            start = time.perf_counter()
+            run(data)
+            times.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    peak = None
+    if track_memory:
+        data = make_input()
+        tracemalloc.start()
+        try:
+            run(data)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "peak_memory_bytes": peak,
+    }
+
+def benchmark_case(case: BenchmarkCase, distribution: str, size: int, repeats: int = 5,
+                   warmup: int = 1, track_memory: bool = True, num_queries: int = 1000,
+                   seed: int = 0) -> Dict[str, Any]:
+    """Run one case on one distribution and size and return a JSON-ready record."""
+    record = {"algorithm": case.name, "kind": case.kind, "distribution": distribution, "size": size}
+    data = generate_distribution(distribution, size, seed=seed)
+    if case.transform is not None:
+        data = case.transform(data)
+
+    try:
+        if case.kind == "sort":
+            expected = sorted(data)
+            if case.run_sort(list(data)) != expected:
+                record["status"] = "wrong result"
+                return record
+            stats = measure(case.run_sort, lambda: list(data), repeats, warmup, track_memory)
+        else:
+            data.sort()
+            rng = np.random.default_rng(seed + 1)
+            # Half of the queries hit existing values, half are (mostly) misses.
+            hits = rng.choice(data, size=num_queries // 2).tolist() if data else []
+            misses = rng.integers(0, max(size, 1) * 10, size=num_queries - len(hits)).tolist()
+            queries = hits + misses
+            found = case.run_search(data, queries)
+            if any(i != -1 and (i < 0 or i >= len(data) or data[i] != q) for i, q in zip(found, queries)) \
+                    or any(i == -1 for i in found[:len(hits)]):
+                record["status"] = "wrong result"
+                return record
+            stats = measure(lambda d: case.run_search(d, queries), lambda: data, repeats, warmup, track_memory)
+            stats["queries"] = len(queries)
+    except (RecursionError, MemoryError, IndexError, ValueError, ZeroDivisionError, TypeError) as e:
+        record["status"] = f"error: {type(e).__name__}: {e}"
+        return record
+
+    record.update(stats)
+    record["status"] = "ok"
+    return record
+
+def demonstrate_single_measurement():
+    """Benchmark Python's built-in sort on two distributions."""
+    case = BenchmarkCase("builtin.sorted", sorted, "sort")
+    for distribution in ("random", "sorted"):
+        record = benchmark_case(case, distribution, 10**5, repeats=5)
+        print(f"sorted() on {distribution:>6} data: median {record['median'] * 1e3:.2f} ms, "
+              f"peak {record['peak_memory_bytes'] / 1024:.1f} KiB")
+
+# 4. Integration and Real-World Applications
+# ------------------------------------------
+
+# The harness is designed to run in CI:
+# 1. run_benchmarks() produces a JSON document with machine metadata and one record
+#    per (algorithm, distribution, size).
+# 2. The document of a known-good commit is stored as the baseline.
+# 3. Every later run is compared against it with compare_to_baseline(), and the job
+#    fails (exit status 1) when a case got slower than the threshold allows.
+
+def run_benchmarks(cases: Sequence[BenchmarkCase], distributions: Sequence[str] = DISTRIBUTIONS,
+                   sizes: Sequence[int] = DEFAULT_SIZES, repeats: int = 5, warmup: int = 1,
+                   track_memory: bool = True, kinds: Sequence[str] = ("sort", "search"),
+                   verbose: bool = True) -> Dict[str, Any]:
+    """
+    Run every case on every distribution and size it supports.
+
+    Returns:
+    Dict[str, Any]: {"metadata": {...}, "results": [record, ...]}
+    """
+    results = []
+    for size in sizes:
+        for case in cases:
+            if case.kind not in kinds:
+                continue
+            if size > case.max_size:
+                results.append({"algorithm": case.name, "kind": case.kind, "size": size,
+                                "distribution": None, "status": f"skipped: max_size={case.max_size}"})
+                continue
+            for distribution in distributions:
+                record = benchmark_case(case, distribution, size, repeats, warmup, track_memory)
+                results.append(record)
+                if verbose:
+                    print(format_record(record))
+    return {
+        "metadata": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeats": repeats,
+            "warmup": warmup,
+        },
+        "results": results,
+    }
+
+def format_record(record: Dict[str, Any]) -> str:
+    label = f"{record['algorithm']:<36} {str(record['distribution']):<14} {record['size']:>10,}"
+    if record["status"] != "ok":
+        return f"{label}  {record['status']}"
+    memory = record.get("peak_memory_bytes")
+    memory_text = f"{memory / 1024:10.1f} KiB" if memory is not None else "             -"
+    return f"{label}  median {record['median']:10.6f}s  min {record['min']:10.6f}s  peak {memory_text}"
+
+def save_results(report: Dict[str, Any], path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def compare_to_baseline(current: Dict[str, Any], baseline: Dict[str, Any],
+                        threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Compare two benchmark reports and list the cases whose median time grew by more
+    than the threshold (0.10 means 10% slower).
+
+    Cases missing from either report, or that did not finish with status "ok", are
+    ignored; a case that used to work and now errors is reported as a regression.
+
+    Returns:
+    List[Dict[str, Any]]: One entry per regression, worst first
+    """
+    def key(record):
+        return record["algorithm"], record["distribution"], record["size"]
+
+    previous = {key(r): r for r in baseline["results"] if r.get("status") == "ok"}
+    regressions = []
+    for record in current["results"]:
+        old = previous.get(key(record))
+        if old is None:
+            continue
+        if record.get("status") != "ok":
+            regressions.append({"algorithm": record["algorithm"], "distribution": record["distribution"],
+                                "size": record["size"], "baseline": old["median"], "current": None,
+                                "ratio": float("inf"), "status": record["status"]})
+            continue
+        ratio = record["median"] / old["median"] if old["median"] > 0 else float("inf")
+        if ratio > 1 + threshold:
+            regressions.append({"algorithm": record["algorithm"], "distribution": record["distribution"],
+                                "size": record["size"], "baseline": old["median"],
+                                "current": record["median"], "ratio": ratio, "status": "slower"})
+    regressions.sort(key=lambda r: r["ratio"], reverse=True)
+    return regressions
+
+def print_regression_report(regressions: List[Dict[str, Any]], threshold: float):
+    if not regressions:
+        print(f"No regressions above {threshold:.0%}.")
+        return
+    print(f"{len(regressions)} regression(s) above {threshold:.0%}:")
+    for r in regressions:
+        if r["current"] is None:
+            print(f"  {r['algorithm']} / {r['distribution']} / {r['size']:,}: {r['status']}")
+        else:
+            print(f"  {r['algorithm']} / {r['distribution']} / {r['size']:,}: "
+                  f"{r['baseline']:.6f}s -> {r['current']:.6f}s ({r['ratio']:.2f}x)")
+
+# 5. Advanced Concepts and Emerging Trends
+# ----------------------------------------
+
+# 1. Statistical regression detection: instead of a fixed threshold, tools like asv
+#    and Codspeed compare distributions of timings (e.g. Mann-Whitney U tests).
+# 2. Instruction counting: measuring with hardware counters (perf, cachegrind) is far
+#    less noisy than wall-clock time on shared CI machines.
+# 3. Adaptive repeat counts: keep repeating until the confidence interval of the
+#    median is narrower than the threshold you care about.
+
+def median_confidence_interval(times: Sequence[float], confidence: float = 0.95, resamples: int = 1000,
+                               seed: int = 0) -> tuple:
+    """Bootstrap a confidence interval for the median of a list of timings."""
+    rng = np.random.default_rng(seed)
+    samples = rng.choice(np.asarray(times), size=(resamples, len(times)), replace=True)
+    medians = np.median(samples, axis=1)
+    tail = (1 - confidence) / 2
+    return float(np.quantile(medians, tail)), float(np.quantile(medians, 1 - tail))
+
+# 6. FAQs and Troubleshooting
+# ---------------------------
+
+def faqs_and_troubleshooting():
+    print("Q: Why is a case reported as 'skipped: max_size=...'?")
+    print("A: Quadratic algorithms (bubble sort, Lomuto quicksort on sorted data) would run for hours")
+    print("   at 10^7 elements. Raise BenchmarkCase.max_size if you really want those numbers.")
+
+    print("\nQ: Why does quickstart.in_place_quick_sort report a RecursionError?")
+    print("A: It picks the last element as pivot, so sorted and reversed inputs recurse n levels deep.")
+    print("   The harness records the error instead of aborting the whole suite.")
+
+    print("\nQ: My baseline comparison flags everything as slower.")
+    print("A: Check the metadata of both reports; baselines are only meaningful on the same machine")
+    print("   and interpreter. Re-record the baseline after changing either.")
+
+    print("\nQ: The memory peaks look too small for 10^7 elements.")
+    print("A: tracemalloc only sees allocations made during the run; the input list itself is")
+    print("   created before tracing starts, so the peak is the algorithm's extra memory.")
+
+# 7. Recommended Tools, Libraries, and Resources
+# ----------------------------------------------
+
+# Tools and Libraries:
+# 1. timeit and time.perf_counter: the standard library building blocks used here
+# 2. tracemalloc: standard library allocation tracing
+# 3. pyperf: statistically careful benchmarking, process isolation and system tuning
+#    pip install pyperf
+# 4. asv (airspeed velocity): benchmark history across commits with web reports
+#    pip install asv
+# 5. pytest-benchmark: benchmarks as pytest fixtures with baseline comparison
+#    pip install pytest-benchmark
+
+# Resources:
+# 1. "Engineering a Sort Function" by Jon L. Bentley and M. Douglas McIlroy (1993)
+# 2. Tim Peters' notes on Timsort: https://github.com/python/cpython/blob/main/Objects/listsort.txt
+# 3. pyperf documentation on system tuning: https://pyperf.readthedocs.io/en/latest/system.html
+
+# 8. Performance Analysis and Optimization
+# ----------------------------------------
+
+def demonstrate_benchmark_suite(sizes: Sequence[int] = (10**3, 10**4), repeats: int = 3,
+                                results_path: str = "sorting_searching_benchmark.json",
+                                baseline_path: Optional[str] = None, threshold: float = 0.10) -> int:
+    """
+    Run the full suite, save the JSON report and compare it with a baseline.
+
+    Returns:
+    int: 1 if regressions were found, 0 otherwise (usable as a process exit status)
+    """
+    cases = collect_cases()
+    report = run_benchmarks(cases, sizes=sizes, repeats=repeats)
+    save_results(report, results_path)
+    print(f"\nResults written to {results_path}")
+
+    if baseline_path and os.path.exists(baseline_path):
+        regressions = compare_to_baseline(report, load_results(baseline_path), threshold)
+        print_regression_report(regressions, threshold)
+        return 1 if regressions else 0
+    if baseline_path:
+        print(f"No baseline at {baseline_path}; save this report there to start tracking regressions.")
+    return 0
+
+# 9. How to Contribute
+# --------------------
+# To contribute to this note sheet:
+# 1. Fork the repository containing this file.
+# 2. Make your changes or additions.
+# 3. Ensure all code examples are correct and follow the established style.
+# 4. Add comments explaining new concepts or functions.
+# 5. Update the Table of Contents if necessary.
+# 6. Submit a pull request with a clear description of your changes.
+
+# When adding a new sorting or searching algorithm to Ch14 or QuickStart, register it
+# in collect_cases() with a sensible max_size so that it is benchmarked like the rest.
+
+# Unit Tests
+class TestRegressionDetection(unittest.TestCase):
+    @staticmethod
+    def report(*records):
+        return {"results": [{"algorithm": name, "distribution": "random", "size": 1000,
+                             "median": median, "status": status}
+                            for name, median, status in records]}
+
+    def test_within_threshold_is_not_a_regression(self):
+        baseline = self.report(("a", 1.0, "ok"), ("b", 1.0, "ok"))
+        current = self.report(("a", 1.10, "ok"), ("b", 0.5, "ok"))
+        self.assertEqual(compare_to_baseline(current, baseline, threshold=0.10), [])
+
+    def test_slower_than_threshold_is_reported_worst_first(self):
+        baseline = self.report(("a", 1.0, "ok"), ("b", 2.0, "ok"), ("c", 1.0, "ok"))
+        current = self.report(("a", 1.2, "ok"), ("b", 3.0, "ok"), ("c", 1.05, "ok"))
+        regressions = compare_to_baseline(current, baseline, threshold=0.10)
+        self.assertEqual([r["algorithm"] for r in regressions], ["b", "a"])
+        self.assertAlmostEqual(regressions[0]["ratio"], 1.5)
+        self.assertEqual(regressions[1]["baseline"], 1.0)
+        self.assertEqual(regressions[1]["current"], 1.2)
+        self.assertTrue(all(r["status"] == "slower" for r in regressions))
+        self.assertEqual(len(compare_to_baseline(current, baseline, threshold=0.25)), 1)
+
+    def test_new_error_is_a_regression(self):
+        baseline = self.report(("a", 1.0, "ok"), ("b", 1.0, "ok"))
+        current = self.report(("a", 1.5, "ok"), ("b", 0.0, "error: boom"))
+        regressions = compare_to_baseline(current, baseline)
+        self.assertEqual(regressions[0]["algorithm"], "b")
+        self.assertEqual(regressions[0]["status"], "error: boom")
+        self.assertIsNone(regressions[0]["current"])
+        self.assertEqual(regressions[0]["ratio"], float("inf"))
+        self.assertEqual(regressions[1]["algorithm"], "a")
+
+    def test_missing_and_failed_baseline_cases_are_ignored(self):
+        baseline = self.report(("a", 1.0, "error: boom"), ("gone", 1.0, "ok"))
+        current = self.report(("a", 5.0, "ok"), ("new", 5.0, "ok"))
+        self.assertEqual(compare_to_baseline(current, baseline), [])
+
+    def test_median_confidence_interval(self):
+        times = [1.0, 1.1, 0.9, 1.05, 0.95, 1.2, 0.8]
+        low, high = median_confidence_interval(times)
+        self.assertLessEqual(low, statistics.median(times))
+        self.assertGreaterEqual(high, statistics.median(times))
+        self.assertGreaterEqual(low, min(times))
+        self.assertLessEqual(high, max(times))
+        self.assertEqual(median_confidence_interval(times, seed=3), median_confidence_interval(times, seed=3))
+        narrow = median_confidence_interval(times, confidence=0.5)
+        self.assertTrue(low <= narrow[0] <= narrow[1] <= high)
+        self.assertEqual(median_confidence_interval([0.5] * 5), (0.5, 0.5))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sorting and searching note sheets.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**3, 10**4],
+                        help=f"input sizes to run (full range: {' '.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", default="sorting_searching_benchmark.json")
+    parser.add_argument("--baseline", default=None, help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, 0.10 = 10%%")
+    args = parser.parse_args()
+
+    print("1. Input distributions:")
+    demonstrate_distributions()
+
+    print("\n2. A single measurement:")
+    demonstrate_single_measurement()
+
+    print("\n3. FAQs:")
+    faqs_and_troubleshooting()
+
+    print("\n4. Full benchmark suite:")
+    status = demonstrate_benchmark_suite(args.sizes, args.repeats, args.output, args.baseline, args.threshold)
+
+    # Run unit tests
+    unittest.main(argv=[''], exit=False)
+    sys.exit(status)
+
+if __name__ == "__main__":
+    main()
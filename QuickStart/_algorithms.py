@@ -3307,7 +3307,9 @@ else:
 
 # Advanced Tip:
 # - If the graph is large, consider using more advanced graph traversal techniques like Hierholzer's Algorithm, which is specifically 
-#   designed for finding Eulerian circuits in O(E) time.
+#   designed for finding Eulerian circuits in O(E) time. Write it with an explicit stack and a per-vertex cursor into the
+#   edge list: the recursive version hits Python's recursion limit after about 1,000 edges, and list.pop(0) or
+#   list.remove make edge removal O(degree). See eulerian_path in Ch14_Algorithms_In_Python/Topic3_Graph_algorithms.py.
 # - In directed graphs, the Eulerian Path/Circuit conditions slightly change: for a circuit, each vertex must have an equal in-degree and out-degree. 
 #   For a path, one vertex must have an out-degree greater by one, and another vertex must have an in-degree greater by one.
 # - Eulerian Path algorithms are particularly useful in bioinformatics, such as in genome assembly problems where DNA sequences are treated as edges in a graph.
@@ -3384,6 +3386,9 @@ else:
 # - Backtracking is a common technique used to solve Hamiltonian Path/Circuit problems. It involves exploring potential paths
 #   and abandoning ("backtracking") from paths that do not lead to a valid solution. Pruning unnecessary searches can 
 #   significantly improve performance but does not reduce worst-case complexity.
+# - Backtracking tops out around 15 vertices. Held-Karp dynamic programming over subsets (O(2^n * n^2)) is exact up to
+#   about 20, branch and bound with spanning-tree bounds goes somewhat further, and 2-opt/Or-opt local search handles
+#   thousands; see solve_tsp in Ch14_Algorithms_In_Python/Topic3_Graph_algorithms.py.
 
 # Example: Print the adjacency matrix of the graph for visualization
 # The adjacency matrix is another way to represent a graph where each cell (i, j) is 1 if there is an edge between vertex i and j.
@@ -4189,6 +4194,9 @@ print("Length of Longest Increasing Subsequence is:", max(dp))
 # O(n log n) approach using binary search and dynamic programming. However, this 
 # O(n^2) approach is easier to implement and understand, making it useful for 
 # educational purposes and small inputs.
+# - The O(n log n) version keeps, for each length, the smallest value that ends an increasing subsequence of that
+# length; these "tails" stay sorted, so each element is placed with bisect. Remembering each element's predecessor
+# rebuilds the subsequence itself. See lis_indices and StreamingLIS in Ch14_Algorithms_In_Python/Topic4_Dynamic_programming.py.
 #=================================================================================================================
 
 #===============================================================================
@@ -4386,6 +4394,16 @@ print_edit_distance("", "world")  # Output: 5
 # 5. Cache Efficiency: Given that the algorithm fills out a 2D table, memory locality is important.
 #    Ensuring the table is filled row-wise (or column-wise consistently) can improve cache hits and thus performance.
 
+# 6. Bit-parallelism: Myers' algorithm stores a whole DP column as the bits of one integer and updates it with a few
+#    word operations per character, 64 cells at a time. With a distance cutoff k, only cells within k of the
+#    diagonal matter, and the computation can stop once the distance is certain to exceed k. Hirschberg's
+#    divide-and-conquer recovers the actual edits in linear space. See edit_distance_bitparallel,
+#    edit_distance_banded and align_sequences in Ch14_Algorithms_In_Python/Topic4_Dynamic_programming.py.
+
+# 7. Dictionary lookup: to find every word within k edits of a query, do not compare against each word. A BK-tree
+#    prunes by the triangle inequality; a symmetric-delete (SymSpell) index looks up the query's <= k deletions in a
+#    hash table and only verifies the few hits. See build_fuzzy_index in the same file.
+
 #===============================================================================
 # Coin Change Problem using Dynamic Programming
 #===============================================================================
@@ -4790,6 +4808,10 @@ else:
 # The time complexity remains O(n * m), but the space complexity is reduced to O(m), 
 # as we only maintain a 1D array. This optimization is particularly useful for 
 # large sets or when memory is a constraint.
+# Since each cell is a single bit, the whole row also fits in one Python integer:
+# `reachable |= reachable << num` updates every sum at once, 64 per machine word,
+# which is orders of magnitude faster than the inner loop above. See
+# subset_sum_bitset and knapsack_rolling in Ch14_Algorithms_In_Python/Topic4_Dynamic_programming.py.
  # N-Queens problem solution using backtracking algorithm
 # The goal is to place N queens on an NxN chessboard such that no two queens threaten each other.
 # Queens can attack in horizontal, vertical, and diagonal directions.
@@ -8156,22 +8178,43 @@ for row in capacity:
 
 from collections import deque  # We use a deque to efficiently implement the BFS queue.
 
-# BFS to find if there's an augmenting path and to store the parent of each node.
-def bfs(source, sink, parent):
-    visited = [False] * len(capacity)  # Track which nodes have been visited.
+#-----------------------------------------------------------
+# Topic: Storing the residual graph as edge arrays
+#-----------------------------------------------------------
+# Scanning capacity[u] in the BFS looks at all V entries of the row, even when 'u' has only two edges,
+# so every BFS costs O(V^2) no matter how sparse the network is. Instead, we convert the matrix into edge
+# arrays once. Every edge is stored next to its reverse edge: edge 2i is the i-th edge and edge 2i + 1
+# its reverse, so the partner of any edge 'e' is simply e ^ 1 (flipping the lowest bit).
+edge_to = []   # edge_to[e]: the node that edge 'e' points to.
+residual = []  # residual[e]: the capacity still available on edge 'e'.
+adjacency = [[] for _ in capacity]  # adjacency[u]: ids of all edges leaving 'u' (forward and reverse).
+
+for u, row in enumerate(capacity):
+    for v, cap in enumerate(row):
+        if cap > 0:
+            adjacency[u].append(len(edge_to))  # Forward edge u -> v with its full capacity.
+            edge_to.append(v)
+            residual.append(cap)
+            adjacency[v].append(len(edge_to))  # Reverse edge v -> u, empty until flow is pushed on u -> v.
+            edge_to.append(u)
+            residual.append(0)
+
+# BFS to find if there's an augmenting path and to store the edge used to reach each node.
+def bfs(source, sink, parent_edge):
+    visited = [False] * len(adjacency)  # Track which nodes have been visited.
     queue = deque([source])  # Initialize the BFS queue with the source node.
     visited[source] = True  # Mark the source node as visited.
 
     while queue:
         u = queue.popleft()  # Get the next node to explore.
 
-        # Explore all nodes adjacent to 'u' (i.e., all edges from 'u' with non-zero capacity).
-        for v, cap in enumerate(capacity[u]):
-            # If the node 'v' is unvisited and the capacity from 'u' to 'v' is greater than 0
-            if not visited[v] and cap > 0:
+        # Explore only the edges of 'u' that still have residual capacity.
+        for e in adjacency[u]:
+            v = edge_to[e]
+            if not visited[v] and residual[e] > 0:
                 queue.append(v)  # Add 'v' to the queue for further exploration.
                 visited[v] = True  # Mark 'v' as visited.
-                parent[v] = u  # Store the path (the parent of 'v' is 'u').
+                parent_edge[v] = e  # Store the path (we reached 'v' through edge 'e').
 
                 # If we reach the sink node, we've found an augmenting path.
                 if v == sink:
@@ -8183,50 +8226,57 @@ def bfs(source, sink, parent):
 # Topic: Augmenting flow in the network
 #-----------------------------------------------------------
 # Once an augmenting path is found, we calculate the maximum flow that can be pushed along this path.
-# The flow pushed is the minimum capacity of any edge in the path (i.e., the bottleneck capacity).
+# The flow pushed is the minimum residual capacity of any edge in the path (i.e., the bottleneck capacity).
 
 source = 0  # Source node
 sink = 5    # Sink node
-parent = [-1] * len(capacity)  # Array to store the parent of each node during BFS, initialized with -1.
+parent_edge = [-1] * len(capacity)  # Edge used to reach each node during BFS, initialized with -1.
 
 max_flow = 0  # Initialize the maximum flow in the network to 0.
 
 # We repeatedly search for augmenting paths using BFS and push flow through them.
-while bfs(source, sink, parent):
+while bfs(source, sink, parent_edge):
     path_flow = float('Inf')  # Start with an infinite flow.
 
-    # Find the minimum capacity in the augmenting path.
-    s = sink
-    while s != source:
-        path_flow = min(path_flow, capacity[parent[s]][s])
-        s = parent[s]  # Move to the previous node in the path.
+    # Find the minimum residual capacity in the augmenting path.
+    v = sink
+    while v != source:
+        e = parent_edge[v]
+        path_flow = min(path_flow, residual[e])
+        v = edge_to[e ^ 1]  # The reverse edge points back to the previous node in the path.
 
-    # Update the capacities of the edges in the augmenting path.
+    # Update the residual capacities of the edges in the augmenting path.
     v = sink
     while v != source:
-        u = parent[v]
-        capacity[u][v] -= path_flow  # Decrease the capacity of the forward edge.
-        capacity[v][u] += path_flow  # Increase the capacity of the reverse edge (for residual graph).
-        v = parent[v]  # Move to the previous node in the path.
+        e = parent_edge[v]
+        residual[e] -= path_flow  # Decrease the capacity of the forward edge.
+        residual[e ^ 1] += path_flow  # Increase the capacity of the reverse edge (for residual graph).
+        v = edge_to[e ^ 1]
 
     max_flow += path_flow  # Add the path flow to the total flow.
     print(f"Augmenting path found with flow: {path_flow}")
-    print("Updated capacity matrix:")
-    for row in capacity:
-        print(row)
 
 print(f"The maximum possible flow is: {max_flow}")
 
+# The flow on each original edge is the residual capacity its reverse edge has gained.
+print("Flow on each edge (flow/capacity):")
+for e in range(0, len(edge_to), 2):
+    print(f"{edge_to[e + 1]} -> {edge_to[e]}: {residual[e + 1]}/{residual[e] + residual[e + 1]}")
+
 # Runtime Analysis of Edmonds-Karp Algorithm:
 # - Time Complexity: O(V * E^2), where V is the number of vertices and E is the number of edges.
-#   This complexity arises from the O(E) BFS search and the fact that each edge can be part of at most O(V) augmenting paths.
-# - Space Complexity: O(V^2), due to the capacity matrix that stores edge capacities between all pairs of nodes.
+#   This complexity arises from the O(V + E) BFS search and the fact that each edge can be part of at most O(V) augmenting paths.
+#   With the matrix scan, each BFS would cost O(V^2) instead, even in a sparse network.
+# - Space Complexity: O(V + E) for the edge arrays, instead of O(V^2) for a capacity matrix.
+# - For large networks (e.g., 100k-node assignment or scheduling problems), use FlowNetwork in
+#   Ch14_Algorithms_In_Python/Topic3_Graph_algorithms.py, which builds on the same paired edge arrays
+#   and adds Dinic's algorithm, highest-label push-relabel, minimum cuts and minimum-cost flow.
 
 # Best Case:
 # The best case occurs when the network is structured such that few augmenting paths are required (e.g., very high initial capacities). This minimizes the number of iterations.
 
 # Worst Case:
-# The worst case happens in dense networks with many nodes and low capacities, where BFS must traverse many paths and adjust the capacity matrix often.
+# The worst case happens in dense networks with many nodes and low capacities, where BFS must traverse many paths and adjust the residual capacities often.
 
 # Key Considerations:
 # 1. Capacity constraints: Real-world networks may involve dynamic or changing capacities, requiring careful tracking.